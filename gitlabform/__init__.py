@@ -6,25 +6,35 @@ from rich.logging import RichHandler
 from rich.console import Console
 
 import argparse
+import functools
 import logging
 import luddite
+import os
 from importlib.metadata import version as package_version
 import textwrap
+import threading
 import traceback
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
 from packaging import version
-from typing import Any, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 from gitlabform.configuration import Configuration
+from gitlabform.configuration.cache import CompiledConfigCache, DEFAULT_ID_LOOKUPS_TTL
 from gitlabform.configuration.core import (
     ConfigFileNotFoundException,
     ConfigInvalidException,
 )
-from gitlabform.configuration.transform import ConfigurationTransformers
+from gitlabform.configuration.diff import ConfigurationDiff
+from gitlabform.configuration.sections import SectionsIndex
+from gitlabform.configuration.store import EffectiveConfigsStore
+from gitlabform.configuration.transform import ConfigurationTransformer, ConfigurationTransformers
 from gitlabform.constants import EXIT_INVALID_INPUT, EXIT_PROCESSING_ERROR
 from gitlabform.gitlab import GitLab
 from gitlabform.gitlab.core import TestRequestFailedException
+from gitlabform.gitlab.metrics import RequestMetrics
 from gitlabform.lists import Entities
+from gitlabform.lists.discovery import Discovery
 from gitlabform.lists.filter import GroupsAndProjectsFilters
 from gitlabform.lists.groups import GroupsProvider
 from gitlabform.lists.projects import ProjectsProvider
@@ -32,9 +42,14 @@ from gitlabform.output import EffectiveConfigurationFile
 from gitlabform.processors.application import ApplicationProcessors
 from gitlabform.processors.group import GroupProcessors
 from gitlabform.processors.project import ProjectProcessors
+from gitlabform.profile import ProcessingProfile
+from gitlabform.state import StateLedger, parse_duration
 
 console = Console()
 
+# how many of the API endpoints, sections and groups/projects that took the most time to show in the summary
+SLOWEST_IN_SUMMARY = 10
+
 
 class GitLabForm:
     def __init__(
@@ -46,6 +61,13 @@ class GitLabForm:
         noop=False,
         output_file=None,
         recurse_subgroups=True,
+        parallel=1,
+        metrics_file=None,
+        profile_output=None,
+        state_file=None,
+        changed_only=False,
+        max_age=None,
+        changed_since=None,
     ):
         if target and config_string:
             # this mode is basically only for testing
@@ -68,6 +90,16 @@ class GitLabForm:
             self.only_sections = "all"
             self.exclude_sections = []
             self.recurse_subgroups = recurse_subgroups
+            self.parallel = parallel
+            self.metrics_file = metrics_file
+            self.profile_output = profile_output
+            self.state_file = state_file
+            self.changed_only = changed_only
+            self.max_age = max_age
+            self.changed_since = changed_since
+            # the config from a string is never cached
+            self.config_cache_dir = None
+            self.id_lookups_ttl = DEFAULT_ID_LOOKUPS_TTL
             self.log_level = logging.DEBUG
 
             self._configure_logging()
@@ -93,6 +125,15 @@ class GitLabForm:
                 self.only_sections,
                 self.exclude_sections,
                 self.recurse_subgroups,
+                self.parallel,
+                self.metrics_file,
+                self.profile_output,
+                self.config_cache_dir,
+                self.id_lookups_ttl,
+                self.state_file,
+                self.changed_only,
+                self.max_age,
+                self.changed_since,
             ) = self._parse_args()
 
             if self.debug:
@@ -114,15 +155,42 @@ class GitLabForm:
                 critical("target parameter is required.")
                 sys.exit(EXIT_INVALID_INPUT)
 
+            if self.parallel < 1:
+                critical("parallel parameter has to be a positive number.")
+                sys.exit(EXIT_INVALID_INPUT)
+
+        if (self.changed_only or self.max_age is not None) and not self.state_file:
+            critical("changed-only and max-age parameters require the state-file parameter.")
+            sys.exit(EXIT_INVALID_INPUT)
+
         self.gitlab, self.configuration = self._initialize_configuration_and_gitlab()
 
+        if self.changed_since:
+            config_diff: Optional[ConfigurationDiff] = self._get_config_diff()
+        else:
+            config_diff = None
+
         self.application_processors = ApplicationProcessors(self.gitlab, self.configuration, self.strict)
         self.group_processors = GroupProcessors(self.gitlab, self.configuration, self.strict)
         self.project_processors = ProjectProcessors(self.gitlab, self.configuration, self.strict, self.log_level)
+
+        if self.only_sections != "all":
+            # to get and process only the groups and projects that can have any of these sections
+            sections = set(self.only_sections) - set(self.exclude_sections)
+            sections_index: Optional[SectionsIndex] = SectionsIndex(
+                self.configuration,
+                sections & set(self.group_processors.get_configuration_names()),
+                sections & set(self.project_processors.get_configuration_names()),
+            )
+        else:
+            sections_index = None
+
+        discovery = Discovery(self.gitlab)
         self.groups_provider = GroupsProvider(
             self.gitlab,
             self.configuration,
             self.recurse_subgroups,
+            discovery,
         )
         self.projects_provider = ProjectsProvider(
             self.gitlab,
@@ -130,12 +198,32 @@ class GitLabForm:
             self.include_archived_projects,
             self.include_projects_scheduled_for_deletion,
             self.recurse_subgroups,
+            discovery,
+            sections_index,
         )
 
+        # records the configs successfully applied to the groups and projects, to skip them if they don't change
+        if self.state_file:
+            self.state_ledger: Optional[StateLedger] = StateLedger(self.state_file, self.max_age)
+        else:
+            self.state_ledger = None
+
+        # computed when filtering the projects and consumed when processing them
+        self.effective_project_configs = EffectiveConfigsStore(self.configuration.get_effective_config_for_project)
         self.groups_and_projects_filters = GroupsAndProjectsFilters(
-            self.configuration, self.group_processors, self.project_processors
+            self.configuration,
+            self.group_processors,
+            self.project_processors,
+            self.effective_project_configs,
+            self.state_ledger if self.changed_only else None,
+            self.only_sections,
+            self.exclude_sections,
+            config_diff,
+            sections_index,
         )
 
+        self.profile = ProcessingProfile(self.profile_output, self.gitlab.request_metrics)
+
     @staticmethod
     def _parse_args() -> Tuple:
         """
@@ -181,7 +269,12 @@ class GitLabForm:
             help="Skips checking if the latest version is used",
         )
 
-        parser.add_argument("-c", "--config", default="config.yml", help="config file path and filename")
+        parser.add_argument(
+            "-c",
+            "--config",
+            default="config.yml",
+            help="config file path and filename, or a config directory path",
+        )
 
         verbosity_args = parser.add_mutually_exclusive_group()
 
@@ -302,6 +395,85 @@ class GitLabForm:
             help="include all subgroups recursively. Always true for ALL, ALL_DEFINED",
         )
 
+        parser.add_argument(
+            "-p",
+            "--parallel",
+            dest="parallel",
+            default=1,
+            type=int,
+            help="process up to this many projects concurrently. Groups are always processed one by one"
+            " and each project's sections are still processed in the usual order.",
+        )
+
+        parser.add_argument(
+            "--metrics-file",
+            dest="metrics_file",
+            default=None,
+            help="name/path of a file to write the metrics of the requests made to GitLab to, as JSON",
+        )
+
+        parser.add_argument(
+            "--profile-output",
+            dest="profile_output",
+            default=None,
+            help="name/path of a file to write the processing time and the number of API calls of each section"
+            " of each group/project to, as JSON Lines",
+        )
+
+        parser.add_argument(
+            "--config-cache-dir",
+            dest="config_cache_dir",
+            default=None,
+            help="directory to cache the parsed, validated and transformed config in, to make the next runs with"
+            " the same config start faster"
+            " (!!! WARNING !!!: if your config contains sensitive data or secrets, then the files in this directory"
+            " will also contain them.)",
+        )
+
+        parser.add_argument(
+            "--state-file",
+            dest="state_file",
+            default=None,
+            help="name/path of a SQLite database file to record the configs successfully applied to the groups"
+            " and projects in, with the sections processed and the time. Created if it doesn't exist.",
+        )
+
+        parser.add_argument(
+            "--changed-only",
+            dest="changed_only",
+            action="store_true",
+            help="skip the groups and projects which effective configs have not changed since they were last"
+            " successfully applied, according to the state file",
+        )
+
+        parser.add_argument(
+            "--max-age",
+            dest="max_age",
+            default=None,
+            type=parse_duration,
+            help="with --changed-only, do not skip the groups and projects to which their configs were last applied"
+            " longer than this ago (in seconds or with a unit, f.e. 12h or 7d), to periodically revert"
+            " the changes made outside GitLabForm",
+        )
+
+        parser.add_argument(
+            "--changed-since",
+            dest="changed_since",
+            default=None,
+            help="name/path of the old version of the config (file or directory), f.e. checked out from the previous"
+            " commit of your config repository, to process only the groups and projects which effective configs"
+            " are different in the current config",
+        )
+
+        parser.add_argument(
+            "--id-lookups-ttl",
+            dest="id_lookups_ttl",
+            default=DEFAULT_ID_LOOKUPS_TTL,
+            type=int,
+            help="for how many seconds the ids of the users and groups from the config, got from GitLab,"
+            " are reused from the config cache",
+        )
+
         args = parser.parse_args()
 
         if args.only_sections != "all":
@@ -331,6 +503,15 @@ class GitLabForm:
             args.only_sections,
             args.exclude_sections,
             args.recurse_subsgroups,
+            args.parallel,
+            args.metrics_file,
+            args.profile_output,
+            args.config_cache_dir,
+            args.id_lookups_ttl,
+            args.state_file,
+            args.changed_only,
+            args.max_age,
+            args.changed_since,
         )
 
     def _configure_logging(self) -> None:
@@ -357,20 +538,53 @@ class GitLabForm:
         """
         Creates the GitLab object, which represents connection to the GitLab API,
         and the configuration object, which represents the YAML configuration,
-        and runs processing the configuration with configuration transformers.
+        and runs processing the configuration with configuration transformers
+        (or gets the already transformed configuration from the config cache, if it is used).
 
         :return: tuple with GitLab and Configuration objects
         """
 
         try:
             if hasattr(self, "config_string"):
+                config_cache = None
                 gitlab = GitLab(config_string=self.config_string)
             else:
-                gitlab = GitLab(config_path=self.config)
+                if self.config_cache_dir:
+                    config_cache = CompiledConfigCache(self.config_cache_dir, self.id_lookups_ttl)
+                else:
+                    config_cache = None
+                gitlab = GitLab(config_path=self.config, config_cache=config_cache)
             configuration = gitlab.get_configuration()
 
-            configuration_transformers = ConfigurationTransformers(gitlab, self.log_level)
-            configuration_transformers.transform(configuration)
+            if self.parallel > 1:
+                gitlab.set_max_concurrent_requests(self.parallel)
+
+            if config_cache and os.path.isdir(configuration.config_path):
+                info("The config cache is not used with a config directory.")
+                config_cache = None
+
+            if config_cache and not configuration.compiled_config:
+                # set before transforming, so that the ids looked up for it are stored too
+                try:
+                    configuration.compiled_config = config_cache.create(
+                        configuration.config_path,
+                        ConfigurationTransformer.to_simple_types(configuration.config, {}),
+                    )
+                except TypeError as e:
+                    info(f"The config cache is not used, as the config can't be serialized: {e}")
+                    config_cache = None
+
+            compiled_config = configuration.compiled_config
+            transformed_config = compiled_config.get_transformed_config() if compiled_config else None
+            if transformed_config is not None:
+                info("Using the transformed config from the cache.")
+                configuration.config = transformed_config
+            else:
+                configuration_transformers = ConfigurationTransformers(gitlab, self.log_level)
+                configuration_transformers.transform(configuration)
+                if config_cache:
+                    compiled_config.set_transformed_config(configuration.config)
+                    config_cache.save(compiled_config)
 
         except ConfigFileNotFoundException as e:
             critical(f"Config file not found at: {e}")
@@ -384,11 +598,38 @@ class GitLabForm:
 
         return gitlab, configuration
 
+    def _get_config_diff(self) -> ConfigurationDiff:
+        """
+        :return: the diff between the old config and the current one, both as read from the files - before
+                 the transformation, which would require looking up the users and groups of the old config in GitLab
+        """
+        try:
+            old_configuration = Configuration(config_path=self.changed_since)
+            if hasattr(self, "config_string"):
+                new_configuration = Configuration(config_string=self.config_string)
+            else:
+                new_configuration = Configuration(config_path=self.config)
+        except ConfigFileNotFoundException as e:
+            critical(f"Config file not found at: {e}")
+            sys.exit(EXIT_INVALID_INPUT)
+        except ConfigInvalidException as e:
+            critical(f"Invalid config:\n{e.underlying}")
+            sys.exit(EXIT_INVALID_INPUT)
+
+        return ConfigurationDiff(old_configuration, new_configuration)
+
     def run(self) -> None:
         """
         The main method.
         """
+        try:
+            self._run()
+        finally:
+            # also when terminating after an error
+            if self.state_ledger:
+                self.state_ledger.close()
 
+    def _run(self) -> None:
         projects, groups = self._get_groups_and_projects(
             self.target,
         )
@@ -409,6 +650,7 @@ class GitLabForm:
                 effective_configuration=effective_configuration,
                 only_sections=self.only_sections,
                 exclude_sections=self.exclude_sections,
+                profile=self.profile,
             )
 
         for group in groups:
@@ -445,7 +687,9 @@ class GitLabForm:
                     effective_configuration=effective_configuration,
                     only_sections=self.only_sections,
                     exclude_sections=self.exclude_sections,
+                    profile=self.profile,
                 )
+                self._record_applied("group", group, group_configuration, self.group_processors)
 
                 successful_groups += 1
 
@@ -457,6 +701,7 @@ class GitLabForm:
 
                 if self.terminate_after_error:
                     effective_configuration.write_to_file()
+                    self._write_reports()
                     error(message)
                     debug(trace)
                     sys.exit(EXIT_PROCESSING_ERROR)
@@ -466,13 +711,48 @@ class GitLabForm:
             finally:
                 debug(f"@ ({group_number}/{len(groups)}) FINISHED Processing group: {group}")
 
-        project_number = 0
-        successful_projects = 0
-        failed_projects = {}
+        successful_projects, failed_projects = self._process_projects(projects, effective_configuration)
+        self.effective_project_configs.close()
+
+        debug(f"Effective config caches: {self.configuration.get_effective_config_cache_stats()}")
+        info(f"# of distinct effective configs: {self.configuration.get_distinct_effective_configs_count()}")
+
+        effective_configuration.write_to_file()
+        self._write_reports()
+
+        self._show_summary(
+            groups,
+            projects,
+            successful_groups,
+            successful_projects,
+            failed_groups,
+            failed_projects,
+            self.gitlab.request_metrics,
+            self.profile,
+        )
 
-        for project_and_group in projects:
-            project_number += 1
+    def _process_projects(
+        self,
+        projects: list,
+        effective_configuration: EffectiveConfigurationFile,
+    ) -> Tuple[int, dict]:
+        """
+        Processes the projects one by one or, if requested, using a pool of parallel workers.
 
+        The results are always collected in the order of the projects list, so the failure accounting
+        and the effective configuration output are the same, no matter how many workers are used.
+
+        :param projects: list of effective projects to process
+        :param effective_configuration: where to store the effective configurations of the processed projects
+        :return: a tuple with the number of successfully processed projects and a dict with the failed ones,
+                 where keys are their numbers in the processing order
+        """
+
+        successful_projects = 0
+        failed_projects: dict = {}
+
+        projects_to_process = []
+        for project_number, project_and_group in enumerate(projects, start=1):
             if project_number < self.start_from:
                 self._info_project_count(
                     "*",
@@ -482,65 +762,176 @@ class GitLabForm:
                     f"Skipping project {project_and_group} as requested to start from {self.start_from}...",
                 )
                 continue
-
-            project_configuration = self.configuration.get_effective_config_for_project(project_and_group)
-
-            effective_configuration.add_placeholder(project_and_group)
-
-            self._info_project_count(
-                "*",
-                project_number,
-                len(projects),
-                "black",
-                f"Processing project: {project_and_group}",
-            )
-
-            try:
-                self.project_processors.process_entity(
+            projects_to_process.append((project_number, project_and_group))
+
+        # set by a worker after an error when we are requested to terminate after the first one,
+        # so that the other workers won't start processing any more projects
+        terminating = threading.Event()
+
+        executor: Optional[ThreadPoolExecutor] = None
+        results: List[Tuple[int, str, Callable[[], bool]]]
+        if self.parallel > 1 and len(projects_to_process) > 1:
+            info(f"Processing projects using {self.parallel} parallel workers...")
+            executor = ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix="gitlabform")
+            futures: List[Future] = []
+            for project_number, project_and_group in projects_to_process:
+                # add placeholders upfront to keep the order of the effective configs deterministic
+                effective_configuration.add_placeholder(project_and_group)
+                futures.append(
+                    executor.submit(
+                        self._process_project,
+                        project_number,
+                        len(projects),
+                        project_and_group,
+                        effective_configuration,
+                        terminating,
+                    )
+                )
+            results = [
+                (project_number, project_and_group, future.result)
+                for (project_number, project_and_group), future in zip(projects_to_process, futures)
+            ]
+        else:
+            results = [
+                (
+                    project_number,
                     project_and_group,
-                    project_configuration,
-                    dry_run=self.noop,
-                    diff_only_changed=self.diff_only_changed,
-                    effective_configuration=effective_configuration,
-                    only_sections=self.only_sections,
-                    exclude_sections=self.exclude_sections,
+                    functools.partial(
+                        self._process_project,
+                        project_number,
+                        len(projects),
+                        project_and_group,
+                        effective_configuration,
+                        terminating,
+                    ),
                 )
+                for project_number, project_and_group in projects_to_process
+            ]
 
-                successful_projects += 1
+        try:
+            for index, (project_number, project_and_group, get_result) in enumerate(results):
+                try:
+                    if get_result():
+                        successful_projects += 1
+
+                except Exception as e:
+                    if "Non GET methods are not allowed for moved projects" in str(e):
+                        info("Project has been transferred, no need to process original location")
+                        continue
+
+                    failed_projects[project_number] = project_and_group
+
+                    trace = traceback.format_exc()
+                    message = f"Error occurred while processing project {project_and_group}, exception:\n\n{e}"
+
+                    if self.terminate_after_error:
+                        if executor:
+                            executor.shutdown(wait=True, cancel_futures=True)
+                            self._remove_placeholders_of_not_processed_projects(
+                                results[index + 1 :], effective_configuration
+                            )
+                        effective_configuration.write_to_file()
+                        self._write_reports()
+                        error(message)
+                        debug(trace)
+                        sys.exit(EXIT_PROCESSING_ERROR)
+                    else:
+                        warning(message)
+                        debug(trace)
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return successful_projects, failed_projects
+
+    def _process_project(
+        self,
+        project_number: int,
+        projects_count: int,
+        project_and_group: str,
+        effective_configuration: EffectiveConfigurationFile,
+        terminating: threading.Event,
+    ) -> bool:
+        """
+        Processes a single project. Can be run in a worker thread.
 
-            except Exception as e:
-                if "Non GET methods are not allowed for moved projects" in str(e):
-                    info("Project has been transferred, no need to process original location")
-                    continue
+        :return: True if the project has been processed, False if it was not because the run is terminating
+        """
+        if terminating.is_set():
+            return False
+
+        project_configuration = self.effective_project_configs.pop(project_and_group)
+        if logging.getLogger().getEffectiveLevel() <= logging.DEBUG:
+            # computing the id of a config that is not interned (anymore) hashes all of it
+            debug(
+                f"Effective config id of {project_and_group}:"
+                f" {self.configuration.get_effective_config_id(project_configuration)}"
+            )
 
-                failed_projects[project_number] = project_and_group
+        effective_configuration.add_placeholder(project_and_group)
 
-                trace = traceback.format_exc()
-                message = f"Error occurred while processing project {project_and_group}, exception:\n\n{e}"
+        self._info_project_count(
+            "*",
+            project_number,
+            projects_count,
+            "black",
+            f"Processing project: {project_and_group}",
+        )
 
-                if self.terminate_after_error:
-                    effective_configuration.write_to_file()
-                    error(message)
-                    debug(trace)
-                    sys.exit(EXIT_PROCESSING_ERROR)
-                else:
-                    warning(message)
-                    debug(trace)
-            finally:
-                debug(
-                    f"* ({project_number}/{len(projects)})" f" FINISHED Processing project: {project_and_group}",
-                )
+        try:
+            self.project_processors.process_entity(
+                project_and_group,
+                project_configuration,
+                dry_run=self.noop,
+                diff_only_changed=self.diff_only_changed,
+                effective_configuration=effective_configuration,
+                only_sections=self.only_sections,
+                exclude_sections=self.exclude_sections,
+                profile=self.profile,
+            )
+            self._record_applied("project", project_and_group, project_configuration, self.project_processors)
+        except Exception:
+            if self.terminate_after_error:
+                terminating.set()
+            raise
+        finally:
+            debug(
+                f"* ({project_number}/{projects_count})" f" FINISHED Processing project: {project_and_group}",
+            )
 
-        effective_configuration.write_to_file()
+        return True
 
-        self._show_summary(
-            groups,
-            projects,
-            successful_groups,
-            successful_projects,
-            failed_groups,
-            failed_projects,
-        )
+    def _record_applied(self, entity_type: str, entity: str, configuration: dict, processors) -> None:
+        """
+        Records in the state ledger, if it is used, that the configuration has been applied to the group/project.
+        """
+        if self.state_ledger and not self.noop:
+            self.state_ledger.record_applied(
+                entity_type,
+                entity,
+                self.state_ledger.get_config_hash(self.configuration, configuration),
+                processors.get_sections_to_process(configuration, self.only_sections, self.exclude_sections),
+            )
+
+    @staticmethod
+    def _remove_placeholders_of_not_processed_projects(
+        remaining_results: List[Tuple[int, str, Callable[[], bool]]],
+        effective_configuration: EffectiveConfigurationFile,
+    ) -> None:
+        """
+        After terminating a parallel run remove the effective config placeholders of the projects
+        that have not been processed, to get the same output as in the sequential mode.
+        """
+        for _, project_and_group, get_result in remaining_results:
+            try:
+                processed = get_result()
+            except CancelledError:
+                processed = False
+            except Exception:
+                # the project has been (partially) processed
+                processed = True
+            if not processed:
+                effective_configuration.remove_placeholder(project_and_group)
 
     @classmethod
     def _show_version(cls, skip_version_check: bool) -> None:
@@ -662,6 +1053,11 @@ class GitLabForm:
 
         info(entities_verbose)
 
+    def _write_reports(self) -> None:
+        self.profile.write_to_file()
+        if self.metrics_file:
+            self.gitlab.request_metrics.write_to_file(self.metrics_file)
+
     @classmethod
     def _show_summary(
         cls,
@@ -671,6 +1067,8 @@ class GitLabForm:
         successful_projects: int,
         failed_groups: dict,
         failed_projects: dict,
+        request_metrics: Optional[RequestMetrics] = None,
+        profile: Optional[ProcessingProfile] = None,
     ):
         """
         Prints out the summary after processing has ended with the info of what was done and what failed.
@@ -681,12 +1079,27 @@ class GitLabForm:
         :param successful_projects: number of successfully processed projects
         :param failed_groups: a dict with failed groups, where keys are their numbers in the processing order
         :param failed_projects: a dict with failed projects, where keys are their numbers in the processing order
+        :param request_metrics: metrics of the requests made to GitLab, to show the endpoints that took the most time
+        :param profile: processing profile, to show the sections and groups/projects that took the most time
         """
 
         if len(effective_groups) > 0 or len(effective_projects) > 0:
             info(f"# of groups processed successfully: {successful_groups}")
             info(f"# of projects processed successfully: {successful_projects}")
 
+        if request_metrics:
+            top_endpoints = request_metrics.get_top_endpoints(SLOWEST_IN_SUMMARY)
+            if top_endpoints:
+                info(f"Top {len(top_endpoints)} GitLab API endpoints by time:")
+                for endpoint, metrics in top_endpoints:
+                    info(
+                        f"{endpoint}: {metrics['total_time']:.2f}s in {metrics['calls']} calls"
+                        f" ({metrics['retries']} retries, {metrics['total_size']} bytes)"
+                    )
+
+        if profile:
+            profile.show_report(SLOWEST_IN_SUMMARY)
+
         if len(failed_groups) > 0:
             console.print(f"# of groups failed: {len(failed_groups)}", style="red")
             for group_number in failed_groups.keys():
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from importlib.metadata import version as package_version
+from logging import debug, info
+from typing import Any, Dict, List, Optional, Tuple
+
+from gitlabform.configuration import serialization
+
+# default number of seconds for which the user and group ids got from GitLab are reused from the cache
+DEFAULT_ID_LOOKUPS_TTL = 3600
+
+
+class CompiledConfig:
+    """
+    A config after parsing, validation and transformation, together with the ids of the users and groups that
+    were looked up in GitLab to transform it, as stored in the CompiledConfigCache.
+    """
+
+    def __init__(self, cache_key: str, input_files_hashes: Dict[str, Optional[str]], parsed_config: dict):
+        """
+        :param cache_key: key of the cache entry, see CompiledConfigCache.get_cache_key()
+        :param input_files_hashes: paths of the files referenced in the config with "file:" -> hashes of their
+                                   contents (None for the files that don't exist)
+        :param parsed_config: parsed and validated config, converted to simple types
+        :raises TypeError: if the config contains values that can't be serialized to JSON
+        """
+        self.cache_key = cache_key
+        self.input_files_hashes = input_files_hashes
+        # kept serialized, so that the transformations that modify the config in place can get a fresh copy of it
+        self._parsed_config = serialization.dumps(parsed_config)
+        self.transformed_config: Optional[dict] = None
+        # time after which the transformed config has to be transformed again, as the ids in it may be outdated
+        self.transformed_config_valid_until = 0.0
+        # (kind, name) -> (id, time when it was looked up in GitLab)
+        self.id_lookups: Dict[Tuple[str, str], Tuple[int, float]] = {}
+
+        self.id_lookups_ttl = DEFAULT_ID_LOOKUPS_TTL
+        # time when the oldest id used since loading or creating this object was looked up in GitLab
+        self._oldest_used_lookup_time: Optional[float] = None
+
+    def get_parsed_config(self) -> dict:
+        """
+        :return: a new copy of the parsed config
+        """
+        return serialization.loads(self._parsed_config)
+
+    def get_transformed_config(self) -> Optional[dict]:
+        """
+        :return: the transformed config, or None if it hasn't been stored yet or the ids in it may be outdated
+        """
+        if self.transformed_config is None or time.time() >= self.transformed_config_valid_until:
+            return None
+        return self.transformed_config
+
+    def set_transformed_config(self, transformed_config: dict) -> None:
+        """
+        Stores the config transformed since loading or creating this object. It will be valid until the oldest
+        id used for the transformation expires.
+        """
+        self.transformed_config = transformed_config
+        oldest_lookup_time = self._oldest_used_lookup_time
+        if oldest_lookup_time is None:
+            # no ids were needed, so the transformed config depends only on the parsed one
+            self.transformed_config_valid_until = float("inf")
+        else:
+            self.transformed_config_valid_until = oldest_lookup_time + self.id_lookups_ttl
+
+    def get_id(self, kind: str, name: str) -> Optional[int]:
+        """
+        :param kind: "user" or "group"
+        :return: id of the user/group with the given name, if it was looked up in GitLab less than TTL seconds ago
+        """
+        id_lookup = self.id_lookups.get((kind, name))
+        if id_lookup is None:
+            return None
+        entity_id, lookup_time = id_lookup
+        if time.time() - lookup_time >= self.id_lookups_ttl:
+            return None
+        self._use_lookup(lookup_time)
+        return entity_id
+
+    def add_id(self, kind: str, name: str, entity_id: int) -> None:
+        lookup_time = time.time()
+        self.id_lookups[(kind, name)] = (entity_id, lookup_time)
+        self._use_lookup(lookup_time)
+
+    def _use_lookup(self, lookup_time: float) -> None:
+        if self._oldest_used_lookup_time is None or lookup_time < self._oldest_used_lookup_time:
+            self._oldest_used_lookup_time = lookup_time
+
+    def to_json(self) -> str:
+        """
+        :raises TypeError: if the transformed config contains values that can't be serialized to JSON
+        """
+        # the expired lookups would never be used again, the usage of the ids is tracked per run
+        now = time.time()
+        id_lookups = [
+            [kind, name, entity_id, lookup_time]
+            for (kind, name), (entity_id, lookup_time) in self.id_lookups.items()
+            if now - lookup_time < self.id_lookups_ttl
+        ]
+        return json.dumps(
+            {
+                "cache_key": self.cache_key,
+                "input_files_hashes": self.input_files_hashes,
+                "parsed_config": self._parsed_config,
+                "transformed_config": (
+                    serialization.dumps(self.transformed_config) if self.transformed_config is not None else None
+                ),
+                "transformed_config_valid_until": self.transformed_config_valid_until,
+                "id_lookups": id_lookups,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "CompiledConfig":
+        """
+        :raises ValueError, TypeError, KeyError: if the text is not a compiled config serialized with to_json()
+        """
+        state: Dict[str, Any] = json.loads(text)
+        compiled_config = cls(state["cache_key"], dict(state["input_files_hashes"]), {})
+        compiled_config._parsed_config = str(state["parsed_config"])
+        if state["transformed_config"] is not None:
+            compiled_config.transformed_config = serialization.loads(state["transformed_config"])
+        compiled_config.transformed_config_valid_until = float(state["transformed_config_valid_until"])
+        compiled_config.id_lookups = {
+            (kind, name): (int(entity_id), float(lookup_time))
+            for kind, name, entity_id, lookup_time in state["id_lookups"]
+        }
+        return compiled_config
+
+
+class CompiledConfigCache:
+    """
+    Stores the compiled configs in files in the given directory, so that the repeated runs with the same config
+    don't have to parse, validate and transform it and look up the user and group ids in it again.
+
+    The entries are keyed by a hash of the config file path and contents, the GitLab URL set with the GITLAB_URL
+    environment variable (the one set in the config file is a part of its contents) and the app version, so that
+    the user and group ids looked up in one GitLab instance are never used with another one. The entries are used
+    only if the contents of the files referenced in the config with "file:" haven't changed either.
+    The entries are stored as JSON, written readable only by the user running the app, as the configs may contain
+    secrets.
+    """
+
+    def __init__(self, cache_dir: str, id_lookups_ttl: int = DEFAULT_ID_LOOKUPS_TTL):
+        """
+        :param cache_dir: directory to store the cache files in, created if it doesn't exist
+        :param id_lookups_ttl: number of seconds for which the user and group ids are reused from the cache
+        """
+        self.cache_dir = cache_dir
+        self.id_lookups_ttl = id_lookups_ttl
+
+    def load(self, config_path: str) -> Optional[CompiledConfig]:
+        """
+        :return: the compiled config for the config file, or None if it is not in the cache or it is outdated
+        """
+        cache_key = self.get_cache_key(config_path)
+        cache_file = self._get_cache_file(cache_key)
+        try:
+            with open(cache_file, encoding="utf-8") as file:
+                compiled_config = CompiledConfig.from_json(file.read())
+        except FileNotFoundError:
+            debug(f"Compiled config not found in the cache: {cache_file}")
+            return None
+        except Exception as e:
+            debug(f"Ignoring the unreadable compiled config cache file {cache_file}: {e}")
+            return None
+
+        if compiled_config.cache_key != cache_key:
+            debug(f"Ignoring the invalid compiled config cache file: {cache_file}")
+            return None
+
+        for input_file, input_file_hash in compiled_config.input_files_hashes.items():
+            if get_file_hash(input_file) != input_file_hash:
+                debug(f"Ignoring the compiled config from the cache, as {input_file} has changed.")
+                return None
+
+        info(f"Using the compiled config from the cache: {cache_file}")
+        compiled_config.id_lookups_ttl = self.id_lookups_ttl
+        return compiled_config
+
+    def create(self, config_path: str, parsed_config: dict) -> CompiledConfig:
+        """
+        :param parsed_config: parsed and validated config, converted to simple types
+        :return: a new compiled config, to be stored with save() after transforming the config
+        :raises TypeError: if the config contains values that can't be serialized to JSON
+        """
+        input_files_hashes = {
+            input_file: get_file_hash(input_file)
+            for input_file in self._get_input_files(os.path.dirname(config_path), parsed_config)
+        }
+        compiled_config = CompiledConfig(self.get_cache_key(config_path), input_files_hashes, parsed_config)
+        compiled_config.id_lookups_ttl = self.id_lookups_ttl
+        return compiled_config
+
+    def save(self, compiled_config: CompiledConfig) -> None:
+        try:
+            serialized = compiled_config.to_json()
+        except TypeError as e:
+            info(f"Not saving the compiled config to the cache, as it can't be serialized: {e}")
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_file = self._get_cache_file(compiled_config.cache_key)
+        # write to a temporary file and rename it, so that the concurrent runs never read a partially written file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".compiled-config-")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                file.write(serialized)
+            os.replace(temporary_path, cache_file)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        debug(f"Compiled config saved to the cache: {cache_file}")
+
+    @staticmethod
+    def get_cache_key(config_path: str) -> str:
+        sha256 = hashlib.sha256()
+        sha256.update(package_version("gitlabform").encode())
+        sha256.update(b"\0")
+        sha256.update(os.path.abspath(config_path).encode())
+        sha256.update(b"\0")
+        sha256.update((os.getenv("GITLAB_URL") or "").rstrip("/").encode())
+        sha256.update(b"\0")
+        with open(config_path, "rb") as file:
+            sha256.update(file.read())
+        return sha256.hexdigest()
+
+    def _get_cache_file(self, cache_key: str) -> str:
+        return os.path.join(self.cache_dir, f"compiled-config-{cache_key}.json")
+
+    @staticmethod
+    def _get_input_files(config_dir: str, config: dict) -> list:
+        """
+        :return: paths of the files referenced in the "files" sections of the config with "file:"
+        """
+        input_files = set()
+        projects_and_groups = config.get("projects_and_groups") or {}
+        for entity_config in projects_and_groups.values():
+            input_files.update(get_input_files(config_dir, entity_config))
+        return sorted(input_files)
+
+
+def get_input_files(config_dir: str, entity_config: Any) -> List[str]:
+    """
+    :param config_dir: directory of the config file
+    :param entity_config: config of a group or project, f.e. an effective one or a "projects_and_groups" entry
+    :return: paths of the files referenced in its "files" section with "file:"
+    """
+    files = entity_config.get("files") if isinstance(entity_config, dict) else None
+    if not isinstance(files, dict):
+        return []
+    input_files = set()
+    for file_config in files.values():
+        if isinstance(file_config, dict) and file_config.get("file"):
+            # relative paths are relative to config file location, like in the files processor
+            input_files.add(os.path.join(config_dir, str(file_config["file"])))
+    return sorted(input_files)
+
+
+def get_file_hash(path: str) -> Optional[str]:
+    """
+    :return: hash of the contents of the file, or None if it doesn't exist or can't be read
+    """
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
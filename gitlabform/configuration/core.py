@@ -1,12 +1,12 @@
 import fnmatch
 import sys
-from typing import Any
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional
 
 import os
 import logging
 import textwrap
 from abc import ABC
-from copy import deepcopy
 from logging import debug
 from pathlib import Path
 from ruamel.yaml.scalarstring import ScalarString
@@ -14,10 +14,17 @@ from types import SimpleNamespace
 
 from logging import critical, info
 
-from mergedeep import merge
 from yamlpath.common import Parsers
 from yamlpath.wrappers import ConsolePrinter
 
+from gitlabform.configuration.cache import CompiledConfig, CompiledConfigCache
+from gitlabform.configuration.directory import (
+    CONFIG_DIRECTORY_MAIN_FILE,
+    LazyProjectsAndGroups,
+    get_config_directory_files,
+)
+from gitlabform.configuration.interning import ConfigInterner
+from gitlabform.configuration.matchers import ProjectPatternMatcher, SkipListMatcher
 from gitlabform.constants import EXIT_INVALID_INPUT
 from ruamel.yaml.comments import CommentedMap
 
@@ -28,18 +35,40 @@ class ConfigurationCore(ABC):
     is implemented here.
     """
 
-    def __init__(self, config_path=None, config_string=None):
+    def __init__(self, config_path=None, config_string=None, config_cache: Optional[CompiledConfigCache] = None):
+        """
+        :param config_cache: cache of the compiled configs to use when reading the config from a file
+        """
         if config_path and config_string:
             critical("Please initialize with either config_path or config_string, not both.")
             sys.exit(EXIT_INVALID_INPUT)
+
+        # name -> (source, its length, value derived from it), see _get_derived()
+        self._derived: Dict[str, tuple] = {}
+        self._effective_configs_interner = ConfigInterner()
+        # the compiled config from the cache, or the one to be saved to it, set only if the cache is used
+        self.compiled_config: Optional[CompiledConfig] = None
+
         try:
             if config_string:
                 self.config = self._parse_yaml(config_string, config_string=True)
                 self.config_dir = "."
+                self.config_path = None
             else:  # maybe config_path
                 config_path = self._get_config_path(config_path)
-                self.config = self._parse_yaml(config_path, config_string=False)
-                self.config_dir = os.path.dirname(config_path)
+                if os.path.isdir(config_path):
+                    # the config directory mode, the compiled configs are not cached in it
+                    self.config = self._parse_config_directory(config_path)
+                    self.config_dir = config_path
+                else:
+                    if config_cache:
+                        self.compiled_config = config_cache.load(config_path)
+                    if self.compiled_config:
+                        self.config = self.compiled_config.get_parsed_config()
+                    else:
+                        self.config = self._parse_yaml(config_path, config_string=False)
+                    self.config_dir = os.path.dirname(config_path)
+                self.config_path = config_path
 
                 # below checks are only needed in the non-test mode, when the config is read from file
 
@@ -61,7 +90,9 @@ class ConfigurationCore(ABC):
                     )
                     sys.exit(EXIT_INVALID_INPUT)
 
-            self._find_almost_duplicates()
+            if not self.compiled_config:
+                # the compiled configs are validated before they are stored in the cache
+                self._find_almost_duplicates()
 
             # we are NOT checking for the existence of non-empty 'projects_and_groups' key here
             # as it would break using GitLabForm as a library
@@ -111,6 +142,24 @@ class ConfigurationCore(ABC):
 
         return yaml_data
 
+    @staticmethod
+    def _parse_config_directory(config_directory: str):
+        """
+        :return: the main config from the directory, with its "projects_and_groups" extended with the entries
+                 from all the other YAML files in the directory and its subdirectories, which are parsed lazily
+        """
+        config = ConfigurationCore._parse_yaml(
+            os.path.join(config_directory, CONFIG_DIRECTORY_MAIN_FILE), config_string=False
+        )
+        config_files = get_config_directory_files(config_directory)
+        info(f"Indexing the groups and projects configured in {len(config_files)} files in: {config_directory}")
+        config["projects_and_groups"] = LazyProjectsAndGroups(
+            config.get("projects_and_groups") or {},
+            config_files,
+            lambda config_file: ConfigurationCore._parse_yaml(config_file, config_string=False),
+        )
+        return config
+
     def get(self, path, default=None) -> Any:
         """
         :param path: "path" to given element in YAML file, for example for:
@@ -150,6 +199,21 @@ class ConfigurationCore(ABC):
 
         return to_return
 
+    def get_effective_config_id(self, effective_config: dict) -> str:
+        """
+        :return: id of the effective config, the same for all the groups/projects with equal effective configs
+        """
+        return self._effective_configs_interner.get_id(effective_config)
+
+    def get_distinct_effective_configs_count(self) -> int:
+        return self._effective_configs_interner.distinct_count
+
+    def _intern_effective_config(self, effective_config: dict) -> dict:
+        """
+        :return: the same object for all the equal effective configs
+        """
+        return self._effective_configs_interner.intern(effective_config)
+
     @staticmethod
     def _validate_break_inheritance_flag(config: dict, section_name: str, parent_key: str = "") -> None:
         for key, value in config.items():
@@ -168,12 +232,14 @@ class ConfigurationCore(ABC):
         """
         :return: merge more general config with more specific configs.
                  More specific config values take precedence over more general ones.
-        """
 
-        more_general_config = deepcopy(more_general_config)
-        more_specific_config = deepcopy(more_specific_config)
+        The merged config shares all the unchanged subtrees with the input configs - new dicts are created only
+        along the paths to the values that the more specific config sets. Therefore, neither the input configs
+        nor the returned one may be modified in place (processors get their own copies of their sections,
+        see configuration_to_safe_dict()).
+        """
 
-        merged_dict = merge({}, more_general_config, more_specific_config)
+        merged_dict = ConfigurationCore._merge_sharing_subtrees(more_general_config, more_specific_config)
 
         def break_inheritance(specific_config, parent_path=()):
             """
@@ -202,15 +268,31 @@ class ConfigurationCore(ABC):
             """
             target_config = merged_config
             for key in parent_path[:-1]:
+                # the sections on the path may be shared with the input configs, so copy them before modifying
+                target_config[key] = dict(target_config[key])
                 target_config = target_config[key]
 
-            replacement_config = deepcopy(specific_config)
+            replacement_config = dict(specific_config)
             replacement_config.pop("inherit", None)
             target_config[parent_path[-1]] = replacement_config
 
         break_inheritance(more_specific_config)
 
-        return dict(merged_dict)
+        return merged_dict
+
+    @staticmethod
+    def _merge_sharing_subtrees(more_general_config: Mapping, more_specific_config: Mapping) -> dict:
+        """
+        Merges like mergedeep.merge({}, more_general_config, more_specific_config) but without copying the values.
+        """
+        merged_dict = dict(more_general_config)
+        for key, value in more_specific_config.items():
+            current_value = merged_dict.get(key)
+            if isinstance(current_value, Mapping) and isinstance(value, Mapping):
+                merged_dict[key] = ConfigurationCore._merge_sharing_subtrees(current_value, value)
+            else:
+                merged_dict[key] = value
+        return merged_dict
 
     @staticmethod
     def _get_key_type(a_key: str) -> str:
@@ -232,39 +314,60 @@ class ConfigurationCore(ABC):
         """
         return fnmatch.fnmatchcase(item.lower(), pattern.lower())
 
-    @staticmethod
-    def _get_case_insensitively(a_dict: dict, a_key: str):
-        for dict_key in a_dict.keys():
-            if dict_key.lower() == a_key.lower():
-                return a_dict[dict_key]
-        return {}
-
-    @staticmethod
-    def _is_skipped_case_insensitively(an_array: list, item: str) -> bool:
+    def _get_from_projects_and_groups_case_insensitively(self, a_key: str):
         """
-        :return: if item is defined in the list to be skipped
+        :return: value of the 'projects_and_groups' key equal to a_key, ignoring the case, or an empty dict if not found
         """
-        item = item.lower()
-
-        for list_element in an_array:
-            list_element = list_element.lower()
+        projects_and_groups = self.get("projects_and_groups")
+        dict_key = self._get_lowercase_keys_index(projects_and_groups).get(a_key.lower())
+        if dict_key is None:
+            return {}
+        return projects_and_groups[dict_key]
 
-            if list_element == item:
-                return True
-
-            # Support for traditional group/* skip pattern
-            if (
-                list_element.endswith("/*")
-                and item.startswith(list_element[:-2])
-                and len(item) >= len(list_element[:-2])
-            ):
-                return True
+    def _get_lowercase_keys_index(self, a_dict: dict) -> dict:
+        """
+        :return: a dict mapping the lowercase versions of the keys of a_dict to its keys
+        """
+        # there are no almost duplicates in the keys, see _find_almost_duplicates()
+        return self._get_derived(
+            "lowercase_keys_index",
+            a_dict,
+            lambda: {dict_key.lower(): dict_key for dict_key in a_dict.keys()},
+        )
+
+    def _get_project_pattern_matcher(self) -> ProjectPatternMatcher:
+        projects_and_groups = self.get("projects_and_groups")
+        return self._get_derived(
+            "project_pattern_matcher",
+            projects_and_groups,
+            lambda: ProjectPatternMatcher(
+                key for key in projects_and_groups.keys() if self._get_key_type(key) == "project_pattern"
+            ),
+        )
+
+    def _get_derived(self, name: str, source: dict | list, build: Callable[[], Any]) -> Any:
+        """
+        :return: a value derived from a part of the config, like an index of its keys. It is built once
+                 and rebuilt only if that part is a different object or its length changes, f.e. when the config
+                 is replaced with its simple types version at the end of the transformation.
+        """
+        derived = self._derived.get(name)
+        if derived is None or derived[0] is not source or derived[1] != len(source):
+            derived = (source, len(source), build())
+            self._derived[name] = derived
+        return derived[2]
 
-            # Support for partial wildcard patterns like group/foo-*
-            if "*" in list_element and fnmatch.fnmatchcase(item, list_element):
-                return True
+    def _is_skipped_case_insensitively(self, configuration_path: str, item: str) -> bool:
+        """
+        :param configuration_path: path to the list of elements to skip, f.e. "skip_projects"
+        :return: if item is defined in the list to be skipped
+        """
+        an_array = self.get(configuration_path, [])
+        if not an_array:
+            return False
 
-        return False
+        skip_list_matcher = self._get_derived(configuration_path, an_array, lambda: SkipListMatcher(an_array))
+        return skip_list_matcher.matches(item)
 
     def _find_almost_duplicates(self):
         # in GitLab groups and projects names are de facto case insensitive:
@@ -298,7 +401,7 @@ class ConfigurationCore(ABC):
         """
 
         dict_or_list = self.get(configuration_path)
-        if isinstance(dict_or_list, dict):
+        if isinstance(dict_or_list, Mapping):
             items = dict_or_list.keys()
         else:
             items = dict_or_list
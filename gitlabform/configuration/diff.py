@@ -0,0 +1,141 @@
+from logging import debug
+from typing import Dict, List, Optional, Set
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.cache import get_file_hash, get_input_files
+
+
+class ConfigurationDiff:
+    """
+    Finds the groups and projects which effective configs are different in two versions of the config, f.e. before
+    and after a change in the config repository, so that only these have to be processed.
+
+    First the "projects_and_groups" entries of both configs are compared to find the changed keys (ignoring
+    the case). A group or project is affected by a changed key if it can be a part of its effective config:
+    "*", the keys of the group and its ancestor groups ("group/*", "group/subgroup/*"), the key of the project
+    and the project patterns matching it (as a changed pattern can change which pattern matches it best).
+    Only for the affected groups and projects their effective configs in both configs are computed and compared,
+    so changes that don't change the effective config, f.e. moving a setting from a project to its group,
+    are not reported as changes.
+
+    The contents of the files referenced in the configs with "file:" are compared too, with the relative paths
+    resolved against the locations of the old and the new config, so that changing only such a file is reported
+    as a change of the entries that reference it and of the effective configs that contain them.
+
+    The configs have to be compared before they are transformed, as transforming the old config would require
+    looking up in GitLab the users and groups that may not exist anymore. Therefore the changes that are visible
+    only after the transformation, like changing an access level from "maintainer" to 40, are reported too.
+    """
+
+    def __init__(self, old_configuration: Configuration, new_configuration: Configuration):
+        self.old_configuration = old_configuration
+        self.new_configuration = new_configuration
+        # path -> hash of its contents, for the files referenced with "file:"
+        self._input_files_hashes: Dict[str, Optional[str]] = {}
+
+        # lowercase keys of the changed "projects_and_groups" entries
+        self.changed_keys = self._get_changed_keys()
+        self.changed_group_keys: Set[str] = {key for key in self.changed_keys if key.endswith("/*")}
+        self.changed_project_patterns = [
+            key for key in self.changed_keys if Configuration._get_key_type(key) == "project_pattern"
+        ]
+        debug(f"Changed 'projects_and_groups' keys: {', '.join(sorted(self.changed_keys))}")
+
+        # skipping a group empties its effective config and the ones of its projects
+        skip_groups_changed = self._get_skip_list(old_configuration, "skip_groups") != self._get_skip_list(
+            new_configuration, "skip_groups"
+        )
+        # if these changed, then any group or project can be affected
+        self.all_affected = "*" in self.changed_keys or skip_groups_changed
+        self.skip_projects_changed = self._get_skip_list(old_configuration, "skip_projects") != self._get_skip_list(
+            new_configuration, "skip_projects"
+        )
+
+    def is_group_changed(self, group: str) -> bool:
+        """
+        :param group: group/subgroup
+        :return: if the effective config of the group is different in the new config
+        """
+        if not self.all_affected and not self._is_group_affected(group):
+            return False
+        return self._are_configs_different(
+            self.old_configuration.get_effective_config_for_group(group),
+            self.new_configuration.get_effective_config_for_group(group),
+        )
+
+    def is_project_changed(self, project: str) -> bool:
+        """
+        :param project: 'group/project'
+        :return: if the effective config of the project is different in the new config, or if the project
+                 was skipped in the old config
+        """
+        if self.skip_projects_changed and self.old_configuration.is_project_skipped(project):
+            return True
+        if not self.all_affected and not self._is_project_affected(project):
+            return False
+        return self._are_configs_different(
+            self.old_configuration.get_effective_config_for_project(project),
+            self.new_configuration.get_effective_config_for_project(project),
+        )
+
+    def _is_group_affected(self, group: str) -> bool:
+        group_path = ""
+        for group_part in group.lower().split("/"):
+            group_path = f"{group_path}/{group_part}" if group_path else group_part
+            if f"{group_path}/*" in self.changed_group_keys:
+                return True
+        return False
+
+    def _is_project_affected(self, project: str) -> bool:
+        if project.lower() in self.changed_keys:
+            return True
+        group, _ = project.rsplit("/", 1)
+        if self._is_group_affected(group):
+            return True
+        for pattern in self.changed_project_patterns:
+            if Configuration._match_pattern(pattern, project):
+                return True
+        return False
+
+    def _get_changed_keys(self) -> Set[str]:
+        old_projects_and_groups = self.old_configuration.get("projects_and_groups", {})
+        new_projects_and_groups = self.new_configuration.get("projects_and_groups", {})
+        # lowercase key -> key
+        old_keys = {key.lower(): key for key in old_projects_and_groups.keys()}
+        new_keys = {key.lower(): key for key in new_projects_and_groups.keys()}
+
+        changed_keys = set()
+        for key in old_keys.keys() | new_keys.keys():
+            if (
+                key not in old_keys
+                or key not in new_keys
+                or self._are_configs_different(
+                    old_projects_and_groups[old_keys[key]], new_projects_and_groups[new_keys[key]]
+                )
+            ):
+                changed_keys.add(key)
+        return changed_keys
+
+    def _are_configs_different(self, old_config: dict, new_config: dict) -> bool:
+        """
+        :return: if the configs of a group/project, or their "projects_and_groups" entries, are different
+                 or the contents of the files referenced in them with "file:" are
+        """
+        if old_config != new_config:
+            return True
+        # the configs are equal, so they reference the same files, in the same order
+        return self._get_input_files_hashes(self.old_configuration, old_config) != self._get_input_files_hashes(
+            self.new_configuration, new_config
+        )
+
+    def _get_input_files_hashes(self, configuration: Configuration, config: dict) -> List[Optional[str]]:
+        hashes = []
+        for input_file in get_input_files(configuration.config_dir, config):
+            if input_file not in self._input_files_hashes:
+                self._input_files_hashes[input_file] = get_file_hash(input_file)
+            hashes.append(self._input_files_hashes[input_file])
+        return hashes
+
+    @staticmethod
+    def _get_skip_list(configuration: Configuration, path: str) -> List[str]:
+        return sorted(element.lower() for element in configuration.get(path, []))
@@ -0,0 +1,196 @@
+import json
+import os
+import re
+import sys
+import threading
+from collections.abc import Mapping
+from logging import critical, debug
+from typing import Callable, Dict, Iterator, List, Optional
+
+from gitlabform.constants import EXIT_INVALID_INPUT
+
+# in the config directory mode, the file with the main config (everything but the groups and projects
+# configured in the other files), relative to the directory
+CONFIG_DIRECTORY_MAIN_FILE = "config.yml"
+CONFIG_FILE_EXTENSIONS = (".yml", ".yaml")
+
+_DOUBLE_QUOTED_KEY = re.compile(r'^"((?:[^"\\]|\\.)*)"\s*:(?:\s|$)')
+_SINGLE_QUOTED_KEY = re.compile(r"^'((?:[^']|'')*)'\s*:(?:\s|$)")
+_PLAIN_KEY = re.compile(r"^([^\s#'\"{\[&*!|>%@`-][^#]*?)\s*:(?:\s|$)")
+
+
+def get_config_directory_files(config_directory: str) -> List[str]:
+    """
+    :return: sorted paths of the YAML files in the config directory and its subdirectories, except the main one
+    """
+    main_file = os.path.join(config_directory, CONFIG_DIRECTORY_MAIN_FILE)
+    config_files = []
+    for directory, subdirectories, files in os.walk(config_directory):
+        # skip hidden directories, like .git
+        subdirectories[:] = [subdirectory for subdirectory in subdirectories if not subdirectory.startswith(".")]
+        for file in files:
+            path = os.path.join(directory, file)
+            if file.endswith(CONFIG_FILE_EXTENSIONS) and not file.startswith(".") and path != main_file:
+                config_files.append(path)
+    return sorted(config_files)
+
+
+def scan_projects_and_groups_keys(path: str) -> List[str]:
+    """
+    Gets the keys of the "projects_and_groups" entries from a config file without parsing it as YAML, by reading
+    only the lines at the indentation of these keys. The file has to contain only the "projects_and_groups"
+    top-level key, written as a block mapping with its keys on separate lines, like:
+
+    projects_and_groups:
+      "my-group/*":
+        ...
+      my-group/my-project:
+        ...
+
+    :return: the keys, in the order of the file
+    """
+    keys = []
+    in_projects_and_groups = False
+    keys_indentation: Optional[int] = None
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            content = line.rstrip("\r\n")
+            stripped = content.lstrip(" ")
+            if not stripped or stripped.startswith("#") or content in ("---", "..."):
+                continue
+            indentation = len(content) - len(stripped)
+
+            if indentation == 0:
+                key = _parse_key(stripped)
+                if key != "projects_and_groups" or _get_value_after_key(stripped):
+                    raise ValueError(
+                        f"{path}:{line_number}: the files in the config directory, except the main"
+                        f" {CONFIG_DIRECTORY_MAIN_FILE}, can contain only the 'projects_and_groups' block mapping."
+                    )
+                in_projects_and_groups = True
+                continue
+
+            if not in_projects_and_groups:
+                continue
+            if keys_indentation is None:
+                keys_indentation = indentation
+            if indentation == keys_indentation:
+                key = _parse_key(stripped)
+                if key is None:
+                    raise ValueError(f"{path}:{line_number}: cannot read a 'projects_and_groups' key from this line.")
+                keys.append(key)
+    return keys
+
+
+def _parse_key(text: str) -> Optional[str]:
+    match = _DOUBLE_QUOTED_KEY.match(text)
+    if match:
+        return json.loads(f'"{match.group(1)}"')
+    match = _SINGLE_QUOTED_KEY.match(text)
+    if match:
+        return match.group(1).replace("''", "'")
+    match = _PLAIN_KEY.match(text)
+    if match:
+        return match.group(1)
+    return None
+
+
+def _get_value_after_key(text: str) -> str:
+    for pattern in (_DOUBLE_QUOTED_KEY, _SINGLE_QUOTED_KEY, _PLAIN_KEY):
+        match = pattern.match(text)
+        if match:
+            value = text[match.end() :].strip()
+            return "" if value.startswith("#") else value
+    return text
+
+
+class LazyProjectsAndGroups(Mapping[str, dict]):
+    """
+    The "projects_and_groups" of a config directory. The keys of the entries in all the files are known up front,
+    from an index built by scanning the files (see scan_projects_and_groups_keys()), but a file is parsed only
+    when a value of one of its entries is needed. So when processing a single group or project, only the files with
+    the common config, its groups/subgroups, the project and the patterns matching it are parsed.
+    """
+
+    def __init__(self, entries: Mapping, files: List[str], parse_file: Callable[[str], Mapping]):
+        """
+        :param entries: the entries that are already parsed, f.e. from the main config file
+        :param files: paths of the files with the other entries
+        :param parse_file: function parsing a file into a dict
+        """
+        self._entries: Dict[str, dict] = dict(entries)
+        self._keys: List[str] = list(entries.keys())
+        # key -> file with its entry, for the entries that are not parsed yet
+        self._files_with_keys: Dict[str, str] = {}
+        self._keys_in_files: Dict[str, List[str]] = {}
+        for file in files:
+            keys_in_file = scan_projects_and_groups_keys(file)
+            for key in keys_in_file:
+                if key in self._entries or key in self._files_with_keys:
+                    raise ValueError(f"'projects_and_groups' key '{key}' in {file} is already defined.")
+                self._files_with_keys[key] = file
+            self._keys.extend(keys_in_file)
+            self._keys_in_files[file] = keys_in_file
+        debug(f"Indexed {len(self._files_with_keys)} 'projects_and_groups' entries in {len(files)} files.")
+
+        self._parse_file = parse_file
+        self._transformations: List[Callable[[dict], dict]] = []
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> dict:
+        if key in self._entries:
+            return self._entries[key]
+        file = self._files_with_keys.get(key)
+        if file is not None:
+            self._load(file)
+        # raises KeyError for the keys that are not defined
+        return self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries or key in self._files_with_keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get_loaded(self) -> dict:
+        """
+        :return: the entries that have been parsed so far
+        """
+        return dict(self._entries)
+
+    def add_transformation(self, transformation: Callable[[dict], dict]) -> None:
+        """
+        :param transformation: function transforming the entries parsed from a file, applied to the already parsed
+                               entries now and to the other ones when they are parsed
+        """
+        with self._lock:
+            self._entries = transformation(self._entries)
+            self._transformations.append(transformation)
+
+    def _load(self, file: str) -> None:
+        with self._lock:
+            if file not in self._keys_in_files:
+                # loaded by another thread in the meantime
+                return
+
+            config = self._parse_file(file)
+            entries = config.get("projects_and_groups") if isinstance(config, Mapping) else None
+            # the transformations, like the rest of the app, work on the dicts
+            if not isinstance(entries, dict) or list(entries.keys()) != self._keys_in_files[file]:
+                critical(
+                    f"The 'projects_and_groups' keys parsed from {file} are different than the ones read when"
+                    f" indexing the config directory. Please write each of them in a separate line, as a block"
+                    f" mapping key."
+                )
+                sys.exit(EXIT_INVALID_INPUT)
+
+            for transformation in self._transformations:
+                entries = transformation(entries)
+
+            self._entries.update(entries)
+            # the entries are added before they are removed from here, so the other threads always find them
+            for key in self._keys_in_files.pop(file):
+                del self._files_with_keys[key]
@@ -6,6 +6,10 @@ from logging import debug
 from gitlabform.configuration import ConfigurationCommon
 from gitlabform.util import to_str
 
+# max numbers of the cached effective configs of the groups, and of the groups/subgroups on their paths
+EFFECTIVE_GROUP_CONFIGS_CACHE_SIZE = 10000
+EFFECTIVE_SUBGROUP_CONFIGS_CACHE_SIZE = 10000
+
 
 class ConfigurationGroups(ConfigurationCommon, ABC):
     """
@@ -32,9 +36,9 @@ class ConfigurationGroups(ConfigurationCommon, ABC):
         :return: if group is defined in the key with groups to skip,
                  ignoring the case
         """
-        return self._is_skipped_case_insensitively(self.get("skip_groups", []), group)
+        return self._is_skipped_case_insensitively("skip_groups", group)
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=EFFECTIVE_GROUP_CONFIGS_CACHE_SIZE)
     def get_effective_config_for_group(self, group) -> dict:
         """
         :param group: "group_name"
@@ -63,15 +67,17 @@ class ConfigurationGroups(ConfigurationCommon, ABC):
             to_str(effective_config_for_group),
         )
 
-        return effective_config_for_group
+        return self._intern_effective_config(effective_config_for_group)
 
+    @functools.lru_cache(maxsize=EFFECTIVE_SUBGROUP_CONFIGS_CACHE_SIZE)
     def _get_effective_subgroup_config(self, subgroup, has_parent_context: bool = False):
         #
-        # Goes through a subgroups hierarchy, from top to bottom
+        # Goes through a subgroups hierarchy, from bottom to top
         #
-        # "x/y/x" -> ["x", "x/y", "x/y/z"]
+        # "x/y/z" -> "x/y" -> "x"
         #
-        # ...and for each element after 1st generate effective config from previous effective one merged with current:
+        # ...and generates the effective config for each element from the effective config of its parent
+        # merged with the element's own config:
         #
         #              |     v       |
         #              \---> a       |
@@ -80,33 +86,46 @@ class ConfigurationGroups(ConfigurationCommon, ABC):
         #
         # ...where a = merged_config("x", "x/y") and b = merged_config(a, "x/y/z")
         #
+        # The effective configs of all the ancestors are cached too, so for the subgroups of the same group
+        # their common part of the hierarchy is merged only once.
+        #
         # ``inherit: false`` on a layer is rejected only when no parent exists above it
         # (no common config and no non-empty accumulated ancestor config).
 
-        effective_config: dict = {}
-        elements = subgroup.split("/")
-        current_path = None
-        for element in elements:
-            current_path = element if current_path is None else current_path + "/" + element
-            current_layer = self._get_group_config(current_path)
-            debug("Config for '%s': %s", current_path, to_str(current_layer))
+        if "/" in subgroup:
+            parent, _ = subgroup.rsplit("/", 1)
+            effective_config = self._get_effective_subgroup_config(parent, has_parent_context)
+        else:
+            effective_config = {}
+
+        current_layer = self._get_group_config(subgroup)
+        debug("Config for '%s': %s", subgroup, to_str(current_layer))
 
-            has_ancestor_context = has_parent_context or bool(effective_config)
-            if current_layer and not has_ancestor_context:
-                self._validate_break_inheritance_flag(current_layer, current_path)
+        has_ancestor_context = has_parent_context or bool(effective_config)
+        if current_layer and not has_ancestor_context:
+            self._validate_break_inheritance_flag(current_layer, subgroup)
 
-            if not effective_config:
-                effective_config = current_layer
-            else:
-                effective_config = self._merge_configs(effective_config, current_layer)
-            debug("Effective config at '%s': %s", current_path, to_str(effective_config))
+        if not effective_config:
+            effective_config = current_layer
+        else:
+            effective_config = self._merge_configs(effective_config, current_layer)
+        debug("Effective config at '%s': %s", subgroup, to_str(effective_config))
 
         return effective_config
 
+    def get_effective_config_cache_stats(self) -> dict:
+        """
+        :return: hits, misses, max size and current size of the caches of the effective configs
+        """
+        return {
+            "groups": self.get_effective_config_for_group.cache_info()._asdict(),
+            "subgroups": self._get_effective_subgroup_config.cache_info()._asdict(),
+        }
+
     def _get_group_config(self, group) -> dict:
         """
         :param group: group/subgroup
         :return: configuration for this group/subgroup or empty dict if not defined,
                  ignoring the case
         """
-        return self._get_case_insensitively(self.get("projects_and_groups"), f"{group}/*")
+        return self._get_from_projects_and_groups_case_insensitively(f"{group}/*")
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Set
+
+from ruamel.yaml.scalarbool import ScalarBoolean
+
+# max number of the distinct configs kept by the interner by default
+MAX_INTERNED_CONFIGS = 1000
+
+
+def get_content_hash(config: dict) -> str:
+    """
+    :return: hash of the config contents that is the same for equal configs, no matter the order of their keys
+             and the types of their dicts (f.e. dict vs CommentedMap), but different for the keys and values
+             of different types (f.e. 1 vs "1")
+    """
+    return hashlib.sha256(_to_canonical_string(config).encode()).hexdigest()[:16]
+
+
+def _to_canonical_string(value: Any) -> str:
+    if isinstance(value, Mapping):
+        items = sorted(f"{_to_canonical_string(key)}:{_to_canonical_string(item)}" for key, item in value.items())
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_to_canonical_string(item) for item in value) + "]"
+    if isinstance(value, (bool, ScalarBoolean)):
+        return "true" if value else "false"
+    if value is None or isinstance(value, (str, int, float)):
+        # the strings are quoted, so they are different from the other values
+        return json.dumps(value)
+    return f"!{type(value).__name__}{json.dumps(repr(value))}"
+
+
+class ConfigInterner:
+    """
+    Makes the equal effective configs the same objects, identified by the hash of their contents.
+
+    In typical setups most of the projects have one of few distinct effective configs (f.e. when they inherit
+    the common config and the config of their group only), so with this the work that depends only on the config
+    contents can be done once per such an equivalence class, instead of once per project.
+
+    Only a given number of the most recently used distinct configs is kept, so that the interner doesn't keep
+    all the effective configs in memory in the setups where most of them are different. The configs equal to
+    the ones evicted from it are not shared anymore, but they still get the same ids.
+    """
+
+    def __init__(self, max_size: int = MAX_INTERNED_CONFIGS):
+        """
+        :param max_size: max number of the distinct configs to keep
+        """
+        self.max_size = max_size
+        # content hash -> config, from the least recently used
+        self._configs: OrderedDict[str, dict] = OrderedDict()
+        # id() of an interned config -> its content hash
+        self._ids: Dict[int, str] = {}
+        # content hashes of all the configs interned so far, including the evicted ones
+        self._distinct_hashes: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def intern(self, config: dict) -> dict:
+        """
+        :return: the interned config equal to the given one - the given one if there was none before
+        """
+        content_hash = get_content_hash(config)
+        with self._lock:
+            interned = self._configs.get(content_hash)
+            if interned is not None:
+                self._configs.move_to_end(content_hash)
+                return interned
+            self._configs[content_hash] = config
+            self._ids[id(config)] = content_hash
+            self._distinct_hashes.add(content_hash)
+            if len(self._configs) > self.max_size:
+                _, evicted = self._configs.popitem(last=False)
+                # its id() can be reused by a new object after it is freed
+                del self._ids[id(evicted)]
+            return config
+
+    def get_id(self, config: dict) -> str:
+        """
+        :return: id of the equivalence class of the config - the hash of its contents
+        """
+        with self._lock:
+            # the configs in self._ids are kept in self._configs, so their id()s are not reused
+            content_hash = self._ids.get(id(config))
+        if content_hash is not None:
+            return content_hash
+        return get_content_hash(config)
+
+    @property
+    def distinct_count(self) -> int:
+        """
+        :return: number of the distinct configs interned so far, including the ones evicted from the interner
+        """
+        return len(self._distinct_hashes)
+
+    def __len__(self) -> int:
+        return len(self._configs)
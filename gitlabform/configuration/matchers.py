@@ -0,0 +1,148 @@
+import fnmatch
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (precedence, pattern, compiled pattern)
+CompiledPattern = Tuple[tuple, str, re.Pattern]
+
+
+class ProjectPatternMatcher:
+    """
+    Finds the best matching 'project_pattern' key (f.e. "group/foo-*") for a project, ignoring the case.
+
+    The patterns are compiled once and indexed by their lowercase literal prefixes, so for a project only
+    the patterns with prefixes that the project path starts with are checked, instead of all of them.
+
+    The precedence rule is: the longest literal prefix (the part before the first "*") wins; on a tie - fewer
+    wildcards win; on a tie - the pattern that is the greatest string wins (so f.e. "group/foo-*-baz" wins over
+    "group/foo-*").
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        # lowercase literal prefix -> patterns, sorted by precedence, descending
+        self._patterns_by_prefix: Dict[str, List[CompiledPattern]] = {}
+        # the same for the patterns with "?" or "[...]" before the first "*", indexed by the part before these,
+        # which is shorter than the literal prefix used for precedence
+        self._other_patterns_by_prefix: Dict[str, List[CompiledPattern]] = {}
+
+        for pattern in patterns:
+            prefix = pattern.split("*", 1)[0]
+            precedence = (len(prefix), -pattern.count("*"), pattern)
+            compiled_pattern = (precedence, pattern, re.compile(fnmatch.translate(pattern.lower())))
+            indexed_prefix = re.split(r"[?\[]", prefix, maxsplit=1)[0]
+            if indexed_prefix == prefix:
+                self._patterns_by_prefix.setdefault(prefix.lower(), []).append(compiled_pattern)
+            else:
+                self._other_patterns_by_prefix.setdefault(indexed_prefix.lower(), []).append(compiled_pattern)
+
+        for patterns_by_prefix in [self._patterns_by_prefix, self._other_patterns_by_prefix]:
+            for candidates in patterns_by_prefix.values():
+                candidates.sort(reverse=True)
+
+        # longest first, as the longest literal prefix wins
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._patterns_by_prefix}, reverse=True)
+        self._other_prefix_lengths = sorted({len(prefix) for prefix in self._other_patterns_by_prefix}, reverse=True)
+
+    def get_best_match(self, group_and_project: str) -> Optional[str]:
+        """
+        :return: the best matching pattern or None if none of them matches
+        """
+        item = group_and_project.lower()
+
+        best = next(self._get_matches(item, self._patterns_by_prefix, self._prefix_lengths), None)
+
+        if self._other_patterns_by_prefix:
+            for candidate in self._get_matches(item, self._other_patterns_by_prefix, self._other_prefix_lengths):
+                if best is None or candidate[0] > best[0]:
+                    best = candidate
+
+        return best[1] if best else None
+
+    @staticmethod
+    def _get_matches(
+        item: str, patterns_by_prefix: Dict[str, List[CompiledPattern]], prefix_lengths: List[int]
+    ) -> Iterator[CompiledPattern]:
+        """
+        :return: patterns matching the item, from the best one for each of their prefixes, longest prefixes first
+        """
+        for prefix_length in prefix_lengths:
+            if prefix_length > len(item):
+                continue
+            for candidate in patterns_by_prefix.get(item[:prefix_length], []):
+                if candidate[2].match(item):
+                    yield candidate
+                    break
+
+
+class SkipListMatcher:
+    """
+    Checks if a group or project is in a 'skip_groups' or 'skip_projects' list, ignoring the case.
+
+    An element of the list matches an item if:
+    * it is equal to the item,
+    * it ends with "/*" and the item starts with the part before it (f.e. "group/*" skips "group" and "group/project"),
+      if that part has no wildcards,
+    * it contains "*" and matches the item as a shell-style pattern (f.e. "group/foo-*").
+
+    The list is compiled once into a set of the exact names, a set of the literal "/*" prefixes and regexes combining
+    the other patterns with the same literal prefix (or, for the patterns starting with a wildcard, suffix),
+    so checking an item does not depend on the length of the list.
+    """
+
+    def __init__(self, elements: Iterable[str]):
+        self._exact: set = set()
+        self._prefixes: set = set()
+        patterns_by_prefix: Dict[str, List[str]] = {}
+        patterns_by_suffix: Dict[str, List[str]] = {}
+
+        for element in elements:
+            element = element.lower()
+            self._exact.add(element)
+            if element.endswith("/*") and not re.search(r"[*?\[]", element[:-2]):
+                # this covers the shell-style pattern matching of this element too
+                self._prefixes.add(element[:-2])
+            elif "*" in element:
+                prefix = re.split(r"[*?\[]", element, maxsplit=1)[0]
+                suffix = re.split(r"[*?\]]", element)[-1]
+                if not prefix and suffix:
+                    patterns_by_suffix.setdefault(suffix, []).append(fnmatch.translate(element))
+                else:
+                    patterns_by_prefix.setdefault(prefix, []).append(fnmatch.translate(element))
+
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes})
+        self._patterns_by_prefix = {
+            prefix: re.compile("|".join(patterns)) for prefix, patterns in patterns_by_prefix.items()
+        }
+        self._patterns_prefix_lengths = sorted({len(prefix) for prefix in self._patterns_by_prefix})
+        self._patterns_by_suffix = {
+            suffix: re.compile("|".join(patterns)) for suffix, patterns in patterns_by_suffix.items()
+        }
+        self._patterns_suffix_lengths = sorted({len(suffix) for suffix in self._patterns_by_suffix})
+
+    def matches(self, item: str) -> bool:
+        item = item.lower()
+
+        if item in self._exact:
+            return True
+
+        for prefix_length in self._prefix_lengths:
+            if prefix_length > len(item):
+                break
+            if item[:prefix_length] in self._prefixes:
+                return True
+
+        for prefix_length in self._patterns_prefix_lengths:
+            if prefix_length > len(item):
+                break
+            patterns = self._patterns_by_prefix.get(item[:prefix_length])
+            if patterns and patterns.match(item):
+                return True
+
+        for suffix_length in self._patterns_suffix_lengths:
+            if suffix_length > len(item):
+                break
+            patterns = self._patterns_by_suffix.get(item[-suffix_length:])
+            if patterns and patterns.match(item):
+                return True
+
+        return False
@@ -31,7 +31,7 @@ class ConfigurationProjects(ConfigurationGroups, ABC):
         :return: if project is defined in the key with projects to skip,
                  ignoring the case
         """
-        return self._is_skipped_case_insensitively(self.get("skip_projects", []), project)
+        return self._is_skipped_case_insensitively("skip_projects", project)
 
     @functools.lru_cache()
     def get_effective_config_for_project(self, group_and_project) -> dict:
@@ -62,7 +62,7 @@ class ConfigurationProjects(ConfigurationGroups, ABC):
             to_str(effective_config_for_project),
         )
 
-        return effective_config_for_project
+        return self._intern_effective_config(effective_config_for_project)
 
     def _get_project_config(self, group_and_project) -> dict:
         """
@@ -73,22 +73,13 @@ class ConfigurationProjects(ConfigurationGroups, ABC):
         projects_and_groups = self.get("projects_and_groups")
 
         # 1. Exact match
-        exact = self._get_case_insensitively(projects_and_groups, group_and_project)
+        exact = self._get_from_projects_and_groups_case_insensitively(group_and_project)
         if exact:
             return exact
 
         # 2. Best matching pattern
-        matches = []
-        for key in projects_and_groups.keys():
-            if self._get_key_type(key) == "project_pattern":
-                if self._match_pattern(key, group_and_project):
-                    # store a 3-tuple for later sorting
-                    prefix = key.split("*", 1)[0]
-                    matches.append((len(prefix), -key.count("*"), key))
-        if matches:
-            # longest literal prefix wins; tie -> fewer wildcards; still tie -> first appearance
-            matches.sort(reverse=True)
-            best_key = matches[0][2]
-            return self._get_case_insensitively(projects_and_groups, best_key)
+        best_key = self._get_project_pattern_matcher().get_best_match(group_and_project)
+        if best_key:
+            return projects_and_groups[best_key]
 
         return {}
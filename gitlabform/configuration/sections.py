@@ -0,0 +1,101 @@
+import re
+from collections.abc import Mapping
+from logging import debug
+from typing import Dict, FrozenSet, Iterable, Set
+
+from gitlabform.configuration import Configuration
+
+
+class SectionsIndex:
+    """
+    Tells which groups and projects can have any of the given sections in their effective configs, f.e. the ones
+    selected with --only-sections, without computing their effective configs.
+
+    It is an index of the "projects_and_groups" keys to the names of the sections defined in their entries.
+    As merging the configs only adds the sections, a group can have a section in its effective config only if "*"
+    or the entry of the group, or of any of its ancestor groups, defines it - these are the sections inherited by
+    the group. A project can have a section if its group inherits it or if the project's entry (or the best
+    matching project pattern) defines it.
+    """
+
+    def __init__(self, configuration: Configuration, group_sections: Iterable[str], project_sections: Iterable[str]):
+        """
+        :param group_sections: the group-level sections to look for
+        :param project_sections: the project-level sections to look for
+        """
+        self.configuration = configuration
+        self.group_sections = frozenset(group_sections)
+        self.project_sections = frozenset(project_sections)
+
+        # lowercase "projects_and_groups" key -> names of the sections defined in its entry
+        self.sections_by_key: Dict[str, FrozenSet[str]] = {}
+        for key, entry in configuration.get("projects_and_groups", {}).items():
+            self.sections_by_key[key.lower()] = frozenset(entry.keys() if isinstance(entry, Mapping) else [])
+        # literal prefixes (the parts before the first wildcard) of the lowercase keys which entries define
+        # any of the project sections, for the project patterns and for the other keys
+        self._patterns_prefixes_with_project_sections: Set[str] = set()
+        self._prefixes_with_project_sections: Set[str] = set()
+        for key, sections in self.sections_by_key.items():
+            if sections & self.project_sections:
+                prefix = re.split(r"[*?\[]", key, maxsplit=1)[0]
+                if configuration._get_key_type(key) == "project_pattern":
+                    self._patterns_prefixes_with_project_sections.add(prefix)
+                else:
+                    self._prefixes_with_project_sections.add(prefix)
+        debug(
+            f"Indexed the sections of {len(self.sections_by_key)} 'projects_and_groups' entries, the project sections"
+            f" to process: {', '.join(sorted(self.project_sections))}"
+        )
+
+        # lowercase group -> names of the sections it inherits
+        self._inherited_sections: Dict[str, FrozenSet[str]] = {}
+
+    def group_may_have_sections(self, group: str) -> bool:
+        """
+        :param group: group/subgroup
+        :return: if the effective config of the group can contain any of the group sections
+        """
+        return bool(self._get_inherited_sections(group.lower()) & self.group_sections)
+
+    def project_may_have_sections(self, project: str) -> bool:
+        """
+        :param project: 'group/project' or a project pattern
+        :return: if the effective config of the project (or the projects matching the pattern) can contain
+                 any of the project sections
+        """
+        group, _ = project.rsplit("/", 1)
+        if self._get_inherited_sections(group.lower()) & self.project_sections:
+            return True
+        project_config = self.configuration._get_project_config(project)
+        return any(section in self.project_sections for section in project_config.keys())
+
+    def projects_in_group_may_have_sections(self, group: str) -> bool:
+        """
+        :param group: group/subgroup
+        :return: if the effective config of any project in the group or its subgroups can contain any of
+                 the project sections
+        """
+        group = group.lower()
+        if self._get_inherited_sections(group) & self.project_sections:
+            return True
+        group_path = f"{group}/"
+        # the subgroups and projects in the group
+        if any(prefix.startswith(group_path) for prefix in self._prefixes_with_project_sections):
+            return True
+        # the project patterns that can match projects in the group
+        return any(
+            prefix.startswith(group_path) or group_path.startswith(prefix)
+            for prefix in self._patterns_prefixes_with_project_sections
+        )
+
+    def _get_inherited_sections(self, group: str) -> FrozenSet[str]:
+        inherited_sections = self._inherited_sections.get(group)
+        if inherited_sections is None:
+            if "/" in group:
+                parent, _ = group.rsplit("/", 1)
+                inherited_sections = self._get_inherited_sections(parent)
+            else:
+                inherited_sections = self.sections_by_key.get("*", frozenset())
+            inherited_sections |= self.sections_by_key.get(f"{group}/*", frozenset())
+            self._inherited_sections[group] = inherited_sections
+        return inherited_sections
@@ -0,0 +1,54 @@
+import datetime
+import json
+from typing import Any
+
+# the key marking the JSON objects that encode the values that JSON doesn't have a type for
+TYPE_KEY = "__gitlabform_type__"
+
+
+def dumps(value: Any) -> str:
+    """
+    Serializes a config converted to simple types (see ConfigurationTransformer.to_simple_types()) to JSON,
+    preserving the types that JSON doesn't have: the dicts with non-string keys (f.e. YAML "1: x" or "true: x")
+    and the timestamps and dates.
+
+    :raises TypeError: if the value contains other types
+    """
+    return json.dumps(_encode(value), ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(text: str) -> Any:
+    """
+    :return: the value serialized with dumps()
+    """
+    return json.loads(text, object_hook=_decode)
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        if TYPE_KEY not in value and all(type(key) is str for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {TYPE_KEY: "dict", "items": [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    # datetime is a subclass of date
+    if isinstance(value, datetime.datetime):
+        return {TYPE_KEY: "datetime", "value": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {TYPE_KEY: "date", "value": value.isoformat()}
+    raise TypeError(f"Values of type {type(value).__name__} can't be serialized to JSON.")
+
+
+def _decode(value: dict) -> Any:
+    value_type = value.get(TYPE_KEY)
+    if value_type is None:
+        return value
+    if value_type == "dict":
+        return {key: item for key, item in value["items"]}
+    if value_type == "datetime":
+        return datetime.datetime.fromisoformat(value["value"])
+    if value_type == "date":
+        return datetime.date.fromisoformat(value["value"])
+    raise ValueError(f"Unknown type of the serialized value: {value_type}")
@@ -0,0 +1,130 @@
+import tempfile
+import threading
+from logging import debug
+from typing import IO, Callable, Dict, Optional, Tuple
+
+from gitlabform.configuration import serialization
+
+# max number of the effective configs kept in memory by default, the rest are written to a temporary file
+MAX_EFFECTIVE_CONFIGS_IN_MEMORY = 10000
+
+
+class EffectiveConfigsStore:
+    """
+    Keeps the effective configs computed when filtering the groups/projects to process, so they don't have to be
+    computed again when processing them.
+
+    To limit the memory used for big runs, only a given number of distinct config objects is kept in memory
+    (the interned configs shared by many groups/projects count as one), the next ones are serialized to JSON
+    and written to a temporary file, one per line. The configs with values that can't be serialized to JSON are kept
+    in memory anyway. The configs are removed from the store when they are consumed by processing.
+    """
+
+    def __init__(
+        self,
+        get_effective_config: Callable[[str], dict],
+        max_in_memory: int = MAX_EFFECTIVE_CONFIGS_IN_MEMORY,
+    ):
+        """
+        :param get_effective_config: function computing the effective config of a group/project
+        :param max_in_memory: max number of the distinct config objects to keep in memory
+        """
+        self.get_effective_config = get_effective_config
+        self.max_in_memory = max_in_memory
+
+        self._in_memory: Dict[str, dict] = {}
+        # id() of a config kept in memory -> number of entities it is kept for
+        self._in_memory_objects: Dict[int, int] = {}
+        # entity -> (offset, length) of its serialized config in the spill file
+        self._spilled: Dict[str, Tuple[int, int]] = {}
+        self._spill_file: Optional[IO[bytes]] = None
+        self._lock = threading.Lock()
+
+    def get(self, entity: str) -> dict:
+        """
+        :return: effective config of the entity, from the store or computed and stored for later
+        """
+        with self._lock:
+            config = self._read(entity)
+        if config is not None:
+            return config
+
+        config = self.get_effective_config(entity)
+        with self._lock:
+            self._write(entity, config)
+        return config
+
+    def pop(self, entity: str) -> dict:
+        """
+        :return: effective config of the entity, from the store (removing it from there) or computed
+        """
+        with self._lock:
+            config = self._read(entity, remove=True)
+        if config is not None:
+            return config
+
+        return self.get_effective_config(entity)
+
+    def __len__(self) -> int:
+        return len(self._in_memory) + len(self._spilled)
+
+    @property
+    def in_memory_objects_count(self) -> int:
+        return len(self._in_memory_objects)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spill_file:
+                self._spill_file.close()
+                self._spill_file = None
+            self._in_memory.clear()
+            self._in_memory_objects.clear()
+            self._spilled.clear()
+
+    def _read(self, entity: str, remove: bool = False) -> Optional[dict]:
+        if entity in self._in_memory:
+            if not remove:
+                return self._in_memory[entity]
+            config = self._in_memory.pop(entity)
+            self._in_memory_objects[id(config)] -= 1
+            if not self._in_memory_objects[id(config)]:
+                del self._in_memory_objects[id(config)]
+            return config
+
+        if entity in self._spilled:
+            offset, length = self._spilled.pop(entity) if remove else self._spilled[entity]
+            if not self._spill_file:
+                raise RuntimeError(f"The effective config of {entity} was written to a file that is already closed.")
+            self._spill_file.seek(offset)
+            return serialization.loads(self._spill_file.read(length).decode())
+
+        return None
+
+    def _write(self, entity: str, config: dict) -> None:
+        if entity in self._in_memory or entity in self._spilled:
+            return
+
+        if id(config) in self._in_memory_objects or len(self._in_memory_objects) < self.max_in_memory:
+            self._keep_in_memory(entity, config)
+            return
+
+        try:
+            serialized = (serialization.dumps(config) + "\n").encode()
+        except TypeError as e:
+            debug(f"Keeping the effective config of {entity} in memory, as it can't be written to a file: {e}")
+            self._keep_in_memory(entity, config)
+            return
+
+        if not self._spill_file:
+            self._spill_file = tempfile.TemporaryFile(prefix="gitlabform-effective-configs-")
+            debug(
+                f"More than {self.max_in_memory} effective configs to keep, writing the next ones to a temporary file"
+            )
+
+        offset = self._spill_file.seek(0, 2)
+        self._spill_file.write(serialized)
+        self._spilled[entity] = (offset, len(serialized))
+
+    def _keep_in_memory(self, entity: str, config: dict) -> None:
+        self._in_memory[entity] = config
+        self._in_memory_objects[id(config)] = self._in_memory_objects.get(id(config), 0) + 1
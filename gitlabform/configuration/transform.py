@@ -1,15 +1,18 @@
+import functools
 import sys
-from logging import debug, info, critical, DEBUG
+from io import StringIO
+from logging import debug, critical, DEBUG
 from abc import ABC, abstractmethod
-from types import SimpleNamespace
-from ruamel.yaml.comments import CommentedMap
-from yamlpath import Processor
-from yamlpath.exceptions import YAMLPathException
-from yamlpath.wrappers import ConsolePrinter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from ruamel.yaml.scalarbool import ScalarBoolean
+from ruamel.yaml.scalarfloat import ScalarFloat
+from ruamel.yaml.scalarint import ScalarInt
+from ruamel.yaml.scalarstring import ScalarString
 
 from gitlabform import util
 from gitlabform.constants import EXIT_INVALID_INPUT, APPROVAL_RULE_NAME
 from gitlabform.configuration import Configuration
+from gitlabform.configuration.directory import LazyProjectsAndGroups
 from gitlabform.gitlab import AccessLevel
 from gitlabform.gitlab import GitLab
 
@@ -21,6 +24,10 @@ from gitlabform.gitlab import GitLab
 # on user ids. Therefore, one of the transformers changes "user_id: <number>" into "user: <username>".
 
 
+# types of the values that are the same after dumping them to YAML and loading back with the "safe" loader
+SIMPLE_SCALAR_TYPES = {str, int, float, bool, type(None)}
+
+
 class ConfigurationTransformers:
     def __init__(self, gitlab: GitLab, log_level: int):
         self.user_transformer = UserTransformer(gitlab)
@@ -29,20 +36,158 @@ class ConfigurationTransformers:
         self.access_level_transformer = AccessLevelsTransformer(gitlab)
         self.log_level = log_level
 
+        # all the transformers' rules are applied in a single walk over the configuration
+        self.visitor = ConfigurationVisitor()
+        for transformer in [
+            self.user_transformer,
+            self.group_transformer,
+            self.implicit_name_transformer,
+            self.access_level_transformer,
+        ]:
+            transformer.add_rules(self.visitor)
+
     def transform(self, configuration: Configuration) -> None:
         if self.log_level == DEBUG:
-            config_before = util.yaml_config_to_string(configuration.config)
+            config_before = util.yaml_config_to_string(self._get_loaded_config(configuration.config))
             debug(f"Config BEFORE transformations:\n{config_before}")
 
-        self.user_transformer.transform(configuration)
-        self.group_transformer.transform(configuration)
-        self.implicit_name_transformer.transform(configuration)
-        self.access_level_transformer.transform(configuration, last=True)
+        projects_and_groups = configuration.config.get("projects_and_groups")
+        if isinstance(projects_and_groups, LazyProjectsAndGroups):
+            # the entries from the config directory files are transformed when they are parsed
+            projects_and_groups.add_transformation(self._transform_projects_and_groups)
+
+        self.visitor.visit(configuration.config)
+        ConfigurationTransformer.convert_to_simple_types(configuration)
 
         if self.log_level == DEBUG:
-            config_after = util.yaml_config_to_string(configuration.config)
+            config_after = util.yaml_config_to_string(self._get_loaded_config(configuration.config))
             debug(f"Config AFTER transformations:\n{config_after}")
 
+    def _transform_projects_and_groups(self, projects_and_groups: dict) -> dict:
+        config = {"projects_and_groups": projects_and_groups}
+        self.visitor.visit(config)
+        return ConfigurationTransformer.to_simple_types(config["projects_and_groups"], {})
+
+    @staticmethod
+    def _get_loaded_config(config: dict) -> dict:
+        """
+        :return: the config with only the already parsed entries of the lazily parsed "projects_and_groups"
+        """
+        projects_and_groups = config.get("projects_and_groups")
+        if isinstance(projects_and_groups, LazyProjectsAndGroups):
+            return {**config, "projects_and_groups": projects_and_groups.get_loaded()}
+        return config
+
+
+# a rule is called with the dict containing the matching key and that key
+TransformRule = Callable[[dict, Any], None]
+
+
+class VisitorState:
+    """
+    State of matching a path of keys against the visitor's patterns - the set of (pattern index, position
+    in the pattern) pairs, with the transitions to the next states computed on the first use.
+    """
+
+    def __init__(self, positions: FrozenSet[Tuple[int, int]], accepted_rules: List[TransformRule]):
+        self.positions = positions
+        self.accepted_rules = accepted_rules
+        # transitions for the literal keys of the patterns and for any other key
+        self.transitions: Optional[Tuple[Dict[Any, "VisitorState"], "VisitorState"]] = None
+
+
+class ConfigurationVisitor:
+    """
+    Walks the configuration tree once and calls the rules registered for the patterns that the paths of keys
+    to the visited nodes match.
+
+    Patterns are dot-separated keys, where "*" matches any single key and "**" matches any number of keys.
+    Lists are transparent for the patterns, so "a.b" matches both {"a": {"b": ...}} and {"a": [{"b": ...}]}.
+
+    Matching works like a lazily built DFA: each state remembers its transitions for the literal keys
+    of the patterns and for all the other keys, so visiting a node costs a dict lookup no matter how many rules
+    there are, and the subtrees that no pattern can match are skipped.
+    """
+
+    def __init__(self) -> None:
+        self.patterns: List[Tuple[str, ...]] = []
+        self.rules: List[TransformRule] = []
+        self._states: Dict[FrozenSet[Tuple[int, int]], VisitorState] = {}
+
+    def add_rule(self, pattern: str, rule: TransformRule) -> None:
+        self.patterns.append(tuple(pattern.split(".")))
+        self.rules.append(rule)
+        self._states.clear()
+
+    def visit(self, config: Any) -> None:
+        initial_state = self._get_state({(index, 0) for index in range(len(self.patterns))})
+        self._visit(config, initial_state)
+
+    def _visit(self, node: Any, state: VisitorState) -> None:
+        if isinstance(node, dict):
+            literal_transitions, other_transition = state.transitions or self._add_transitions(state)
+            # rules may replace the keys of the dict, so iterate over a copy of them
+            for key in list(node.keys()):
+                key_state = literal_transitions.get(key, other_transition)
+                if not key_state.positions:
+                    continue
+                for rule in key_state.accepted_rules:
+                    rule(node, key)
+                    if key not in node:
+                        break
+                else:
+                    self._visit(node[key], key_state)
+        elif isinstance(node, list):
+            for item in node:
+                self._visit(item, state)
+
+    def _add_transitions(self, state: VisitorState) -> Tuple[Dict[Any, VisitorState], VisitorState]:
+        literals = {
+            self.patterns[index][position]
+            for index, position in state.positions
+            if position < len(self.patterns[index]) and self.patterns[index][position] not in ("*", "**")
+        }
+        state.transitions = (
+            {literal: self._get_next_state(state, literal) for literal in literals},
+            self._get_next_state(state, None),
+        )
+        return state.transitions
+
+    def _get_next_state(self, state: VisitorState, key: Optional[str]) -> VisitorState:
+        """
+        :param key: a literal key of the patterns or None for any other key
+        """
+        next_positions = set()
+        for index, position in state.positions:
+            if position == len(self.patterns[index]):
+                continue
+            segment = self.patterns[index][position]
+            if segment == "**":
+                next_positions.add((index, position))
+            elif segment == "*" or segment == key:
+                next_positions.add((index, position + 1))
+        return self._get_state(next_positions)
+
+    def _get_state(self, positions: set) -> VisitorState:
+        # "**" matches also zero keys
+        to_check = list(positions)
+        while to_check:
+            index, position = to_check.pop()
+            if position < len(self.patterns[index]) and self.patterns[index][position] == "**":
+                if (index, position + 1) not in positions:
+                    positions.add((index, position + 1))
+                    to_check.append((index, position + 1))
+
+        frozen_positions = frozenset(positions)
+        state = self._states.get(frozen_positions)
+        if state is None:
+            accepted_rules = [
+                self.rules[index] for index, position in sorted(positions) if position == len(self.patterns[index])
+            ]
+            state = VisitorState(frozen_positions, accepted_rules)
+            self._states[frozen_positions] = state
+        return state
+
 
 class ConfigurationTransformer(ABC):
     def transform(self, configuration: Configuration, last: bool = False) -> None:
@@ -50,8 +195,13 @@ class ConfigurationTransformer(ABC):
         if last:
             self.convert_to_simple_types(configuration)
 
-    @abstractmethod
     def _do_transform(self, configuration: Configuration) -> None:
+        visitor = ConfigurationVisitor()
+        self.add_rules(visitor)
+        visitor.visit(configuration.config)
+
+    @abstractmethod
+    def add_rules(self, visitor: ConfigurationVisitor) -> None:
         pass
 
     @staticmethod
@@ -59,88 +209,119 @@ class ConfigurationTransformer(ABC):
         # we needed complex ruamel.yaml's types like ordereddict and CommentedSeq
         # for transformations, but at the end convert them to simple dict and lists
         # for easier to understand debug output and tests
-        config_yaml_string = util.yaml_config_to_string(configuration.config)
+        configuration.config = ConfigurationTransformer.to_simple_types(configuration.config, {})
 
-        simple_yaml_loader = util.configure_ruamel_yaml_loader(typ="safe", pure=True)
-        configuration.config = simple_yaml_loader.load(config_yaml_string)
+    @staticmethod
+    def to_simple_types(value, converted: dict):
+        """
+        Converts the value to the same simple types as dumping it to YAML and loading it back with the "safe" loader
+        would, but directly. The rare types that are not converted directly (like timestamps or tagged values)
+        are still converted that way.
+
+        :param value: value to convert
+        :param converted: id() of already converted dicts and lists -> their converted versions, so the values
+                          referenced from many places (f.e. with YAML aliases) are converted to shared values too
+        """
+        value_type = type(value)
+        if value_type in SIMPLE_SCALAR_TYPES:
+            return value
+
+        if isinstance(value, (dict, list)):
+            if id(value) in converted:
+                return converted[id(value)]
+            if isinstance(value, dict):
+                simple_dict: dict = {}
+                converted[id(value)] = simple_dict
+                for key in ConfigurationTransformer._get_keys_in_loading_order(value):
+                    simple_key = ConfigurationTransformer.to_simple_types(key, converted)
+                    simple_dict[simple_key] = ConfigurationTransformer.to_simple_types(value[key], converted)
+                return simple_dict
+            else:
+                simple_list: list = []
+                converted[id(value)] = simple_list
+                simple_list.extend(ConfigurationTransformer.to_simple_types(item, converted) for item in value)
+                return simple_list
+
+        if isinstance(value, LazyProjectsAndGroups):
+            # its entries are converted when they are parsed
+            return value
+
+        if isinstance(value, ScalarString):
+            return str(value)
+        if isinstance(value, ScalarBoolean):
+            return bool(value)
+        if isinstance(value, ScalarInt):
+            return int(value)
+        if isinstance(value, ScalarFloat):
+            return float(value)
+
+        yaml_dumper, simple_yaml_loader = ConfigurationTransformer._get_yaml_dumper_and_simple_loader()
+        string_stream = StringIO()
+        yaml_dumper.dump({"value": value}, string_stream)
+        return simple_yaml_loader.load(string_stream.getvalue())["value"]
+
+    @staticmethod
+    @functools.cache
+    def _get_yaml_dumper_and_simple_loader() -> tuple:
+        return util.configure_ruamel_yaml_loader(), util.configure_ruamel_yaml_loader(typ="safe", pure=True)
+
+    @staticmethod
+    def _get_keys_in_loading_order(a_dict: dict) -> list:
+        """
+        :return: keys of the dict in the order that the "safe" loader creates them in - with the keys merged
+                 from other dicts (with YAML "<<" merge keys) first
+        """
+        merged_dicts = getattr(a_dict, "merge", None)
+        if not merged_dicts:
+            return list(a_dict.keys())
+
+        keys: dict = {}
+        # the "safe" loader puts the keys of the dicts merged later first
+        for merged_dict in reversed(list(merged_dicts)):
+            if isinstance(merged_dict, tuple):
+                # (position, dict) in older ruamel.yaml versions
+                merged_dict = merged_dict[1]
+            keys.update(dict.fromkeys(ConfigurationTransformer._get_keys_in_loading_order(merged_dict)))
+        keys.update(dict.fromkeys(a_dict.keys()))
+        return list(keys)
 
 
 class UserTransformer(ConfigurationTransformer):
     def __init__(self, gitlab: GitLab):
         self.gitlab = gitlab
 
-    def _do_transform(self, configuration: Configuration) -> None:
-        logging_args = SimpleNamespace(quiet=False, verbose=False, debug=False)
-        log = ConsolePrinter(logging_args)
-        processor = Processor(log, configuration.config)
-        info("Getting user ids for users defined in protect_environments config")
-        try:
-            for node_coordinate in processor.get_nodes(
-                "projects_and_groups.*.protected_environments.*.deploy_access_levels.user",
-                mustexist=True,
-            ):
-                user = node_coordinate.parent.pop("user")
-
-                node_coordinate.parent["user_id"] = self.gitlab._get_user_id(user)
-        except YAMLPathException as e:
-            # this just means that we haven't found any keys in YAML
-            # under the given path
-            pass
-
-        info("Getting user ids for users defined in merge_requests_approval_rules config")
-        try:
-            for node_coordinate in processor.get_nodes(
-                "**.merge_requests_approval_rules.*.users",
-                mustexist=True,
-            ):
-                user_ids = []
-                users = node_coordinate.parent.pop("users")
-                for user in users:
-                    user_id = self.gitlab._get_user_id(user)
-                    user_ids.append(user_id)
-                node_coordinate.parent["user_ids"] = user_ids
-        except YAMLPathException as e:
-            # this just means that we haven't found any keys in YAML
-            # under the given path
-            pass
+    def add_rules(self, visitor: ConfigurationVisitor) -> None:
+        visitor.add_rule(
+            "projects_and_groups.*.protected_environments.*.deploy_access_levels.user", self._transform_user
+        )
+        visitor.add_rule("**.merge_requests_approval_rules.*.users", self._transform_users)
+
+    def _transform_user(self, parent: dict, key: str) -> None:
+        user = parent.pop(key)
+        parent["user_id"] = self.gitlab._get_user_id(user)
+
+    def _transform_users(self, parent: dict, key: str) -> None:
+        users = parent.pop(key)
+        parent["user_ids"] = [self.gitlab._get_user_id(user) for user in users]
 
 
 class GroupTransformer(ConfigurationTransformer):
     def __init__(self, gitlab: GitLab):
         self.gitlab = gitlab
 
-    def _do_transform(self, configuration: Configuration) -> None:
-        logging_args = SimpleNamespace(quiet=False, verbose=False, debug=False)
-        processor = Processor(ConsolePrinter(logging_args), configuration.config)
+    def add_rules(self, visitor: ConfigurationVisitor) -> None:
+        visitor.add_rule(
+            "projects_and_groups.*.protected_environments.*.deploy_access_levels.group", self._transform_group
+        )
+        visitor.add_rule("**.merge_requests_approval_rules.*.groups", self._transform_groups)
 
-        try:
-            for node_coordinate in processor.get_nodes(
-                "projects_and_groups.*.protected_environments.*.deploy_access_levels.group",
-                mustexist=True,
-            ):
-                group = node_coordinate.parent.pop("group")
-                node_coordinate.parent["group_id"] = self.gitlab._get_group_id(group)
-
-        except YAMLPathException as e:
-            # this just means that we haven't found any keys in YAML
-            # under the given path
-            pass
+    def _transform_group(self, parent: dict, key: str) -> None:
+        group = parent.pop(key)
+        parent["group_id"] = self.gitlab._get_group_id(group)
 
-        try:
-            for node_coordinate in processor.get_nodes(
-                "**.merge_requests_approval_rules.*.groups",
-                mustexist=True,
-            ):
-                group_ids = []
-                groups = node_coordinate.parent.pop("groups")
-                for group in groups:
-                    group_id = self.gitlab._get_group_id(group)
-                    group_ids.append(group_id)
-                node_coordinate.parent["group_ids"] = group_ids
-        except YAMLPathException:
-            # this just means that we haven't found any keys in YAML
-            # under the given path
-            pass
+    def _transform_groups(self, parent: dict, key: str) -> None:
+        groups = parent.pop(key)
+        parent["group_ids"] = [self.gitlab._get_group_id(group) for group in groups]
 
 
 class ImplicitNameTransformer(ConfigurationTransformer):
@@ -163,23 +344,13 @@ class ImplicitNameTransformer(ConfigurationTransformer):
         # this transformer doesn't need to call gitlab
         pass
 
-    def _do_transform(self, configuration: Configuration) -> None:
-        logging_args = SimpleNamespace(quiet=False, verbose=False, debug=False)
-        processor = Processor(ConsolePrinter(logging_args), configuration.config)
+    def add_rules(self, visitor: ConfigurationVisitor) -> None:
+        visitor.add_rule("projects_and_groups.*.protected_environments.*", self._add_name)
 
-        try:
-            for node_coordinate in processor.get_nodes(
-                "projects_and_groups.*.protected_environments.*",
-                mustexist=True,
-            ):
-                if type(node_coordinate.node) not in [CommentedMap, dict]:
-                    continue
-
-                node_coordinate.parent[node_coordinate.parentref]["name"] = node_coordinate.parentref
-        except YAMLPathException:
-            # this just means that we haven't found any keys in YAML
-            # under the given path
-            pass
+    @staticmethod
+    def _add_name(parent: dict, key: str) -> None:
+        if isinstance(parent[key], dict):
+            parent[key]["name"] = key
 
 
 class AccessLevelsTransformer(ConfigurationTransformer):
@@ -189,72 +360,50 @@ class AccessLevelsTransformer(ConfigurationTransformer):
     the appropriate numbers.
     """
 
+    ACCESS_LEVEL_KEYS = [
+        # branches, old syntax
+        "push_access_level",
+        "merge_access_level",
+        "unprotect_access_level",
+        # members & group members, and also branches, new GitLab Premium syntax
+        # (elements of allowed_to_push, allowed_to_merge and allowed_to_unprotect lists)
+        "access_level",
+        "group_access",
+        # old syntax
+        "group_access_level",
+        # tags
+        "create_access_level",
+    ]
+
     def __init__(self, gitlab: GitLab):
         # this transformer doesn't need to call gitlab
         pass
 
-    def _do_transform(self, configuration: Configuration):
-        logging_args = SimpleNamespace(quiet=False, verbose=False, debug=False)
-        processor = Processor(ConsolePrinter(logging_args), configuration.config)
-
-        # [.!<100] effectively means that the value is non-numerical
-        paths_to_hashes = [
-            # # branches, old syntax
-            "**.push_access_level[.!<100]",
-            "**.merge_access_level[.!<100]",
-            "**.unprotect_access_level[.!<100]",
-            # members & group members
-            "**.access_level[.!<100]",
-            "**.group_access[.!<100]",
-            # old syntax
-            "**.group_access_level[.!<100]",
-            # tags
-            "**.create_access_level[.!<100]",
-        ]
-
-        for path in paths_to_hashes:
-            try:
-                for node_coordinate in processor.get_nodes(path, mustexist=True):
-                    try:
-                        access_level_string = str(node_coordinate.node)
-                        node_coordinate.parent[node_coordinate.parentref] = AccessLevel.get_value(access_level_string)
-                    except KeyError:
-                        critical(
-                            f"Configuration string '{access_level_string}' is not one of the valid access levels:"
-                            f" {', '.join(AccessLevel.get_canonical_names())}"
-                        )
-                        sys.exit(EXIT_INVALID_INPUT)
-            except YAMLPathException:
-                # this just means that we haven't found any keys in YAML
-                # under the given path
-                pass
-
-        # these are different from the above, as they are elements of arrays,
-        # so we need different search query and an extra condition for
-        # transformation
-        paths_to_arrays = [
-            # # branches, new GitLab Premium syntax
-            "**.allowed_to_push.*.[access_level!<100]",
-            "**.allowed_to_merge.*.[access_level!<100]",
-            "**.allowed_to_unprotect.*.[access_level!<100]",
-        ]
-
-        for path in paths_to_arrays:
-            try:
-                for node_coordinate in processor.get_nodes(path, mustexist=True):
-                    if node_coordinate.parentref == "access_level":
-                        try:
-                            access_level_string = str(node_coordinate.node)
-                            node_coordinate.parent[node_coordinate.parentref] = AccessLevel.get_value(
-                                access_level_string
-                            )
-                        except KeyError:
-                            critical(
-                                f"Configuration string '{access_level_string}' is not one of the valid access levels:"
-                                f" {', '.join(AccessLevel.get_canonical_names())}"
-                            )
-                            sys.exit(EXIT_INVALID_INPUT)
-            except YAMLPathException:
-                # this just means that we haven't found any keys in YAML
-                # under the given path
-                pass
+    def add_rules(self, visitor: ConfigurationVisitor) -> None:
+        for key in self.ACCESS_LEVEL_KEYS:
+            visitor.add_rule(f"**.{key}", self._transform_access_level)
+
+    @staticmethod
+    def _transform_access_level(parent: dict, key: str) -> None:
+        value = parent[key]
+        if isinstance(value, (dict, list)) or AccessLevelsTransformer._is_numeric(value):
+            return
+
+        access_level_string = str(value)
+        try:
+            parent[key] = AccessLevel.get_value(access_level_string)
+        except KeyError:
+            critical(
+                f"Configuration string '{access_level_string}' is not one of the valid access levels:"
+                f" {', '.join(AccessLevel.get_canonical_names())}"
+            )
+            sys.exit(EXIT_INVALID_INPUT)
+
+    @staticmethod
+    def _is_numeric(value: Any) -> bool:
+        # like the numeric values, the strings containing numbers are left as they are
+        try:
+            float(value)
+            return True
+        except (TypeError, ValueError):
+            return False
@@ -1,6 +1,8 @@
 import enum
 import inspect
 import logging
+import threading
+import weakref
 
 from typing import List
 
@@ -72,10 +74,25 @@ class GitlabWrapper:
     # Parameters accepted by python-gitlab's GraphQL.__init__
     GRAPHQL_PARAMS = set(inspect.signature(GraphQL.__init__).parameters.keys()) - {"self"}
 
+    # All the processors (and everything else) using the same GitLab connection share a single python-gitlab
+    # client, so that its caches (f.e. of the projects, groups and users got by path) are shared too.
+    _clients: "weakref.WeakKeyDictionary[GitLab, PythonGitlab]" = weakref.WeakKeyDictionary()
+    _clients_lock = threading.Lock()
+
     def __init__(self, gitlabform: GitLab):
+        with self._clients_lock:
+            client = self._clients.get(gitlabform)
+            if client is None:
+                client = self._create_client(gitlabform)
+                self._clients[gitlabform] = client
+
+        self._gitlab: PythonGitlab = client
+
+    @classmethod
+    def _create_client(cls, gitlabform: GitLab) -> PythonGitlab:
         session = gitlabform.session
 
-        graphql_kwargs = {k: v for k, v in gitlabform.gitlab_config.items() if k in self.GRAPHQL_PARAMS}
+        graphql_kwargs = {k: v for k, v in gitlabform.gitlab_config.items() if k in cls.GRAPHQL_PARAMS}
         graphql = GraphQL(**graphql_kwargs)
 
         default_gitlab_kwargs = {
@@ -93,12 +110,12 @@ class GitlabWrapper:
             **{
                 k: v
                 for k, v in gitlabform.gitlab_config.items()
-                if k not in renamed_gitlab_kwargs and k in self.GITLAB_CLIENT_PARAMS
+                if k not in renamed_gitlab_kwargs and k in cls.GITLAB_CLIENT_PARAMS
             },
             **{renamed_gitlab_kwargs[k]: v for k, v in gitlabform.gitlab_config.items() if k in renamed_gitlab_kwargs},
         }
 
-        self._gitlab: PythonGitlab = PythonGitlab(
+        return PythonGitlab(
             api_version="4",
             graphql=graphql,
             session=session,
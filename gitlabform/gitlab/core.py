@@ -1,8 +1,10 @@
 import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 import re
+import threading
 from logging import debug, info, warning
-from typing import Union
+from typing import Iterator, Optional, Union
 from urllib import parse
 
 from packaging import version
@@ -18,12 +20,18 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from gitlabform.configuration import Configuration
+from gitlabform.configuration.cache import CompiledConfigCache
+from gitlabform.gitlab.metrics import RequestMetrics
+from gitlabform.gitlab.rate_limit import RateLimitController, RateLimitedHTTPAdapter
 from gitlabform.util import to_str
 
+# the only fields of the project objects that are needed to decide which projects to process
+DISCOVERY_PROJECT_FIELDS = ["id", "path_with_namespace", "archived", "marked_for_deletion_on"]
+
 
 class GitLabCore:
-    def __init__(self, config_path=None, config_string=None):
-        self.configuration = Configuration(config_path, config_string)
+    def __init__(self, config_path=None, config_string=None, config_cache: Optional[CompiledConfigCache] = None):
+        self.configuration = Configuration(config_path, config_string, config_cache)
 
         default_gitlab_config = {
             "url": os.getenv("GITLAB_URL"),
@@ -33,6 +41,8 @@ class GitLabCore:
             "max_retries": 3,
             "backoff_factor": 0.25,
             "retry_transient_errors": True,
+            "max_parallel_pages": 4,
+            "adapt_to_rate_limits": True,
         }
         gitlab_config_from_file = self.configuration.get("gitlab", {})
         self.gitlab_config = {**default_gitlab_config, **gitlab_config_from_file}
@@ -50,14 +60,29 @@ class GitLabCore:
             # 5xx status codes are included to retry after transient server errors
             retries_status_forcelist = [429, 500, 502, 503, 504] + list(range(520, 531))
 
-        retries = Retry(
+        self.retries = Retry(
             total=self.gitlab_config["max_retries"],
             backoff_factor=self.gitlab_config["backoff_factor"],
             status_forcelist=retries_status_forcelist,
         )
 
-        self.session.mount("http://", HTTPAdapter(max_retries=retries))
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
+        if self.gitlab_config["adapt_to_rate_limits"]:
+            # shared by all the requests made using this session, including the python-gitlab ones
+            self.rate_limit_controller: Optional[RateLimitController] = RateLimitController(
+                requests.adapters.DEFAULT_POOLSIZE
+            )
+        else:
+            self.rate_limit_controller = None
+        self._mount_adapters(requests.adapters.DEFAULT_POOLSIZE)
+
+        # gets the pages of the listings in parallel, shared by all the threads using this object, so that
+        # the number of threads making requests doesn't grow with the number of listings being got at the same time
+        self._pages_executor: Optional[ThreadPoolExecutor] = None
+        self._pages_executor_lock = threading.Lock()
+
+        # as the session is shared with python-gitlab, this covers all the requests made to GitLab
+        self.request_metrics = RequestMetrics()
+        self.session.hooks["response"].append(self.request_metrics.record)
 
         self.session.verify = self.gitlab_config["ssl_verify"]
         if not self.gitlab_config["ssl_verify"]:
@@ -101,6 +126,29 @@ class GitLabCore:
     def get_configuration(self):
         return self.configuration
 
+    def set_max_concurrent_requests(self, max_concurrent_requests: int) -> None:
+        """
+        Resizes the HTTP connection pools, so that the given number of threads can share the session
+        without opening and discarding extra connections.
+
+        :param max_concurrent_requests: how many requests can be made at the same time
+        """
+        pool_maxsize = max(requests.adapters.DEFAULT_POOLSIZE, max_concurrent_requests)
+        if self.rate_limit_controller:
+            self.rate_limit_controller.set_max_concurrent_requests(pool_maxsize)
+        self._mount_adapters(pool_maxsize)
+
+    def _mount_adapters(self, pool_maxsize: int) -> None:
+        adapter: HTTPAdapter
+        if self.rate_limit_controller:
+            adapter = RateLimitedHTTPAdapter(
+                self.rate_limit_controller, max_retries=self.retries, pool_maxsize=pool_maxsize
+            )
+        else:
+            adapter = HTTPAdapter(max_retries=self.retries, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     def get_project(self, project_and_group_or_id):
         return self._make_requests_to_api("projects/%s", project_and_group_or_id)
 
@@ -142,6 +190,12 @@ class GitLabCore:
 
     @functools.lru_cache()
     def _get_user_id(self, username: str) -> int:
+        compiled_config = self.configuration.compiled_config
+        if compiled_config:
+            user_id = compiled_config.get_id("user", username)
+            if user_id is not None:
+                return user_id
+
         users = self._make_requests_to_api("users?username=%s", username, "GET")
 
         # this API endpoint is for lookup, not search, so 'username' has to be full and exact username
@@ -150,12 +204,25 @@ class GitLabCore:
         if len(users) == 0:
             raise NotFoundException("No users found when searching for username '%s'" % username)
 
-        return int(users[0]["id"])
+        user_id = int(users[0]["id"])
+        if compiled_config:
+            compiled_config.add_id("user", username, user_id)
+        return user_id
 
     @functools.lru_cache()
     def _get_group_id(self, path) -> int:
+        compiled_config = self.configuration.compiled_config
+        if compiled_config:
+            group_id = compiled_config.get_id("group", path)
+            if group_id is not None:
+                return group_id
+
         group = self._make_requests_to_api("groups/%s", path, "GET")
-        return int(group["id"])
+
+        group_id = int(group["id"])
+        if compiled_config:
+            compiled_config.add_id("group", path, group_id)
+        return group_id
 
     @functools.lru_cache()
     def _get_protected_branch_id(self, project_and_group_name, branch) -> int:
@@ -199,36 +266,144 @@ class GitLabCore:
             response = self._make_request_to_api(path_as_format_string, args, method, data, expected_codes, json)
             return response.json()
         else:
-            if "?" in path_as_format_string:
-                path_as_format_string += "&per_page=100"
-            else:
-                path_as_format_string += "?per_page=100"
-
-            first_response = self._make_request_to_api(path_as_format_string, args, method, data, expected_codes, json)
-            results = first_response.json()
-
-            # In newer versions of GitLab the 'x-total-pages' may not be available
-            # anymore, see https://gitlab.com/gitlab-org/gitlab/-/merge_requests/43159
-            # so let's use the 'x-next-page' header instead
-
-            response = first_response
-            while True:
-                if "x-next-page" in response.headers and response.headers["x-next-page"]:
-                    next_page = response.headers["x-next-page"]
-                    response = self._make_request_to_api(
-                        path_as_format_string + "&page=" + str(next_page),
-                        args,
-                        method,
-                        data,
-                        expected_codes,
-                        json,
-                    )
-                    results += response.json()
-                else:
-                    break
+            responses = self._get_pages(path_as_format_string, args, expected_codes, data=data, json_data=json)
+
+            results = next(responses).json()
+            for response in responses:
+                results += response.json()
 
         return results
 
+    def iter_requests_to_api(
+        self, path_as_format_string, args=None, expected_codes=200, keyset_pagination=False
+    ) -> Iterator[dict]:
+        """
+        Makes GET requests to a paginated GitLab API endpoint and yields the returned objects page by page,
+        so that - unlike with `_make_requests_to_api()` - the objects from all the pages don't have to be kept
+        in memory at the same time.
+
+        :param for the params description please see `_make_requests_to_api()`
+        :param keyset_pagination: set to True for the endpoints that support keyset pagination by 'id_after'
+                                  (like "projects") AND when the path is ordered by 'order_by=id&sort=asc'
+        :return: iterator over the objects returned by the endpoint
+        """
+        for response in self._get_pages(path_as_format_string, args, expected_codes, keyset_pagination):
+            yield from response.json()
+
+    def _get_pages(
+        self, path_as_format_string, args, expected_codes, keyset_pagination=False, data=None, json_data=None
+    ) -> Iterator[requests.Response]:
+        """
+        Makes GET requests to the GitLab API endpoint, one for each page if it is paginated.
+
+        If we know how many pages there are, then the next pages are got in parallel (up to 'max_parallel_pages'
+        at a time, to limit the memory usage). If we don't, then the pages are got one by one, using keyset
+        pagination if it's possible, as it is much faster than the offset pagination for the big listings.
+
+        :param for the params description please see `iter_requests_to_api()` and `_make_requests_to_api()`,
+               the data and json_data are sent with the requests for all the pages
+        :return: iterator over the responses for the consecutive pages
+        """
+        if "?" in path_as_format_string:
+            path_as_format_string += "&per_page=100"
+        else:
+            path_as_format_string += "?per_page=100"
+
+        response = self._make_request_to_api(path_as_format_string, args, "GET", data, expected_codes, json_data)
+        if keyset_pagination:
+            # the objects are needed here too, so parse them once for here and for the caller
+            objects = response.json()
+            response.json = lambda: objects
+        yield response
+
+        # In newer versions of GitLab the 'x-total-pages' may not be available
+        # anymore, see https://gitlab.com/gitlab-org/gitlab/-/merge_requests/43159
+        # (it's also omitted for the listings with more than 10000 objects)
+        # so in such cases let's use the 'x-next-page' header instead
+
+        total_pages = int(response.headers.get("x-total-pages") or 0)
+        if total_pages > 1 and self.gitlab_config["max_parallel_pages"] > 1:
+            yield from self._get_pages_in_parallel(
+                path_as_format_string, args, expected_codes, total_pages, data, json_data
+            )
+        elif keyset_pagination and response.headers.get("x-next-page") and objects:
+            yield from self._get_pages_with_keyset(
+                path_as_format_string, args, expected_codes, objects[-1]["id"], data, json_data
+            )
+        else:
+            while "x-next-page" in response.headers and response.headers["x-next-page"]:
+                next_page = response.headers["x-next-page"]
+                response = self._make_request_to_api(
+                    path_as_format_string + "&page=" + str(next_page),
+                    args,
+                    "GET",
+                    data,
+                    expected_codes,
+                    json_data,
+                )
+                yield response
+
+    def _get_pages_in_parallel(
+        self, path_as_format_string, args, expected_codes, total_pages, data=None, json_data=None
+    ) -> Iterator[requests.Response]:
+        """
+        Gets the pages from the 2nd to the last one, in parallel batches of 'max_parallel_pages' pages.
+        The pages of all the listings are got by the same 'max_parallel_pages' threads.
+
+        :return: iterator over the responses for the consecutive pages
+        """
+        max_parallel_pages = self.gitlab_config["max_parallel_pages"]
+        executor = self._get_pages_executor()
+
+        def get_page(page):
+            return self._make_request_to_api(
+                path_as_format_string + "&page=" + str(page),
+                args,
+                "GET",
+                data,
+                expected_codes,
+                json_data,
+            )
+
+        for first_page in range(2, total_pages + 1, max_parallel_pages):
+            pages = range(first_page, min(first_page + max_parallel_pages, total_pages + 1))
+            # map() returns the results in the order of the pages
+            yield from executor.map(get_page, pages)
+
+    def _get_pages_executor(self) -> ThreadPoolExecutor:
+        with self._pages_executor_lock:
+            if self._pages_executor is None:
+                self._pages_executor = ThreadPoolExecutor(
+                    max_workers=self.gitlab_config["max_parallel_pages"], thread_name_prefix="gitlabform-pages"
+                )
+            return self._pages_executor
+
+    def _get_pages_with_keyset(
+        self, path_as_format_string, args, expected_codes, last_id, data=None, json_data=None
+    ) -> Iterator[requests.Response]:
+        """
+        Gets the pages after the object with the given id, using the keyset pagination.
+        See https://docs.gitlab.com/api/rest/#keyset-based-pagination
+
+        :return: iterator over the responses for the consecutive pages
+        """
+        response = self._make_request_to_api(
+            path_as_format_string + "&pagination=keyset&id_after=" + str(last_id),
+            args,
+            "GET",
+            data,
+            expected_codes,
+            json_data,
+        )
+        yield response
+
+        while "next" in response.links:
+            # the link to the next page is a full URL, with the path and args already URL-encoded
+            next_url = parse.urlsplit(response.links["next"]["url"])
+            next_path = next_url.path.split("/api/v4/", 1)[1] + "?" + next_url.query
+            response = self._make_request_to_api(next_path, None, "GET", data, expected_codes, json_data)
+            yield response
+
     def _make_request_to_api(self, path_as_format_string, args, method, dict_data, expected_codes, json_data):
         """
         Makes a single request to the GitLab API. Takes care of the authentication, basic error processing,
@@ -302,6 +477,14 @@ class GitLabCore:
 
             return format_string % url_encoded_args
 
+    @staticmethod
+    def _to_discovery_project(project: dict) -> dict:
+        """
+        :param project: project object, as returned by the GitLab API
+        :return: the project object with only the fields in DISCOVERY_PROJECT_FIELDS
+        """
+        return {field: project.get(field) for field in DISCOVERY_PROJECT_FIELDS}
+
     @staticmethod
     def _listify(expected_codes):
         if isinstance(expected_codes, int):
@@ -46,15 +46,13 @@ class GitLabGroups(GitLabCore):
             # - it's the minimal role that is needed to manage something (f.e. group labels)
             query = f"min_access_level=20"
 
-        result = self._make_requests_to_api(f"groups?{query}")
-
-        return sorted(map(lambda x: x["full_path"], result))
+        return sorted(group["full_path"] for group in self.iter_requests_to_api(f"groups?{query}"))
 
     def get_projects(self, group, include_archived=False, only_names=True):
         """
         :param group: group name
         :param include_archived: set to True if archived projects should also be returned
-        :param only_names: set to False to get the whole project objects
+        :param only_names: set to False to get the project objects, with only the fields in DISCOVERY_PROJECT_FIELDS
         :return: sorted list of strings "group/project_name". Note that only projects from "group" namespace are
                  returned, so if "group" (= members of this group) is also a member of some projects, they won't be
                  returned here.
@@ -74,23 +72,16 @@ class GitLabGroups(GitLabCore):
                 # - it's the minimal role that is needed to manage something (f.e. labels)
                 query2 = f"min_access_level=20"
 
-            projects = self._make_requests_to_api(f"groups/%s/projects?{query1}&{query2}", group)
+            # the project objects are big, so keep only what we need from them
+            projects = [
+                self._to_discovery_project(project)
+                for project in self.iter_requests_to_api(f"groups/%s/projects?{query1}&{query2}", group)
+                if project["path_with_namespace"].startswith(group + "/")
+            ]
         except NotFoundException:
             projects = []
 
-        project_and_groups_in_group_namespace = [
-            project for project in projects if project["path_with_namespace"].startswith(group + "/")
-        ]
-
         if only_names:
-            return sorted(
-                map(
-                    lambda x: x["path_with_namespace"],
-                    project_and_groups_in_group_namespace,
-                )
-            )
+            return sorted(map(lambda x: x["path_with_namespace"], projects))
         else:
-            return sorted(
-                project_and_groups_in_group_namespace,
-                key=lambda x: x["path_with_namespace"],
-            )
+            return sorted(projects, key=lambda x: x["path_with_namespace"])
@@ -0,0 +1,149 @@
+import json
+import threading
+from typing import Dict, List
+from urllib import parse
+
+import requests
+
+# upper bounds (in seconds) of the buckets of the latency histograms, the last bucket is for everything slower
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+# segments of the API paths that are followed by ids or names of the objects in these collections
+COLLECTIONS_WITH_NAMED_ELEMENTS = {
+    "projects",
+    "groups",
+    "users",
+    "branches",
+    "protected_branches",
+    "tags",
+    "protected_tags",
+    "files",
+    "variables",
+    "environments",
+    "protected_environments",
+    "members",
+    "labels",
+}
+
+
+class _ThreadCalls(threading.local):
+    """
+    Number of the requests made by the current thread.
+    """
+
+    calls: int = 0
+
+
+class RequestMetrics:
+    """
+    Collects the metrics of the requests made to GitLab, per endpoint template (f.e. "GET projects/:id/hooks").
+
+    Its 'record' method is meant to be registered as a response hook of the requests.Session shared by
+    GitLabForm and python-gitlab, so all the API calls are counted.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        # the response hooks run in the threads that made the requests
+        self._thread_calls = _ThreadCalls()
+
+    def record(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        endpoint = f"{response.request.method} {self.get_endpoint_template(response.request.url or '')}"
+        latency = response.elapsed.total_seconds()
+        size = self._get_size(response, kwargs.get("stream", False))
+        retries = self._get_retries(response)
+
+        self._thread_calls.calls += 1
+
+        with self._lock:
+            metrics = self.endpoints.get(endpoint)
+            if metrics is None:
+                metrics = {
+                    "calls": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "latency_histogram": [0] * (len(LATENCY_BUCKETS) + 1),
+                    "total_size": 0,
+                    "retries": 0,
+                    "status_codes": {},
+                }
+                self.endpoints[endpoint] = metrics
+
+            metrics["calls"] += 1
+            metrics["total_time"] += latency
+            metrics["max_time"] = max(metrics["max_time"], latency)
+            metrics["latency_histogram"][self._get_bucket(latency)] += 1
+            metrics["total_size"] += size
+            metrics["retries"] += retries
+            status_code = str(response.status_code)
+            metrics["status_codes"][status_code] = metrics["status_codes"].get(status_code, 0) + 1
+
+        return response
+
+    def get_calls_in_current_thread(self) -> int:
+        return self._thread_calls.calls
+
+    @staticmethod
+    def get_endpoint_template(url: str) -> str:
+        """
+        :param url: full URL of an API request,
+                    f.e. "https://gitlab.example.com/api/v4/projects/group%2Fproject/repository/branches/main?x=1"
+        :return: its path with the ids and names of the objects replaced with placeholders,
+                 f.e. "projects/:id/repository/branches/:id"
+        """
+        path = parse.urlsplit(url).path
+        if "/api/v4/" in path:
+            path = path.split("/api/v4/", 1)[1]
+        else:
+            path = path.lstrip("/")
+
+        segments = path.split("/")
+        for i, segment in enumerate(segments):
+            if segment.isdigit() or "%" in segment or (i > 0 and segments[i - 1] in COLLECTIONS_WITH_NAMED_ELEMENTS):
+                segments[i] = ":id"
+        return "/".join(segments).rstrip("/")
+
+    def get_top_endpoints(self, n: int) -> List[tuple]:
+        """
+        :return: up to n (endpoint, metrics) tuples, sorted by the total time of the requests, descending
+        """
+        with self._lock:
+            return sorted(self.endpoints.items(), key=lambda item: item[1]["total_time"], reverse=True)[:n]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "total_calls": sum(metrics["calls"] for metrics in self.endpoints.values()),
+                "total_time": sum(metrics["total_time"] for metrics in self.endpoints.values()),
+                "latency_buckets": LATENCY_BUCKETS,
+                "endpoints": {endpoint: dict(metrics) for endpoint, metrics in sorted(self.endpoints.items())},
+            }
+
+    def write_to_file(self, metrics_file: str) -> None:
+        with open(metrics_file, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @staticmethod
+    def _get_bucket(latency: float) -> int:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                return i
+        return len(LATENCY_BUCKETS)
+
+    @staticmethod
+    def _get_size(response: requests.Response, stream: bool) -> int:
+        # don't consume the body of the streamed responses
+        if not stream:
+            return len(response.content)
+        try:
+            return int(response.headers.get("Content-Length", 0))
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def _get_retries(response: requests.Response) -> int:
+        # urllib3 keeps the history of the retries made by the Retry object of the adapter
+        retries = getattr(response.raw, "retries", None)
+        history = getattr(retries, "history", None)
+        return len(history) if history else 0
@@ -108,14 +108,56 @@ class GitLabProjects(GitLabCore):
             # there are 3 states of the "archived" flag: true, false, undefined
             # we use the last 2
             if include_archived:
-                query_string = "order_by=name&sort=asc"
+                query_string = "order_by=id&sort=asc"
             else:
-                query_string = "order_by=name&sort=asc&archived=false"
-            result = self._make_requests_to_api(f"projects?{query_string}")
-            return sorted(map(lambda x: x["path_with_namespace"], result))
+                query_string = "order_by=id&sort=asc&archived=false"
+            return sorted(
+                project["path_with_namespace"]
+                for project in self.iter_requests_to_api(f"projects?{query_string}", keyset_pagination=True)
+            )
         except NotFoundException:
             return []
 
+    def get_all_projects_in_groups(self, include_archived=False, only_names=True):
+        """
+        Gets all the projects in all the groups that you have access to, with a single paginated listing,
+        instead of listing projects of each group and subgroup separately.
+
+        :param include_archived: if the archived projects should be returned too
+        :param only_names: set to False to get the project objects, with only the fields in DISCOVERY_PROJECT_FIELDS
+        :return: sorted list of strings "group/project_name" (or of project objects). Projects in users' personal
+                 namespaces are not returned.
+        """
+        try:
+            # there are 3 states of the "archived" flag: true, false, undefined
+            # we use the last 2
+            if include_archived:
+                query1 = "order_by=id&sort=asc"
+            else:
+                query1 = "order_by=id&sort=asc&archived=false"
+
+            if self.admin:
+                # admins get all the projects by default
+                query2 = ""
+            else:
+                # it's pointless to get projects with a lower role than Reporter
+                # - it's the minimal role that is needed to manage something (f.e. labels)
+                query2 = "&min_access_level=20"
+
+            # the project objects are big, so keep only what we need from them
+            projects_in_groups = [
+                self._to_discovery_project(project)
+                for project in self.iter_requests_to_api(f"projects?{query1}{query2}", keyset_pagination=True)
+                if project["namespace"]["kind"] == "group"
+            ]
+        except NotFoundException:
+            projects_in_groups = []
+
+        if only_names:
+            return sorted(map(lambda x: x["path_with_namespace"], projects_in_groups))
+        else:
+            return sorted(projects_in_groups, key=lambda x: x["path_with_namespace"])
+
     def get_groups_from_project(self, project_and_group_name):
         # couldn't find an API call that was giving me directly
         # the shared groups, so I'm using directly the GET /projects/:id call
@@ -1,4 +1,5 @@
 import functools
+import json
 from typing import Union, Any, Optional, Dict, List
 
 import gitlab.const
@@ -8,6 +9,10 @@ from gitlab.v4.objects import Group, Project, User
 
 from logging import info
 
+# GitLab doesn't allow getting more projects by their full paths in a single GraphQL query
+# https://docs.gitlab.com/api/graphql/reference/#queryprojects
+MAX_FULL_PATHS_PER_QUERY = 50
+
 
 # Extends the python-gitlab class to add convenience wrappers for common functionality used within gitlabform
 class PythonGitlab(Gitlab):
@@ -105,6 +110,56 @@ class PythonGitlab(Gitlab):
         user = users[0]
         return self.users.get(user.id)
 
+    def get_projects_by_full_paths(self, full_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Query GraphQL using Python Gitlab
+        https://python-gitlab.readthedocs.io/en/stable/api-usage-graphql.html
+
+        Gets many projects using a few queries instead of a REST API call for each of them. GitLab limits
+        how many full paths can be passed in a single query, so they are split into chunks.
+
+        https://docs.gitlab.com/api/graphql/reference/#queryprojects
+
+        :param full_paths: list of "group/project" paths, the case doesn't matter
+        :return: dict where keys are lowercase full paths of the projects that exist and values are dicts
+                 with the same keys as in the REST API responses: "path_with_namespace", "archived"
+                 and "marked_for_deletion_on". Projects that don't exist (or are not visible) are missing.
+        """
+        projects: Dict[str, Dict[str, Any]] = {}
+
+        for chunk_start in range(0, len(full_paths), MAX_FULL_PATHS_PER_QUERY):
+            chunk = full_paths[chunk_start : chunk_start + MAX_FULL_PATHS_PER_QUERY]
+            query = (
+                """
+            {
+              projects(fullPaths: """
+                + json.dumps(chunk)
+                + """, first: """
+                + str(MAX_FULL_PATHS_PER_QUERY)
+                + """) {
+                nodes {
+                  fullPath
+                  archived
+                  markedForDeletionOn
+                }
+              }
+            }
+            """
+            )
+            info(f"Executing graphQl query to get {len(chunk)} projects by their full paths")
+            result = self.graphql.execute(query)
+
+            if result["projects"] is None or result["projects"]["nodes"] is None:
+                raise GitlabGetError(f"Failed to get Projects by full paths: {query}")
+
+            for node in result["projects"]["nodes"]:
+                projects[node["fullPath"].lower()] = {
+                    "path_with_namespace": node["fullPath"],
+                    "archived": node["archived"],
+                    "marked_for_deletion_on": node["markedForDeletionOn"],
+                }
+
+        return projects
+
     @functools.lru_cache()
     def _get_member_roles_from_group_cached(self, group_full_path: str) -> List[Dict[str, str]]:
         """Query GraphQL using Python Gitlab
@@ -0,0 +1,134 @@
+import threading
+import time
+from logging import debug, info
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class RateLimitController:
+    """
+    Adapts the speed of ALL the requests made to GitLab to its rate limits.
+
+    GitLab returns its rate limit state in the 'RateLimit-Limit', 'RateLimit-Remaining' and 'RateLimit-Reset' headers
+    of its responses, and the 'Retry-After' header when the limit has been exceeded, see:
+    https://docs.gitlab.com/security/rate_limits/#headers
+
+    Based on these headers this class:
+    * spreads the remaining requests evenly until the limit reset, when there are only few of them left,
+    * pauses all the requests until the limit reset, or for the time given in 'Retry-After',
+    * lowers the number of concurrent requests by half after hitting the limit and raises it back one by one
+      after the requests that didn't get near the limit (up to the configured maximum).
+
+    An object of this class is shared by all the requests made using a given session, including the requests made
+    by python-gitlab and from different threads.
+    """
+
+    # spread the requests evenly when less than this part of the limit remains
+    SLOW_DOWN_THRESHOLD = 0.2
+
+    def __init__(self, max_concurrent_requests: int):
+        self.max_concurrent_requests = max_concurrent_requests
+        self.concurrent_requests = float(max_concurrent_requests)
+        self.in_flight = 0
+        # no request can start before this time...
+        self.not_before = 0.0
+        # ...and consecutive requests start at least this many seconds one after another
+        self.interval = 0.0
+        self._condition = threading.Condition()
+
+    def set_max_concurrent_requests(self, max_concurrent_requests: int) -> None:
+        with self._condition:
+            self.max_concurrent_requests = max_concurrent_requests
+            self.concurrent_requests = float(max_concurrent_requests)
+            self._condition.notify_all()
+
+    def before_request(self) -> None:
+        """
+        Blocks until a new request is allowed to start.
+        """
+        with self._condition:
+            while True:
+                now = time.time()
+                if self.in_flight < int(self.concurrent_requests) and now >= self.not_before:
+                    break
+                if now < self.not_before:
+                    self._condition.wait(self.not_before - now)
+                else:
+                    self._condition.wait()
+
+            self.in_flight += 1
+            self.not_before = now + self.interval
+
+    def after_request(self, response: Optional[requests.Response]) -> None:
+        """
+        :param response: response to the request or None if the request failed without one
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if response is not None:
+                self._adapt(response)
+            self._condition.notify_all()
+
+    def _adapt(self, response: requests.Response) -> None:
+        now = time.time()
+
+        limit = self._get_number(response, "RateLimit-Limit")
+        remaining = self._get_number(response, "RateLimit-Remaining")
+        reset = self._get_number(response, "RateLimit-Reset")
+
+        if response.status_code == 429:
+            retry_after = self._get_number(response, "Retry-After")
+            if retry_after is not None:
+                pause_until = now + retry_after
+            elif reset is not None:
+                pause_until = reset
+            else:
+                pause_until = now + 1
+            self.not_before = max(self.not_before, pause_until)
+            self.concurrent_requests = max(1.0, self.concurrent_requests / 2)
+            info(
+                f"Rate limit exceeded, pausing requests for {pause_until - now:.1f}s"
+                f" and lowering concurrent requests to {int(self.concurrent_requests)}."
+            )
+            return
+
+        if limit and remaining is not None and reset is not None and remaining < limit * self.SLOW_DOWN_THRESHOLD:
+            time_to_reset = max(reset - now, 0.0)
+            if remaining <= 0:
+                self.not_before = max(self.not_before, reset)
+                debug(f"Rate limit reached, pausing requests for {time_to_reset:.1f}s.")
+            else:
+                self.interval = time_to_reset / remaining
+                debug(f"Only {remaining} requests remaining, slowing down to 1 request per {self.interval:.2f}s.")
+        else:
+            self.interval = 0.0
+            self.concurrent_requests = min(float(self.max_concurrent_requests), self.concurrent_requests + 1)
+
+    @staticmethod
+    def _get_number(response: requests.Response, header: str) -> Optional[float]:
+        try:
+            return float(response.headers[header])
+        except (KeyError, TypeError, ValueError):
+            # missing or in an unsupported format (f.e. 'Retry-After' can be an HTTP date)
+            return None
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that makes all the requests sent through it obey the given rate limit controller.
+    """
+
+    def __init__(self, rate_limit_controller: RateLimitController, *args, **kwargs):
+        self.rate_limit_controller = rate_limit_controller
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        self.rate_limit_controller.before_request()
+        response = None
+        try:
+            response = super().send(request, *args, **kwargs)
+            return response
+        finally:
+            self.rate_limit_controller.after_request(response)
@@ -16,6 +16,9 @@ class OmissionReason(Enum):
     SCHEDULED_FOR_DELETION = "scheduled for deletion"
     EMPTY = "empty effective config"
     SKIPPED = "skipped"
+    UNCHANGED = "unchanged since last applied"
+    NOT_CHANGED = "effective config not changed"
+    NO_SECTIONS = "no sections to process"
 
 
 class Entities(ABC):
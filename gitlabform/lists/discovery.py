@@ -0,0 +1,99 @@
+import copy
+import functools
+from logging import debug, warning
+from typing import Callable, Dict, List, Optional
+
+from gitlabform.gitlab import GitlabWrapper, PythonGitlab
+from gitlabform.gitlab.core import NotFoundException
+from gitlabform.lists import Groups
+
+
+class Discovery:
+    """
+    Getting the groups and projects to process requires many GitLab API calls, and both the groups
+    and the projects providers need the same groups (and often the same group and project lookups).
+
+    An object of this class lives for a single run and remembers everything that has been discovered,
+    so that the providers sharing it make each of these calls only once.
+    """
+
+    def __init__(self, gitlab):
+        self.gitlab = gitlab
+        self._groups_by_target: Dict[str, Groups] = {}
+        # lowercase path -> group or project object, or None if it doesn't exist
+        self._groups_by_path: Dict[str, Optional[dict]] = {}
+        self._projects_by_path: Dict[str, Optional[dict]] = {}
+        self._projects_in_group: Dict[str, list] = {}
+
+    def get_groups(self, target: str, discover_groups: Callable[[str], Groups]) -> Groups:
+        """
+        :param target: "project/group", "group", "group/subgroup", ALL or ALL_DEFINED
+        :param discover_groups: function that gets the groups for the target, called only once per target
+        :return: a copy of the groups for the target, so that omitting some of them later doesn't change
+                 what the other users of this object get
+        """
+        if target not in self._groups_by_target:
+            self._groups_by_target[target] = discover_groups(target)
+        return copy.deepcopy(self._groups_by_target[target])
+
+    def get_group_case_insensitive(self, path: str) -> dict:
+        key = path.lower()
+        if key not in self._groups_by_path:
+            try:
+                self._groups_by_path[key] = self.gitlab.get_group_case_insensitive(path)
+            except NotFoundException:
+                self._groups_by_path[key] = None
+
+        group = self._groups_by_path[key]
+        if group is None:
+            raise NotFoundException(f"Group/subgroup with path '{path}' not found.")
+        return group
+
+    def get_project_case_insensitive(self, path: str) -> dict:
+        key = path.lower()
+        if key not in self._projects_by_path:
+            try:
+                self._projects_by_path[key] = self.gitlab.get_project_case_insensitive(path)
+            except NotFoundException:
+                self._projects_by_path[key] = None
+
+        project = self._projects_by_path[key]
+        if project is None:
+            raise NotFoundException(f"Project with path '{path}' not found.")
+        return project
+
+    @functools.cached_property
+    def gl(self) -> PythonGitlab:
+        return GitlabWrapper(self.gitlab).get_gitlab()
+
+    def prefetch_projects(self, paths: List[str]) -> Optional[List[str]]:
+        """
+        Looks up many projects at once, so that the following get_project_case_insensitive() calls for them
+        don't need to call GitLab anymore.
+
+        :param paths: list of "group/project" paths
+        :return: list of the paths of the projects that don't exist or None if we couldn't check that
+                 (then the projects will be looked up one by one)
+        """
+        paths_to_get = list(dict.fromkeys(path for path in paths if path.lower() not in self._projects_by_path))
+        if paths_to_get:
+            try:
+                projects = self.gl.get_projects_by_full_paths(paths_to_get)
+            except Exception as e:
+                warning(f"Getting projects in batches failed, falling back to getting them one by one: {e}")
+                return None
+
+            for path in paths_to_get:
+                self._projects_by_path[path.lower()] = projects.get(path.lower())
+            debug(f"Got {len(projects)} out of {len(paths_to_get)} requested projects in batches.")
+
+        return [path for path in paths if self._projects_by_path[path.lower()] is None]
+
+    def get_projects_in_group(self, group: str) -> list:
+        """
+        :param group: group path, as it is in GitLab
+        :return: sorted list of the whole project objects from this group and its subgroups, including archived
+        """
+        if group not in self._projects_in_group:
+            self._projects_in_group[group] = self.gitlab.get_projects(group, include_archived=True, only_names=False)
+        return self._projects_in_group[group]
@@ -2,9 +2,14 @@ import sys
 from abc import ABC, abstractmethod
 
 from logging import critical
+from typing import List, Optional
 
+from gitlabform.configuration.diff import ConfigurationDiff
+from gitlabform.configuration.sections import SectionsIndex
+from gitlabform.configuration.store import EffectiveConfigsStore
 from gitlabform.constants import EXIT_INVALID_INPUT
 from gitlabform.lists import OmissionReason, Groups, Projects
+from gitlabform.state import StateLedger
 
 # Groups and projects filters jobs is to omit some groups and projects that GitLabForm is requested
 # to process for a speed-up.
@@ -13,14 +18,65 @@ from gitlabform.lists import OmissionReason, Groups, Projects
 
 
 class GroupsAndProjectsFilters:
-    def __init__(self, configuration, group_processors, project_processors):
+    def __init__(
+        self,
+        configuration,
+        group_processors,
+        project_processors,
+        effective_project_configs: Optional[EffectiveConfigsStore] = None,
+        state_ledger: Optional[StateLedger] = None,
+        only_sections: List[str] | str = "all",
+        exclude_sections: Optional[List[str]] = None,
+        config_diff: Optional[ConfigurationDiff] = None,
+        sections_index: Optional[SectionsIndex] = None,
+    ):
+        """
+        :param state_ledger: if set, the groups and projects with configs unchanged since they were last applied
+                             are omitted
+        :param config_diff: if set, the groups and projects which effective configs are the same in the old config
+                            are omitted
+        :param sections_index: if set, the groups and projects that cannot have any of the sections to process
+                               are omitted
+        """
         self.configuration = configuration
 
-        self.omit_empty_configs = OmitEmptyConfigs(configuration, group_processors, project_processors)
+        if sections_index:
+            self.omit_configs_without_sections: Optional[OmitConfigsWithoutSections] = OmitConfigsWithoutSections(
+                sections_index
+            )
+        else:
+            self.omit_configs_without_sections = None
+
+        if config_diff:
+            self.omit_not_changed_configs: Optional[OmitNotChangedConfigs] = OmitNotChangedConfigs(config_diff)
+        else:
+            self.omit_not_changed_configs = None
+        self.omit_empty_configs = OmitEmptyConfigs(
+            configuration, group_processors, project_processors, effective_project_configs
+        )
+        if state_ledger:
+            self.omit_unchanged_configs: Optional[OmitUnchangedConfigs] = OmitUnchangedConfigs(
+                configuration,
+                group_processors,
+                project_processors,
+                state_ledger,
+                only_sections,
+                exclude_sections or [],
+                effective_project_configs,
+            )
+        else:
+            self.omit_unchanged_configs = None
         # add next filters here
 
     def filter(self, groups: Groups, projects: Projects):
+        # first, so that the effective configs of the omitted projects are not computed and stored for processing
+        if self.omit_configs_without_sections:
+            self.omit_configs_without_sections.filter(groups, projects)
+        if self.omit_not_changed_configs:
+            self.omit_not_changed_configs.filter(groups, projects)
         self.omit_empty_configs.filter(groups, projects)
+        if self.omit_unchanged_configs:
+            self.omit_unchanged_configs.filter(groups, projects)
         # add next filters here
 
 
@@ -47,10 +103,20 @@ class OmitEmptyConfigs(GroupsAndProjectsFilter):
     is empty, as "group_variables" is a group-level configuration and "foo/bar" is a project.
     """
 
-    def __init__(self, configuration, group_processors, project_processors):
+    def __init__(
+        self,
+        configuration,
+        group_processors,
+        project_processors,
+        effective_project_configs: Optional[EffectiveConfigsStore] = None,
+    ):
+        """
+        :param effective_project_configs: store to keep the effective configs of the projects in, for processing
+        """
         self.configuration = configuration
         self.group_processors = group_processors
         self.project_processors = project_processors
+        self.effective_project_configs = effective_project_configs
 
         if not self.configuration.get("projects_and_groups", {}):
             critical("Configuration has to contain non-empty 'projects_and_groups' key.")
@@ -92,8 +158,111 @@ class OmitEmptyConfigs(GroupsAndProjectsFilter):
         :return: if given project has no config that can be processed
                  by any project-level processors
         """
-        config_for_project = self.configuration.get_effective_config_for_project(project)
+        if self.effective_project_configs:
+            config_for_project = self.effective_project_configs.get(project)
+        else:
+            config_for_project = self.configuration.get_effective_config_for_project(project)
         for configuration_name in config_for_project.keys():
             if configuration_name in self.project_processors.get_configuration_names():
                 return False
         return True
+
+
+class OmitUnchangedConfigs(GroupsAndProjectsFilter):
+    """
+    In the "changed only" mode groups and projects are omitted if their effective config is the same as when it was
+    last successfully applied to them, according to the state ledger.
+    """
+
+    def __init__(
+        self,
+        configuration,
+        group_processors,
+        project_processors,
+        state_ledger: StateLedger,
+        only_sections: List[str] | str,
+        exclude_sections: List[str],
+        effective_project_configs: Optional[EffectiveConfigsStore] = None,
+    ):
+        self.configuration = configuration
+        self.group_processors = group_processors
+        self.project_processors = project_processors
+        self.state_ledger = state_ledger
+        self.only_sections = only_sections
+        self.exclude_sections = exclude_sections
+        self.effective_project_configs = effective_project_configs
+
+    def filter(self, groups: Groups, projects: Projects) -> None:
+        unchanged_groups = []
+        for group in groups.get_effective():
+            config_for_group = self.configuration.get_effective_config_for_group(group)
+            if self._is_unchanged("group", group, config_for_group, self.group_processors):
+                unchanged_groups.append(group)
+        groups.add_omitted(OmissionReason.UNCHANGED, unchanged_groups)
+
+        unchanged_projects = []
+        for project in projects.get_effective():
+            if self.effective_project_configs:
+                config_for_project = self.effective_project_configs.get(project)
+            else:
+                config_for_project = self.configuration.get_effective_config_for_project(project)
+            if self._is_unchanged("project", project, config_for_project, self.project_processors):
+                unchanged_projects.append(project)
+        projects.add_omitted(OmissionReason.UNCHANGED, unchanged_projects)
+
+        if self.effective_project_configs:
+            # the omitted projects won't be processed, so their configs don't have to be kept for that
+            for project in unchanged_projects:
+                self.effective_project_configs.pop(project)
+
+    def _is_unchanged(self, entity_type: str, entity: str, config: dict, processors) -> bool:
+        return self.state_ledger.is_unchanged(
+            entity_type,
+            entity,
+            self.state_ledger.get_config_hash(self.configuration, config),
+            processors.get_sections_to_process(config, self.only_sections, self.exclude_sections),
+        )
+
+
+class OmitConfigsWithoutSections(GroupsAndProjectsFilter):
+    """
+    When only some sections are processed (see --only-sections), groups and projects are omitted if their effective
+    configs cannot contain any of these sections, according to the sections index - so without computing them.
+    """
+
+    def __init__(self, sections_index: SectionsIndex):
+        self.sections_index = sections_index
+
+    def filter(self, groups: Groups, projects: Projects) -> None:
+        groups.add_omitted(
+            OmissionReason.NO_SECTIONS,
+            [group for group in groups.get_effective() if not self.sections_index.group_may_have_sections(group)],
+        )
+        projects.add_omitted(
+            OmissionReason.NO_SECTIONS,
+            [
+                project
+                for project in projects.get_effective()
+                if not self.sections_index.project_may_have_sections(project)
+            ],
+        )
+
+
+class OmitNotChangedConfigs(GroupsAndProjectsFilter):
+    """
+    In the "changed since" mode groups and projects are omitted if their effective config is the same as in the old
+    version of the config, see ConfigurationDiff.
+    """
+
+    def __init__(self, config_diff: ConfigurationDiff):
+        self.config_diff = config_diff
+
+    def filter(self, groups: Groups, projects: Projects) -> None:
+        groups.add_omitted(
+            OmissionReason.NOT_CHANGED,
+            [group for group in groups.get_effective() if not self.config_diff.is_group_changed(group)],
+        )
+        projects.add_omitted(
+            OmissionReason.NOT_CHANGED,
+            [project for project in projects.get_effective() if not self.config_diff.is_project_changed(project)],
+        )
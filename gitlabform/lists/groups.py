@@ -1,8 +1,11 @@
 import sys
 from logging import critical
+from typing import Optional
+
 from gitlabform.constants import EXIT_INVALID_INPUT
 from gitlabform.gitlab.core import NotFoundException
 from gitlabform.lists import OmissionReason, Groups
+from gitlabform.lists.discovery import Discovery
 
 
 class GroupsProvider:
@@ -12,17 +15,21 @@ class GroupsProvider:
     and the fact that the group and project names case are somewhat case-sensitive.
     """
 
-    def __init__(self, gitlab, configuration, recurse_subgroups):
+    def __init__(self, gitlab, configuration, recurse_subgroups, discovery: Optional[Discovery] = None):
         self.gitlab = gitlab
         self.configuration = configuration
         self.recurse_subgroups = recurse_subgroups
+        # share the same discovery between providers to get the groups and projects only once per run
+        self.discovery = discovery if discovery else Discovery(gitlab)
 
     def get_groups(self, target: str) -> Groups:
         """
         :param target: "project/group", "group", "group/subgroup", ALL or ALL_DEFINED
         :return: Groups
         """
+        return self.discovery.get_groups(target, self._discover_groups)
 
+    def _discover_groups(self, target: str) -> Groups:
         if target not in ["ALL", "ALL_DEFINED"]:
             groups = self._get_single_group(target, self.recurse_subgroups)
         else:
@@ -35,7 +42,7 @@ class GroupsProvider:
 
         # it may be a subgroup or a group...
         try:
-            maybe_group = self.gitlab.get_group_case_insensitive(target)
+            maybe_group = self.discovery.get_group_case_insensitive(target)
             path = maybe_group["full_path"]
             groups.add_requested([path])
 
@@ -73,7 +80,7 @@ class GroupsProvider:
     def _verify_if_groups_exist(self, groups: list):
         for group in groups:
             try:
-                self.gitlab.get_group_case_insensitive(group)
+                self.discovery.get_group_case_insensitive(group)
             except NotFoundException:
                 critical(f"Configuration contains group {group} but it cannot be found in GitLab!")
                 sys.exit(EXIT_INVALID_INPUT)
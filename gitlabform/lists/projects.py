@@ -1,10 +1,12 @@
 import sys
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from logging import debug
 from logging import critical
 
+from gitlabform.configuration.sections import SectionsIndex
 from gitlabform.constants import EXIT_INVALID_INPUT
 from gitlabform.lists import OmissionReason, Groups, Projects
+from gitlabform.lists.discovery import Discovery
 from gitlabform.lists.groups import GroupsProvider
 
 from gitlabform.gitlab.core import NotFoundException
@@ -26,10 +28,17 @@ class ProjectsProvider(GroupsProvider):
         include_archived_projects,
         include_projects_scheduled_for_deletion,
         recurse_subgroups,
+        discovery: Optional[Discovery] = None,
+        sections_index: Optional[SectionsIndex] = None,
     ):
-        super().__init__(gitlab, configuration, recurse_subgroups)
+        """
+        :param sections_index: if set, the projects that cannot have any of the sections to process are not got
+                               from GitLab, where possible
+        """
+        super().__init__(gitlab, configuration, recurse_subgroups, discovery)
         self.include_archived_projects = include_archived_projects
         self.include_projects_scheduled_for_deletion = include_projects_scheduled_for_deletion
+        self.sections_index = sections_index
 
     def get_projects(self, target: str) -> Projects:
         """
@@ -54,7 +63,7 @@ class ProjectsProvider(GroupsProvider):
 
         # it may be a single project
         try:
-            maybe_project = self.gitlab.get_project_case_insensitive(target)
+            maybe_project = self.discovery.get_project_case_insensitive(target)
             projects.add_requested([maybe_project["path_with_namespace"]])
 
         except NotFoundException:
@@ -74,17 +83,37 @@ class ProjectsProvider(GroupsProvider):
     def _get_projects(self, target: str, groups: Groups) -> Projects:
         projects = Projects()
 
-        # the source of projects are the *effective* requested groups
-        (
-            projects_from_groups,
-            archived_projects_from_groups,
-            scheduled_for_deletion_projects_from_groups,
-        ) = self._get_all_and_omitted_projects_from_groups(groups.get_effective())
+        if target == "ALL":
+            # all the projects in all the groups can be got with a single listing
+            (
+                projects_from_groups,
+                archived_projects_from_groups,
+                scheduled_for_deletion_projects_from_groups,
+            ) = self._get_all_and_omitted_projects_from_all_groups(groups.get_effective())
+        else:
+            # the source of projects are the *effective* requested groups
+            groups_with_projects = self._get_groups_with_projects_to_process(groups.get_effective())
+            (
+                projects_from_groups,
+                archived_projects_from_groups,
+                scheduled_for_deletion_projects_from_groups,
+            ) = self._get_all_and_omitted_projects_from_groups(groups_with_projects)
         projects.add_requested(projects_from_groups)
         projects.add_omitted(OmissionReason.ARCHIVED, archived_projects_from_groups)
         projects.add_omitted(OmissionReason.SCHEDULED_FOR_DELETION, scheduled_for_deletion_projects_from_groups)
 
         projects_from_configuration = self.configuration.get_projects()
+        if self.sections_index:
+            projects_without_sections = [
+                project
+                for project in projects_from_configuration
+                if not self.sections_index.project_may_have_sections(project)
+            ]
+            projects_from_configuration = [
+                project for project in projects_from_configuration if project not in projects_without_sections
+            ]
+        else:
+            projects_without_sections = []
 
         # TODO: this check should be case-insensitive
         projects_from_configuration_not_from_groups = [
@@ -96,7 +125,7 @@ class ProjectsProvider(GroupsProvider):
             # defined in the configuration, but we don't need to re-check for
             # being archived or scheduled for deletion projects that we already got from groups
 
-            for resolved_project in self._resolve_project_patterns(groups.get_effective()):
+            for resolved_project in self._resolve_project_patterns(groups_with_projects):
                 if (
                     resolved_project not in projects.requested
                     and resolved_project not in projects_from_configuration_not_from_groups
@@ -117,6 +146,7 @@ class ProjectsProvider(GroupsProvider):
                 OmissionReason.SCHEDULED_FOR_DELETION,
                 scheduled_for_deletion_projects_from_configuration_not_from_groups,
             )
+
         else:
             # in all other cases, we also need to look for projects in the config
             # that are being transferred to a different namespace
@@ -134,17 +164,48 @@ class ProjectsProvider(GroupsProvider):
                     ) != 0:
                         projects.add_requested([project])
 
+            # only the ones in the requested groups, as the ones listed from them would be
+            groups_lowercase = {group.lower() for group in groups.get_effective()}
+            projects_without_sections = [
+                project for project in projects_without_sections if self._has_ancestor_in(project, groups_lowercase)
+            ]
+
+        # reported as omitted for any target, there is no need to check if these exist
+        projects.add_requested(projects_without_sections)
+        projects.add_omitted(OmissionReason.NO_SECTIONS, projects_without_sections)
+
         # TODO: consider checking for skipped earlier to avoid making requests for projects that will be skipped anyway
         projects.add_omitted(OmissionReason.SKIPPED, self._get_skipped_projects(projects.get_effective()))
 
         return projects
 
+    def _get_groups_with_projects_to_process(self, groups: list) -> list:
+        """
+        :return: the groups from the list in which (or in which subgroups) there can be projects with any
+                 of the sections to process
+        """
+        if not self.sections_index:
+            return groups
+        return [group for group in groups if self.sections_index.projects_in_group_may_have_sections(group)]
+
     def _verify_if_projects_exist_and_get_omitted_projects(self, projects: list) -> Tuple[list, list]:
         archived = []
         scheduled_for_deletion = []
+
+        # get the projects in batches first, and then the transfer sources of the ones that don't exist,
+        # so that the checks below don't need to get each of them separately
+        missing_projects = self.discovery.prefetch_projects(projects)
+        if missing_projects:
+            transfer_sources = [
+                project_transfer_source
+                for project in missing_projects
+                if (project_transfer_source := self._get_project_transfer_source_from_config(project))
+            ]
+            self.discovery.prefetch_projects(transfer_sources)
+
         for project in projects:
             try:
-                project_object = self.gitlab.get_project_case_insensitive(project)
+                project_object = self.discovery.get_project_case_insensitive(project)
                 if not self.include_archived_projects and project_object["archived"]:
                     archived.append(project_object["path_with_namespace"])
                 if not self.include_projects_scheduled_for_deletion and project_object.get("marked_for_deletion_on"):
@@ -174,29 +235,84 @@ class ProjectsProvider(GroupsProvider):
 
         return archived, scheduled_for_deletion
 
+    def _get_all_and_omitted_projects_from_all_groups(self, groups: list) -> Tuple[list, list, list]:
+        """
+        :param groups: the effective groups - only the projects in them (or in their subgroups) are returned,
+                       so f.e. the projects in the skipped groups are not
+        """
+        groups_lowercase = {group.lower() for group in groups}
+
+        if self.include_archived_projects and self.include_projects_scheduled_for_deletion:
+            project_names = self.gitlab.get_all_projects_in_groups(include_archived=True)
+            return [project for project in project_names if self._has_ancestor_in(project, groups_lowercase)], [], []
+
+        all: List[str] = []
+        archived: List[str] = []
+        scheduled_for_deletion: List[str] = []
+        project_objects = [
+            project_object
+            for project_object in self.gitlab.get_all_projects_in_groups(include_archived=True, only_names=False)
+            if self._has_ancestor_in(project_object["path_with_namespace"], groups_lowercase)
+        ]
+        self._add_all_and_omitted_projects(project_objects, all, archived, scheduled_for_deletion)
+
+        return all, archived, scheduled_for_deletion
+
     def _get_all_and_omitted_projects_from_groups(self, groups: list) -> Tuple[list, list, list]:
-        all = []
-        archived = []
-        scheduled_for_deletion = []
-        for group in groups:
+        all: List[str] = []
+        archived: List[str] = []
+        scheduled_for_deletion: List[str] = []
+        # projects are listed with their subgroups' projects, so there is no need to list them again
+        # for the subgroups of the groups that we already list
+        for group in self._get_topmost_groups(groups):
             if self.include_archived_projects and self.include_projects_scheduled_for_deletion:
                 all += self.gitlab.get_projects(group, include_archived=True)
             else:
                 project_objects = self.gitlab.get_projects(group, include_archived=True, only_names=False)
-                for project_object in project_objects:
-                    project = project_object["path_with_namespace"]
-                    all.append(project)
-                    if not self.include_archived_projects and project_object["archived"]:
-                        archived.append(project)
-                    if not self.include_projects_scheduled_for_deletion and project_object.get(
-                        "marked_for_deletion_on"
-                    ):
-                        scheduled_for_deletion.append(project)
-
-        # deduplicate as we may have a group X and its subgroup X/Y in the groups list so the effective projects
-        # may occur more than once
+                self._add_all_and_omitted_projects(project_objects, all, archived, scheduled_for_deletion)
+
+        # deduplicate just in case - the same project should not be returned for two different topmost groups
         return list(set(all)), list(set(archived)), list(set(scheduled_for_deletion))
 
+    @staticmethod
+    def _get_topmost_groups(groups: list) -> list:
+        """
+        :param groups: list of groups and subgroups
+        :return: the groups from the list that don't have any of their ancestors in the list, ignoring the case
+        """
+        groups_lowercase = {group.lower() for group in groups}
+
+        topmost_groups = []
+        for group in groups:
+            if not ProjectsProvider._has_ancestor_in(group, groups_lowercase):
+                topmost_groups.append(group)
+
+        return topmost_groups
+
+    @staticmethod
+    def _has_ancestor_in(group_or_project: str, groups_lowercase: set) -> bool:
+        """
+        :param group_or_project: "group/subgroup" or "group/subgroup/project"
+        :param groups_lowercase: set of lowercase group paths
+        :return: if any ancestor of the given group or project is in the given set
+        """
+        elements = group_or_project.lower().split("/")
+        for depth in range(1, len(elements)):
+            if "/".join(elements[:depth]) in groups_lowercase:
+                return True
+        return False
+
+    def _add_all_and_omitted_projects(
+        self, project_objects: list, all: list, archived: list, scheduled_for_deletion: list
+    ) -> None:
+        for project_object in project_objects:
+            project = project_object["path_with_namespace"]
+            all.append(project)
+            if not self.include_archived_projects and project_object["archived"]:
+                archived.append(project)
+            if not self.include_projects_scheduled_for_deletion and project_object.get("marked_for_deletion_on"):
+                scheduled_for_deletion.append(project)
+
     def _get_skipped_projects(self, projects: list) -> list:
         skipped = []
         for project in projects:
@@ -205,21 +321,24 @@ class ProjectsProvider(GroupsProvider):
 
         return skipped
 
-    def _resolve_project_patterns(self, effective_groups: list) -> list:
+    def _resolve_project_patterns(self, listed_groups: list) -> list:
         """
         Resolve project patterns from config to concrete project paths.
-        Only resolves patterns whose parent group is not already in the effective groups list
-        to avoid redundant API calls.
+        Only resolves patterns whose parent group, or any of its ancestors, is not already in the list of groups
+        which projects have been listed to avoid redundant API calls.
         """
         pattern_projects = []
+        listed_groups_lowercase = {group.lower() for group in listed_groups}
         for pattern in self.configuration.get_projects("project_pattern"):
             pattern_group = pattern.rsplit("/", 1)[0]
-            if pattern_group in effective_groups:
+            if self._has_ancestor_in(pattern, listed_groups_lowercase):
                 # projects from this group already fetched through normal means
                 continue
+            if self.sections_index and not self.sections_index.project_may_have_sections(pattern):
+                continue
 
             try:
-                maybe_group = self.gitlab.get_group_case_insensitive(pattern_group)
+                maybe_group = self.discovery.get_group_case_insensitive(pattern_group)
                 group_path = maybe_group["full_path"]
             except NotFoundException:
                 debug(
@@ -230,7 +349,7 @@ class ProjectsProvider(GroupsProvider):
                 continue
 
             try:
-                all_project_objects = self.gitlab.get_projects(group_path, include_archived=True, only_names=False)
+                all_project_objects = self.discovery.get_projects_in_group(group_path)
             except NotFoundException:
                 all_project_objects = []
 
@@ -267,7 +386,7 @@ class ProjectsProvider(GroupsProvider):
                 "Checking if project transfer source ('%s') exists in GitLab",
                 project_transfer_source,
             )
-            maybe_project = self.gitlab.get_project_case_insensitive(project_transfer_source)
+            maybe_project = self.discovery.get_project_case_insensitive(project_transfer_source)
             debug(
                 "Project transfer source ('%s') exists",
                 project_transfer_source,
@@ -29,6 +29,10 @@ class EffectiveConfigurationFile:
         if self.output_file:
             self.config[project_or_group] = {}
 
+    def remove_placeholder(self, project_or_group: str):
+        if self.output_file:
+            self.config.pop(project_or_group, None)
+
     def add_configuration(self, project_or_group: str, configuration_name: str, configuration: dict):
         if self.output_file:
             info(f"Adding effective configuration for {configuration_name}.")
@@ -1,13 +1,15 @@
 from abc import ABC
+from contextlib import nullcontext
 
 from logging import info
 
-from typing import List
+from typing import List, Optional
 
 from gitlabform.configuration import Configuration
 from gitlabform.gitlab import GitLab
 from gitlabform.output import EffectiveConfigurationFile
 from gitlabform.processors.abstract_processor import AbstractProcessor
+from gitlabform.profile import ProcessingProfile
 
 
 class AbstractProcessors(ABC):
@@ -17,6 +19,20 @@ class AbstractProcessors(ABC):
     def get_configuration_names(self):
         return [processor.configuration_name for processor in self.processors]
 
+    def get_sections_to_process(
+        self, configuration: dict, only_sections: List[str] | str, exclude_sections: List[str]
+    ) -> List[str]:
+        """
+        :return: names of the sections of the configuration that would be processed with the given section filters
+        """
+        return [
+            processor.configuration_name
+            for processor in self.processors
+            if processor.configuration_name in configuration
+            and processor.configuration_name not in exclude_sections
+            and (only_sections == "all" or processor.configuration_name in only_sections)
+        ]
+
     def process_entity(
         self,
         entity_reference: str,
@@ -26,17 +42,25 @@ class AbstractProcessors(ABC):
         effective_configuration: EffectiveConfigurationFile,
         only_sections: List[str] | str,
         exclude_sections: List[str],
+        profile: Optional[ProcessingProfile] = None,
     ):
         for processor in self.processors:
             if processor.configuration_name not in exclude_sections:
                 if only_sections == "all" or processor.configuration_name in only_sections:
-                    processor.process(
-                        entity_reference,
-                        configuration,
-                        dry_run,
-                        diff_only_changed,
-                        effective_configuration,
-                    )
+                    # application settings are processed with an empty entity reference,
+                    # the sections not in the config are skipped by the processors so are not worth measuring
+                    with (
+                        profile.measure(entity_reference or "application", processor.configuration_name)
+                        if profile and processor.configuration_name in configuration
+                        else nullcontext()
+                    ):
+                        processor.process(
+                            entity_reference,
+                            configuration,
+                            dry_run,
+                            diff_only_changed,
+                            effective_configuration,
+                        )
                 else:
                     info(f"Skipping section '{processor.configuration_name}' - not in --only-sections list.")
             else:
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from functools import wraps
 
 
@@ -34,11 +35,16 @@ class SafeDict(dict):
 
 def configuration_to_safe_dict(method):
     """
-    This wrapper function calls the method with the configuration converted from a regular dict into a SafeDict
+    This wrapper function calls the method with the configuration converted from a regular dict into a SafeDict,
+    with a copy of the processor's own section, which it may modify. (The effective configs share their sections
+    with each other, see ConfigurationCore._merge_configs().)
     """
 
     @wraps(method)
     def method_wrapper(self, project_and_group, configuration, *args):
-        return method(self, project_and_group, SafeDict(configuration), *args)
+        safe_configuration = SafeDict(configuration)
+        if self.configuration_name in safe_configuration:
+            safe_configuration[self.configuration_name] = deepcopy(safe_configuration[self.configuration_name])
+        return method(self, project_and_group, safe_configuration, *args)
 
     return method_wrapper
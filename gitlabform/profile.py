@@ -0,0 +1,105 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from logging import critical, debug, info
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from gitlabform.constants import EXIT_INVALID_INPUT, EXIT_PROCESSING_ERROR
+from gitlabform.gitlab.metrics import RequestMetrics
+
+
+class ProcessingProfile:
+    """
+    To find out what takes the most time in long runs, this class measures the wall-clock time and the number
+    of API calls of processing each section of each entity (application, group or project).
+
+    The totals per entity and per section are kept to show the slowest ones at the end of the run.
+    The measurements of each (entity, section) pair can also be written to a JSONL file as soon as they are made.
+    """
+
+    def __init__(self, profile_output: Optional[str], request_metrics: Optional[RequestMetrics]):
+        self.profile_output: Optional[TextIO]
+        if profile_output:
+            try:
+                self.profile_output = open(profile_output, "w")
+                debug(f"Opened file {profile_output} to write the processing profile to.")
+            except Exception as e:
+                critical(f"Error when trying to open {profile_output} to write the processing profile to: {e}")
+                sys.exit(EXIT_INVALID_INPUT)
+        else:
+            self.profile_output = None
+
+        self.request_metrics = request_metrics
+        # entity -> [seconds, API calls]
+        self.entities: Dict[str, List[float]] = {}
+        # section -> [seconds, API calls, number of entities]
+        self.sections: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, entity: str, section: str) -> Iterator[None]:
+        calls_before = self._get_calls()
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.add(entity, section, time.perf_counter() - start, self._get_calls() - calls_before, failed)
+
+    def add(self, entity: str, section: str, seconds: float, api_calls: int, failed: bool = False) -> None:
+        with self._lock:
+            entity_totals = self.entities.setdefault(entity, [0.0, 0])
+            entity_totals[0] += seconds
+            entity_totals[1] += api_calls
+
+            section_totals = self.sections.setdefault(section, [0.0, 0, 0])
+            section_totals[0] += seconds
+            section_totals[1] += api_calls
+            section_totals[2] += 1
+
+            if self.profile_output:
+                record = {
+                    "entity": entity,
+                    "section": section,
+                    "seconds": round(seconds, 6),
+                    "api_calls": api_calls,
+                    "failed": failed,
+                }
+                self.profile_output.write(json.dumps(record) + "\n")
+
+    def get_slowest_entities(self, n: int) -> List[Tuple[str, List[float]]]:
+        with self._lock:
+            return sorted(self.entities.items(), key=lambda item: item[1][0], reverse=True)[:n]
+
+    def get_slowest_sections(self, n: int) -> List[Tuple[str, List[float]]]:
+        with self._lock:
+            return sorted(self.sections.items(), key=lambda item: item[1][0], reverse=True)[:n]
+
+    def show_report(self, n: int) -> None:
+        slowest_sections = self.get_slowest_sections(n)
+        if slowest_sections:
+            info(f"Top {len(slowest_sections)} sections by processing time:")
+            for section, (seconds, api_calls, entities) in slowest_sections:
+                info(f"{section}: {seconds:.2f}s, {api_calls} API calls in {entities} groups/projects")
+
+        slowest_entities = self.get_slowest_entities(n)
+        if slowest_entities:
+            info(f"Top {len(slowest_entities)} groups/projects by processing time:")
+            for entity, (seconds, api_calls) in slowest_entities:
+                info(f"{entity}: {seconds:.2f}s, {api_calls} API calls")
+
+    def write_to_file(self) -> None:
+        if self.profile_output:
+            try:
+                self.profile_output.close()
+            except Exception as e:
+                critical(f"Error when trying to close {self.profile_output}: {e}")
+                sys.exit(EXIT_PROCESSING_ERROR)
+
+    def _get_calls(self) -> int:
+        if self.request_metrics:
+            return self.request_metrics.get_calls_in_current_thread()
+        return 0
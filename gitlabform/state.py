@@ -0,0 +1,145 @@
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from importlib.metadata import version as package_version
+from logging import critical, debug
+from typing import Any, Dict, List, Optional, Tuple
+
+from gitlabform.configuration.cache import get_file_hash, get_input_files
+from gitlabform.constants import EXIT_INVALID_INPUT
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_duration(duration: str) -> int:
+    """
+    :param duration: number of seconds, optionally with a unit suffix: s, m, h or d - f.e. "3600", "12h" or "7d"
+    :return: number of seconds
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*([smhd]?)\s*", duration)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration: '{duration}', use f.e. 3600, 90m, 12h or 7d")
+    return int(match.group(1)) * DURATION_UNITS[match.group(2) or "s"]
+
+
+class StateLedger:
+    """
+    Remembers between the runs which effective config has been successfully applied to each group and project,
+    and when, in a SQLite database file.
+
+    In the "changed only" mode this is used to skip the entities which effective config hasn't changed since it
+    has been applied the last time - with the same or a superset of the sections being processed now, and with
+    the same app version. With a max age, the entities are not skipped if that was too long ago, so that the
+    changes made in GitLab outside GitLabForm are periodically reverted.
+
+    The applied configs are identified by the hashes of the effective configs together with the contents of the files
+    referenced in them with "file:", see get_config_hash().
+    """
+
+    def __init__(self, state_file: str, max_age: Optional[int] = None):
+        """
+        :param state_file: path of the SQLite database file, created if it doesn't exist
+        :param max_age: max number of seconds since the last apply for an entity to be considered unchanged
+        """
+        self.max_age = max_age
+        self.gitlabform_version = package_version("gitlabform")
+        try:
+            # used by the threads processing the projects in parallel, always under the lock
+            self.connection = sqlite3.connect(state_file, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS entity_states (
+                    entity_type TEXT NOT NULL,
+                    entity TEXT NOT NULL,
+                    config_hash TEXT NOT NULL,
+                    sections TEXT NOT NULL,
+                    gitlabform_version TEXT NOT NULL,
+                    applied_at REAL NOT NULL,
+                    PRIMARY KEY (entity_type, entity)
+                )
+                """)
+            self.connection.commit()
+            # (entity type, entity) -> (config hash, sections, app version, applied at)
+            self.states: Dict[Tuple[str, str], Tuple[str, List[str], str, float]] = {
+                (entity_type, entity): (config_hash, json.loads(sections), gitlabform_version, applied_at)
+                for entity_type, entity, config_hash, sections, gitlabform_version, applied_at in self.connection.execute(
+                    "SELECT entity_type, entity, config_hash, sections, gitlabform_version, applied_at"
+                    " FROM entity_states"
+                )
+            }
+        except sqlite3.Error as e:
+            critical(f"Error when trying to use {state_file} as the state file: {e}")
+            sys.exit(EXIT_INVALID_INPUT)
+        debug(f"Read the states of {len(self.states)} groups/projects from {state_file}.")
+        self._lock = threading.Lock()
+        # path -> hash of its contents, for the files referenced with "file:", read once per run
+        self._input_files_hashes: Dict[str, Optional[str]] = {}
+
+    def get_config_hash(self, configuration: Any, config: dict) -> str:
+        """
+        :param configuration: the Configuration that the effective config comes from
+        :param config: effective config of a group or project
+        :return: hash of the effective config and the contents of the files referenced in it with "file:"
+        """
+        config_id = configuration.get_effective_config_id(config)
+        input_files = get_input_files(configuration.config_dir, config)
+        if not input_files:
+            return config_id
+
+        sha256 = hashlib.sha256(config_id.encode())
+        for input_file in input_files:
+            with self._lock:
+                if input_file not in self._input_files_hashes:
+                    self._input_files_hashes[input_file] = get_file_hash(input_file)
+                input_file_hash = self._input_files_hashes[input_file]
+            sha256.update(b"\0")
+            sha256.update(input_file.encode())
+            sha256.update(b"\0")
+            sha256.update((input_file_hash or "").encode())
+        return sha256.hexdigest()[:16]
+
+    def is_unchanged(self, entity_type: str, entity: str, config_hash: str, sections: List[str]) -> bool:
+        """
+        :param entity_type: "group" or "project"
+        :param config_hash: hash of the effective config of the entity
+        :param sections: sections of the config that would be processed now
+        :return: if the config has been already applied to the entity, so it can be skipped
+        """
+        with self._lock:
+            state = self.states.get((entity_type, entity))
+        if state is None:
+            return False
+
+        applied_config_hash, applied_sections, applied_gitlabform_version, applied_at = state
+        if self.max_age is not None and time.time() - applied_at >= self.max_age:
+            return False
+        return (
+            applied_config_hash == config_hash
+            and applied_gitlabform_version == self.gitlabform_version
+            and set(sections) <= set(applied_sections)
+        )
+
+    def record_applied(self, entity_type: str, entity: str, config_hash: str, sections: List[str]) -> None:
+        """
+        Records that the config has been successfully applied to the entity.
+        """
+        applied_at = time.time()
+        with self._lock:
+            self.states[(entity_type, entity)] = (config_hash, sections, self.gitlabform_version, applied_at)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entity_states"
+                " (entity_type, entity, config_hash, sections, gitlabform_version, applied_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (entity_type, entity, config_hash, json.dumps(sections), self.gitlabform_version, applied_at),
+            )
+            # commit each one, so that the states are kept even if the run is interrupted
+            self.connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,171 @@
+import datetime
+import os
+from unittest.mock import patch
+
+import pytest
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.cache import CompiledConfigCache
+from gitlabform.configuration.core import ConfigurationCore
+from gitlabform.configuration.transform import ConfigurationTransformer
+
+CONFIG_YAML = """
+config_version: 4
+
+projects_and_groups:
+  my-group/*:
+    files:
+      README.md:
+        file: readme.md
+        branches: all
+    merge_requests_approval_rules:
+      standard:
+        users: [jsmith]
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path) -> str:
+    (tmp_path / "readme.md").write_text("# Readme")
+    path = tmp_path / "config.yml"
+    path.write_text(CONFIG_YAML)
+    return str(path)
+
+
+@pytest.fixture
+def config_cache(tmp_path) -> CompiledConfigCache:
+    return CompiledConfigCache(str(tmp_path / "cache"), id_lookups_ttl=60)
+
+
+def compile_and_save(config_cache: CompiledConfigCache, config_path: str) -> Configuration:
+    configuration = Configuration(config_path, config_cache=config_cache)
+    assert configuration.compiled_config is None
+
+    configuration.compiled_config = config_cache.create(
+        config_path, ConfigurationTransformer.to_simple_types(configuration.config, {})
+    )
+    configuration.compiled_config.add_id("user", "jsmith", 123)
+    configuration.compiled_config.set_transformed_config({"transformed": True})
+    config_cache.save(configuration.compiled_config)
+    return configuration
+
+
+def test__cached_config_is_used_without_parsing(config_cache, config_path):
+    compile_and_save(config_cache, config_path)
+
+    with patch.object(ConfigurationCore, "_parse_yaml", side_effect=AssertionError("config parsed")):
+        configuration = Configuration(config_path, config_cache=config_cache)
+
+    assert configuration.compiled_config is not None
+    assert configuration.get("projects_and_groups|my-group/*|files|README.md|file") == "readme.md"
+    assert configuration.compiled_config.get_transformed_config() == {"transformed": True}
+    assert configuration.compiled_config.get_id("user", "jsmith") == 123
+    assert configuration.config_dir == os.path.dirname(config_path)
+
+
+def test__parsed_config_copies_are_independent(config_cache, config_path):
+    compile_and_save(config_cache, config_path)
+    compiled_config = config_cache.load(config_path)
+
+    compiled_config.get_parsed_config()["projects_and_groups"].clear()
+
+    assert compiled_config.get_parsed_config()["projects_and_groups"]
+
+
+def test__cache_is_not_used_when_config_changes(config_cache, config_path):
+    compile_and_save(config_cache, config_path)
+
+    with open(config_path, "a") as config_file:
+        config_file.write("\nskip_projects: [my-group/other]\n")
+
+    assert config_cache.load(config_path) is None
+
+
+def test__cache_is_not_used_when_referenced_file_changes(config_cache, config_path, tmp_path):
+    compile_and_save(config_cache, config_path)
+    assert config_cache.load(config_path) is not None
+
+    (tmp_path / "readme.md").write_text("# Changed readme")
+
+    assert config_cache.load(config_path) is None
+
+
+def test__cache_is_not_used_when_file_is_corrupted(config_cache, config_path):
+    compile_and_save(config_cache, config_path)
+    cache_files = os.listdir(config_cache.cache_dir)
+    assert len(cache_files) == 1
+
+    with open(os.path.join(config_cache.cache_dir, cache_files[0]), "wb") as cache_file:
+        cache_file.write(b"not a compiled config")
+
+    assert config_cache.load(config_path) is None
+
+
+def test__cache_is_not_used_with_other_gitlab(config_cache, config_path):
+    with patch.dict(os.environ, {"GITLAB_URL": "https://gitlab.example.com/"}):
+        compile_and_save(config_cache, config_path)
+        assert config_cache.load(config_path) is not None
+
+    with patch.dict(os.environ, {"GITLAB_URL": "https://other-gitlab.example.com"}):
+        assert config_cache.load(config_path) is None
+
+
+def test__types_of_config_values_are_preserved(config_cache, tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text(CONFIG_YAML + "  my-group/project:\n    variables:\n      1: {expires_at: 2024-01-31}\n")
+    configuration = compile_and_save(config_cache, str(path))
+
+    compiled_config = config_cache.load(str(path))
+
+    assert compiled_config.get_parsed_config() == ConfigurationTransformer.to_simple_types(configuration.config, {})
+    assert compiled_config.get_parsed_config()["projects_and_groups"]["my-group/project"]["variables"] == {
+        1: {"expires_at": datetime.date(2024, 1, 31)}
+    }
+
+
+def test__id_lookups_expire(config_cache, config_path):
+    with patch("gitlabform.configuration.cache.time.time", return_value=1000.0):
+        compile_and_save(config_cache, config_path)
+
+    with patch("gitlabform.configuration.cache.time.time", return_value=1059.0):
+        compiled_config = config_cache.load(config_path)
+        assert compiled_config.get_id("user", "jsmith") == 123
+        assert compiled_config.get_transformed_config() == {"transformed": True}
+
+    with patch("gitlabform.configuration.cache.time.time", return_value=1060.0):
+        compiled_config = config_cache.load(config_path)
+        assert compiled_config.get_id("user", "jsmith") is None
+        # the transformed config contains the id, so it has to be transformed again
+        assert compiled_config.get_transformed_config() is None
+
+
+def test__transformed_config_is_valid_until_oldest_used_id_expires(config_cache, config_path):
+    with patch("gitlabform.configuration.cache.time.time", return_value=1000.0):
+        compile_and_save(config_cache, config_path)
+
+    with patch("gitlabform.configuration.cache.time.time", return_value=1030.0):
+        compiled_config = config_cache.load(config_path)
+        # reusing the id looked up at 1000 and looking up a new one at 1030
+        assert compiled_config.get_id("user", "jsmith") == 123
+        compiled_config.add_id("group", "my-group", 456)
+        compiled_config.set_transformed_config({"transformed": "again"})
+        config_cache.save(compiled_config)
+
+    with patch("gitlabform.configuration.cache.time.time", return_value=1070.0):
+        compiled_config = config_cache.load(config_path)
+        assert compiled_config.get_transformed_config() is None
+        # expired lookups are not stored
+        assert compiled_config.get_id("user", "jsmith") is None
+        assert compiled_config.get_id("group", "my-group") == 456
+
+
+def test__transformed_config_without_ids_does_not_expire(config_cache, config_path):
+    configuration = Configuration(config_path, config_cache=config_cache)
+    compiled_config = config_cache.create(
+        config_path, ConfigurationTransformer.to_simple_types(configuration.config, {})
+    )
+    compiled_config.set_transformed_config({"transformed": True})
+    config_cache.save(compiled_config)
+
+    with patch("gitlabform.configuration.cache.time.time", return_value=10**12):
+        assert config_cache.load(config_path).get_transformed_config() == {"transformed": True}
@@ -92,3 +92,26 @@ def test__config_with_different_case_duplicate_skip_projects():
     with pytest.raises(SystemExit) as e:
         Configuration(config_string=config_yaml)
     assert e.value.code == EXIT_INVALID_INPUT
+
+
+def test__case_insensitive_lookup_follows_config_replacement():
+    config_yaml = """
+    projects_and_groups:
+      SomeGroup/*:
+        project_settings:
+          visibility: internal
+    """
+    configuration = Configuration(config_string=config_yaml)
+    assert configuration._get_group_config("somegroup") == {"project_settings": {"visibility": "internal"}}
+
+    # transformers replace the whole config, f.e. when converting it to simple types
+    configuration.config = {
+        "projects_and_groups": {
+            "OtherGroup/*": {"project_settings": {"visibility": "public"}},
+            "OtherGroup/Project": {"project_settings": {"visibility": "private"}},
+        }
+    }
+
+    assert configuration._get_group_config("somegroup") == {}
+    assert configuration._get_group_config("othergroup") == {"project_settings": {"visibility": "public"}}
+    assert configuration._get_project_config("othergroup/project") == {"project_settings": {"visibility": "private"}}
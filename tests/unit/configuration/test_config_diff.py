@@ -0,0 +1,183 @@
+import pytest
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.diff import ConfigurationDiff
+from gitlabform.lists import Groups, OmissionReason, Projects
+from gitlabform.lists.filter import OmitNotChangedConfigs
+
+OLD_CONFIG_YAML = """
+projects_and_groups:
+  "*":
+    project_settings:
+      visibility: internal
+  group/*:
+    group_settings:
+      description: a group
+  group/subgroup/*:
+    project_settings:
+      description: a subgroup project
+  group/project:
+    merge_requests_approvals:
+      approvals_before_merge: 1
+  group/foo-*:
+    project_settings:
+      description: a foo project
+  other/*:
+    group_settings:
+      description: other group
+"""
+
+
+def get_diff(new_config_yaml: str) -> ConfigurationDiff:
+    return ConfigurationDiff(Configuration(config_string=OLD_CONFIG_YAML), Configuration(config_string=new_config_yaml))
+
+
+def test__no_changes():
+    config_diff = get_diff(OLD_CONFIG_YAML)
+
+    assert config_diff.changed_keys == set()
+    assert not config_diff.is_group_changed("group")
+    assert not config_diff.is_project_changed("group/project")
+    assert not config_diff.is_project_changed("group/subgroup/project")
+
+
+def test__common_config_change_affects_all():
+    config_diff = get_diff(OLD_CONFIG_YAML.replace("visibility: internal", "visibility: private"))
+
+    assert config_diff.is_project_changed("group/project")
+    assert config_diff.is_project_changed("other/project")
+    assert config_diff.is_project_changed("not-configured/project")
+    assert config_diff.is_group_changed("other")
+
+
+def test__group_config_change_cascades_to_subgroups_and_projects():
+    config_diff = get_diff(OLD_CONFIG_YAML.replace("description: a group", "description: the group"))
+
+    assert config_diff.is_group_changed("group")
+    assert config_diff.is_group_changed("group/subgroup")
+    assert config_diff.is_project_changed("group/project")
+    assert config_diff.is_project_changed("group/subgroup/deeper/project")
+
+    assert not config_diff.is_group_changed("other")
+    assert not config_diff.is_group_changed("group-other")
+    assert not config_diff.is_project_changed("other/project")
+
+
+def test__subgroup_config_change_does_not_affect_parent_group():
+    config_diff = get_diff(OLD_CONFIG_YAML.replace("a subgroup project", "the subgroup project"))
+
+    assert config_diff.is_project_changed("group/subgroup/project")
+    assert config_diff.is_project_changed("group/subgroup/deeper/project")
+    assert config_diff.is_group_changed("group/subgroup")
+    assert not config_diff.is_project_changed("group/project")
+    assert not config_diff.is_group_changed("group")
+
+
+@pytest.mark.parametrize(
+    "new_pattern",
+    [
+        # changed
+        """
+  group/foo-*:
+    project_settings:
+      description: the foo project
+""",
+        # removed
+        "\n",
+        # a better matching one added
+        """
+  group/foo-*:
+    project_settings:
+      description: a foo project
+  group/foo-bar*:
+    project_settings:
+      description: a foo-bar project
+""",
+    ],
+)
+def test__pattern_changes_affect_matching_projects(new_pattern):
+    old_pattern = """
+  group/foo-*:
+    project_settings:
+      description: a foo project
+"""
+    config_diff = get_diff(OLD_CONFIG_YAML.replace(old_pattern, new_pattern))
+
+    assert config_diff.is_project_changed("group/foo-bar")
+    assert not config_diff.is_project_changed("group/bar")
+    assert not config_diff.is_project_changed("other/foo-bar")
+
+
+def test__changes_not_changing_effective_configs_are_ignored():
+    # moving the setting from the project to the group that it is the only project of
+    config_diff = get_diff(OLD_CONFIG_YAML.replace("group/subgroup/*:", "GROUP/subgroup/project:"))
+
+    assert config_diff.changed_keys == {"group/subgroup/*", "group/subgroup/project"}
+    assert not config_diff.is_project_changed("group/subgroup/project")
+    assert config_diff.is_project_changed("group/subgroup/other")
+
+
+def test__key_case_changes_are_ignored():
+    config_diff = get_diff(OLD_CONFIG_YAML.replace("group/project:", "Group/Project:"))
+
+    assert config_diff.changed_keys == set()
+
+
+def test__skip_lists_changes():
+    config_diff = ConfigurationDiff(
+        Configuration(config_string=OLD_CONFIG_YAML + "skip_projects: [group/project]\nskip_groups: [other]\n"),
+        Configuration(config_string=OLD_CONFIG_YAML),
+    )
+
+    assert config_diff.is_project_changed("group/project")
+    assert config_diff.is_group_changed("other")
+    assert not config_diff.is_project_changed("group/other")
+    assert not config_diff.is_group_changed("group")
+
+
+def test__not_changed_groups_and_projects_are_omitted():
+    config_diff = get_diff(OLD_CONFIG_YAML.replace("approvals_before_merge: 1", "approvals_before_merge: 2"))
+    groups = Groups()
+    groups.add_requested(["group", "other"])
+    projects = Projects()
+    projects.add_requested(["group/project", "group/other", "other/project"])
+
+    OmitNotChangedConfigs(config_diff).filter(groups, projects)
+
+    assert groups.get_omitted(OmissionReason.NOT_CHANGED) == ["group", "other"]
+    assert projects.get_omitted(OmissionReason.NOT_CHANGED) == ["group/other", "other/project"]
+    assert projects.get_effective() == ["group/project"]
+
+
+def test__changes_in_referenced_files_are_detected(tmp_path):
+    config_yaml = """
+config_version: 4
+projects_and_groups:
+  group/*:
+    files:
+      README.md:
+        file: readme.md
+        branches: all
+  other/*:
+    group_settings:
+      description: other group
+"""
+    config_paths = []
+    for version, readme in [("old", "# Readme"), ("new", "# Changed readme")]:
+        (tmp_path / version).mkdir()
+        (tmp_path / version / "readme.md").write_text(readme)
+        (tmp_path / version / "config.yml").write_text(config_yaml)
+        config_paths.append(str(tmp_path / version / "config.yml"))
+
+    config_diff = ConfigurationDiff(Configuration(config_paths[0]), Configuration(config_paths[1]))
+
+    assert config_diff.changed_keys == {"group/*"}
+    assert config_diff.is_project_changed("group/project")
+    assert config_diff.is_group_changed("group")
+    assert not config_diff.is_project_changed("other/project")
+
+    (tmp_path / "new" / "readme.md").write_text("# Readme")
+    config_diff = ConfigurationDiff(Configuration(config_paths[0]), Configuration(config_paths[1]))
+
+    assert config_diff.changed_keys == set()
+    assert not config_diff.is_project_changed("group/project")
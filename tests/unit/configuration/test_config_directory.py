@@ -0,0 +1,180 @@
+import textwrap
+from logging import INFO
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.core import ConfigInvalidException, ConfigurationCore
+from gitlabform.configuration.directory import scan_projects_and_groups_keys
+from gitlabform.configuration.transform import ConfigurationTransformers
+from gitlabform.gitlab import GitLab
+
+
+def write(path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(content))
+
+
+@pytest.fixture
+def config_directory(tmp_path):
+    write(
+        tmp_path / "config.yml",
+        """
+        config_version: 4
+
+        projects_and_groups:
+          "*":
+            project_settings:
+              visibility: internal
+        """,
+    )
+    write(
+        tmp_path / "foo" / "group.yml",
+        """
+        projects_and_groups:
+          foo/*:
+            project_settings:
+              description: foo group
+          "foo/bar/*":
+            group_settings:
+              description: bar subgroup
+        """,
+    )
+    write(
+        tmp_path / "foo" / "bar" / "baz.yml",
+        """
+        # the project config
+        projects_and_groups:
+          'foo/bar/baz':
+            branches:
+              main:
+                protected: true
+                push_access_level: maintainer
+        """,
+    )
+    write(
+        tmp_path / "other.yaml",
+        """
+        projects_and_groups:
+          other/*:
+            project_settings:
+              description: other group
+          other/project:
+            project_settings:
+              description: other project
+        """,
+    )
+    return tmp_path
+
+
+def parse_yaml_recording_files(parsed_files: list):
+    parse_yaml = ConfigurationCore._parse_yaml
+
+    def parse_yaml_and_record(source, config_string):
+        parsed_files.append(source)
+        return parse_yaml(source, config_string)
+
+    return patch.object(ConfigurationCore, "_parse_yaml", side_effect=parse_yaml_and_record)
+
+
+def test__keys_are_scanned_without_parsing(tmp_path):
+    write(
+        tmp_path / "entries.yml",
+        """
+        ---
+        projects_and_groups:
+          # a comment
+          "group/*":
+            files:
+              some_file:
+                content: |
+                  not_a_key:
+          'it''s/project':   # a comment
+            {}
+          plain/key with spaces: {a: b}
+          "escaped\\"quote": null
+        """,
+    )
+
+    assert scan_projects_and_groups_keys(str(tmp_path / "entries.yml")) == [
+        "group/*",
+        "it's/project",
+        "plain/key with spaces",
+        'escaped"quote',
+    ]
+
+
+def test__other_top_level_keys_are_not_allowed(tmp_path):
+    write(
+        tmp_path / "entries.yml",
+        """
+        skip_projects: []
+        projects_and_groups:
+          group/*: {}
+        """,
+    )
+
+    with pytest.raises(ValueError):
+        scan_projects_and_groups_keys(str(tmp_path / "entries.yml"))
+
+
+def test__only_the_files_needed_for_a_project_are_parsed(config_directory):
+    parsed_files: list = []
+    with parse_yaml_recording_files(parsed_files):
+        configuration = Configuration(str(config_directory))
+
+        assert configuration.get_groups() == ["foo", "foo/bar", "other"]
+        assert configuration.get_projects() == ["foo/bar/baz", "other/project"]
+        assert parsed_files == [str(config_directory / "config.yml")]
+
+        effective_config = configuration.get_effective_config_for_project("foo/bar/baz")
+
+    assert effective_config == {
+        "project_settings": {"visibility": "internal", "description": "foo group"},
+        "group_settings": {"description": "bar subgroup"},
+        "branches": {"main": {"protected": True, "push_access_level": "maintainer"}},
+    }
+    assert parsed_files == [
+        str(config_directory / "config.yml"),
+        str(config_directory / "foo" / "group.yml"),
+        str(config_directory / "foo" / "bar" / "baz.yml"),
+    ]
+    assert configuration.config_dir == str(config_directory)
+
+
+def test__entries_parsed_later_are_transformed(config_directory):
+    configuration = Configuration(str(config_directory))
+
+    ConfigurationTransformers(MagicMock(GitLab), INFO).transform(configuration)
+
+    effective_config = configuration.get_effective_config_for_project("foo/bar/baz")
+    assert effective_config["branches"] == {"main": {"protected": True, "push_access_level": 40}}
+
+
+def test__duplicated_keys_are_not_allowed(config_directory):
+    write(
+        config_directory / "duplicate.yml",
+        """
+        projects_and_groups:
+          other/project: {}
+        """,
+    )
+
+    with pytest.raises(ConfigInvalidException):
+        Configuration(str(config_directory))
+
+
+def test__keys_different_than_indexed_are_not_allowed(config_directory):
+    write(
+        config_directory / "flow.yml",
+        """
+        projects_and_groups:
+          flow/*: {
+          project_settings: {}}
+        """,
+    )
+    configuration = Configuration(str(config_directory))
+
+    with pytest.raises(SystemExit):
+        configuration.get_effective_config_for_group("flow")
@@ -0,0 +1,74 @@
+import datetime
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.interning import ConfigInterner, get_content_hash
+
+
+def test_content_hash_ignores_key_order_and_dict_types():
+    assert get_content_hash({"a": 1, "b": {"c": [1, 2]}}) == get_content_hash({"b": {"c": [1, 2]}, "a": 1})
+    assert get_content_hash({"a": 1}) != get_content_hash({"a": "1"})
+    assert get_content_hash({"a": [1, 2]}) != get_content_hash({"a": [2, 1]})
+    # keys of different types
+    assert get_content_hash({1: "a", "1": "b"}) == get_content_hash({"1": "b", 1: "a"})
+    assert get_content_hash({1: "a", "1": "b"}) != get_content_hash({1: "b", "1": "a"})
+    assert get_content_hash({1: "a"}) != get_content_hash({"1": "a"})
+    assert get_content_hash({True: "a"}) != get_content_hash({1: "a"})
+    assert get_content_hash({"a": None}) != get_content_hash({"a": "null"})
+    assert get_content_hash({"a": 1.0}) != get_content_hash({"a": 1})
+    assert get_content_hash({"a": datetime.date(2024, 1, 1)}) != get_content_hash({"a": "2024-01-01"})
+
+
+def test_interner_returns_the_same_object_for_equal_configs():
+    interner = ConfigInterner()
+
+    first = interner.intern({"a": {"b": 1}})
+    second = interner.intern({"a": {"b": 1}})
+    other = interner.intern({"a": {"b": 2}})
+
+    assert first is second
+    assert other is not first
+    assert len(interner) == 2
+    assert interner.get_id(first) == interner.get_id({"a": {"b": 1}})
+    assert interner.get_id(first) != interner.get_id(other)
+
+
+def test_interner_keeps_only_the_most_recently_used_configs():
+    interner = ConfigInterner(max_size=2)
+
+    first = interner.intern({"a": 1})
+    second = interner.intern({"a": 2})
+    assert interner.intern({"a": 1}) is first
+    interner.intern({"a": 3})
+
+    assert len(interner) == 2
+    assert interner.intern({"a": 1}) is first
+    assert interner.intern({"a": 2}) is not second
+    assert interner.get_id(second) == interner.get_id({"a": 2})
+    # the evicted configs are still counted once
+    assert interner.distinct_count == 3
+
+
+def test_projects_with_equal_effective_configs_share_them():
+    config_yaml = """
+    ---
+    projects_and_groups:
+      "*":
+        project_settings:
+          visibility: internal
+      group/*:
+        merge_requests_approvals:
+          approvals_before_merge: 1
+      group/special:
+        project_settings:
+          visibility: private
+    """
+    configuration = Configuration(config_string=config_yaml)
+
+    project1 = configuration.get_effective_config_for_project("group/project1")
+    project2 = configuration.get_effective_config_for_project("group/project2")
+    special = configuration.get_effective_config_for_project("group/special")
+
+    assert project1 is project2
+    assert special is not project1
+    assert configuration.get_effective_config_id(project1) == configuration.get_effective_config_id(project2)
+    assert configuration.get_effective_config_id(special) != configuration.get_effective_config_id(project1)
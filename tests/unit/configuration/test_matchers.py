@@ -0,0 +1,179 @@
+import fnmatch
+import random
+from typing import List, Optional, Set, Tuple
+
+import pytest
+
+from gitlabform.configuration.matchers import ProjectPatternMatcher, SkipListMatcher
+
+
+def get_best_match_by_checking_all(patterns: List[str], group_and_project: str) -> Optional[str]:
+    # the matching as it was done before the patterns were compiled, as a reference
+    matches = []
+    for key in patterns:
+        if fnmatch.fnmatchcase(group_and_project.lower(), key.lower()):
+            prefix = key.split("*", 1)[0]
+            matches.append((len(prefix), -key.count("*"), key))
+    if matches:
+        matches.sort(reverse=True)
+        return matches[0][2]
+    return None
+
+
+def generate_patterns_and_projects(
+    patterns_count: int, projects_count: int, seed: int = 0
+) -> Tuple[List[str], List[str]]:
+    generator = random.Random(seed)
+    groups = [f"group-{i}" for i in range(patterns_count // 10 + 1)]
+    words = ["api", "web", "lib", "tool", "svc", "app", "foo", "bar"]
+
+    patterns: Set[str] = set()
+    while len(patterns) < patterns_count:
+        group = generator.choice(groups)
+        word = generator.choice(words)
+        patterns.add(
+            generator.choice(
+                [
+                    f"{group}/{word}-*",
+                    f"{group}/*-{word}",
+                    f"{group}/{word}-*-{generator.choice(words)}",
+                    f"{group}/sub-{word}/*",
+                    f"{group.upper()}/{word}*",
+                    f"{group}/{word}-?-*",
+                    f"{group[:-1]}?/{word}-*",
+                ]
+            )
+        )
+
+    projects = [
+        f"{generator.choice(groups)}/{generator.choice(['', 'sub-' + generator.choice(words) + '/'])}"
+        f"{generator.choice(words)}-{generator.choice(words + ['x', '1'])}-{generator.choice(words)}"
+        for _ in range(projects_count)
+    ]
+    return sorted(patterns), projects
+
+
+class TestProjectPatternMatcher:
+    @pytest.mark.parametrize(
+        "patterns, project, expected",
+        [
+            (["group/foo-*", "group/*"], "group/foo-bar", "group/foo-*"),
+            (["group/*bar", "group/foo-*"], "group/foo-bar", "group/foo-*"),
+            (["group/foo-*", "group/foo-*-baz"], "group/foo-x-baz", "group/foo-*-baz"),
+            (["group/foo-*-*", "group/foo-*-baz"], "group/foo-x-baz", "group/foo-*-baz"),
+            (["GROUP/Foo-*"], "group/FOO-bar", "GROUP/Foo-*"),
+            (["group/fo?-*", "group/f*"], "group/foo-bar", "group/fo?-*"),
+            (["group/foo-*"], "group/bar", None),
+            (["group/foo-*"], "group/fo", None),
+            ([], "group/foo", None),
+        ],
+    )
+    def test_get_best_match(self, patterns, project, expected):
+        assert ProjectPatternMatcher(patterns).get_best_match(project) == expected
+
+    def test_same_results_as_checking_all_patterns(self):
+        patterns, projects = generate_patterns_and_projects(300, 3000)
+
+        matcher = ProjectPatternMatcher(patterns)
+
+        for project in projects:
+            assert matcher.get_best_match(project) == get_best_match_by_checking_all(patterns, project), project
+
+
+@pytest.mark.benchmark
+def test_benchmark_1k_patterns_50k_projects():
+    # checking all the patterns for every project takes minutes here
+    patterns, projects = generate_patterns_and_projects(1000, 50000)
+
+    matcher = ProjectPatternMatcher(patterns)
+
+    assert any(matcher.get_best_match(project) for project in projects)
+
+
+def is_skipped_by_checking_all(an_array: List[str], item: str) -> bool:
+    # the matching as it was done before the skip lists were compiled, as a reference
+    item = item.lower()
+    for list_element in an_array:
+        list_element = list_element.lower()
+        if list_element == item:
+            return True
+        if list_element.endswith("/*") and item.startswith(list_element[:-2]):
+            return True
+        if "*" in list_element and fnmatch.fnmatchcase(item, list_element):
+            return True
+    return False
+
+
+def generate_skip_list(elements_count: int, projects: List[str], seed: int = 0) -> List[str]:
+    generator = random.Random(seed)
+    elements: Set[str] = set()
+    while len(elements) < elements_count:
+        group, project = generator.choice(projects).rsplit("/", 1)
+        elements.add(
+            generator.choice(
+                [
+                    f"{group}/{project}",
+                    f"{group.upper()}/*",
+                    f"{group}/{project[:3]}*",
+                    f"*/{project}-old",
+                    f"{group[:-1]}*/*",
+                    f"*/{project}/*",
+                    f"{group}/{project[:2]}?*",
+                    group,
+                ]
+            )
+        )
+    return sorted(elements)
+
+
+class TestSkipListMatcher:
+    @pytest.mark.parametrize(
+        "skip_list, item, expected",
+        [
+            (["group/project"], "GROUP/Project", True),
+            (["group/project"], "group/project2", False),
+            (["Group/*"], "group", True),
+            (["group/*"], "group/subgroup/project", True),
+            (["group/*"], "other/project", False),
+            (["group/foo-*"], "group/foo-bar", True),
+            (["group/foo-*"], "group/bar-foo", False),
+            (["group-*/"], "group-x/", True),
+            (["group-*/"], "group-x", False),
+            (["group/fo?"], "group/foo", False),
+            (["*/project-old"], "group/subgroup/project-old", True),
+            (["*/project-old"], "group/project-old-2", False),
+            (["*[a-z]-old"], "group/project-old", True),
+            (["team-*/*"], "team-a/proj", True),
+            (["team-*/*"], "team-a/subgroup/proj", True),
+            (["team-*/*"], "other/proj", False),
+            (["*/legacy/*"], "x/legacy/p", True),
+            (["*/legacy/*"], "x/legacy", False),
+            (["group-?/*"], "group-a/proj", True),
+            ([], "group", False),
+        ],
+    )
+    def test_matches(self, skip_list, item, expected):
+        assert SkipListMatcher(skip_list).matches(item) == expected
+
+    def test_same_results_as_checking_all_elements(self):
+        _, projects = generate_patterns_and_projects(100, 3000)
+        skip_list = generate_skip_list(300, projects[:1000])
+
+        matcher = SkipListMatcher(skip_list)
+
+        items = (
+            projects + [f"{project}-old" for project in projects] + [project.rsplit("/", 1)[0] for project in projects]
+        )
+        for item in items:
+            assert matcher.matches(item) == is_skipped_by_checking_all(skip_list, item), item
+
+
+@pytest.mark.benchmark
+def test_benchmark_2k_skip_list_40k_projects():
+    # with 2k groups, so that only some of the projects are skipped
+    _, projects = generate_patterns_and_projects(20000, 40000)
+    skip_list = generate_skip_list(2000, projects)
+
+    matcher = SkipListMatcher(skip_list)
+
+    assert any(matcher.matches(project) for project in projects)
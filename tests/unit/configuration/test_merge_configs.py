@@ -0,0 +1,90 @@
+import random
+from copy import deepcopy
+from typing import Any, Dict
+
+from mergedeep import merge
+
+from gitlabform.configuration.core import ConfigurationCore
+
+
+def merge_configs_by_copying(more_general_config, more_specific_config) -> dict:
+    # the merging as it was done before the subtrees were shared, as a reference
+    more_general_config = deepcopy(more_general_config)
+    more_specific_config = deepcopy(more_specific_config)
+    merged_dict = merge({}, more_general_config, more_specific_config)
+
+    def break_inheritance(specific_config, parent_path=()):
+        for key, value in specific_config.items():
+            if "inherit" == key:
+                target_config = merged_dict
+                for path_key in parent_path[:-1]:
+                    target_config = target_config[path_key]
+                replacement_config = deepcopy(specific_config)
+                replacement_config.pop("inherit", None)
+                target_config[parent_path[-1]] = replacement_config
+                break
+            elif isinstance(value, dict):
+                break_inheritance(value, parent_path + (key,))
+
+    break_inheritance(more_specific_config)
+    return dict(merged_dict)
+
+
+def generate_config(generator: random.Random, depth: int, with_inherit: bool) -> Dict[str, Any]:
+    config: Dict[str, Any] = {}
+    for key in generator.sample(["a", "b", "c", "d", "e"], generator.randint(1, 4)):
+        kind = generator.random()
+        if depth > 0 and kind < 0.5:
+            config[key] = generate_config(generator, depth - 1, with_inherit)
+        elif kind < 0.7:
+            config[key] = [generator.randint(0, 3) for _ in range(generator.randint(0, 3))]
+        else:
+            config[key] = generator.choice([1, "x", None, True])
+    if with_inherit and depth < 2 and generator.random() < 0.2:
+        config["inherit"] = False
+    return config
+
+
+def test_same_results_as_merging_copies():
+    generator = random.Random(0)
+    for _ in range(2000):
+        general = {"section": generate_config(generator, 3, with_inherit=False)}
+        specific = {"section": generate_config(generator, 3, with_inherit=True)}
+        general_before, specific_before = deepcopy(general), deepcopy(specific)
+
+        merged = ConfigurationCore._merge_configs(general, specific)
+
+        assert merged == merge_configs_by_copying(general_before, specific_before)
+        # the input configs are not modified
+        assert general == general_before
+        assert specific == specific_before
+
+
+def test_unchanged_subtrees_are_shared():
+    general = {
+        "project_settings": {"visibility": "internal", "topics": ["a"]},
+        "files": {"README.md": {"content": "hello"}, "LICENSE": {"content": "MIT"}},
+    }
+    specific = {"files": {"README.md": {"content": "hi"}, "CHANGELOG.md": {"content": "v1"}}}
+
+    merged = ConfigurationCore._merge_configs(general, specific)
+
+    assert merged["project_settings"] is general["project_settings"]
+    assert merged["files"]["LICENSE"] is general["files"]["LICENSE"]
+    assert merged["files"]["CHANGELOG.md"] is specific["files"]["CHANGELOG.md"]
+    assert merged["files"]["README.md"] == {"content": "hi"}
+    assert general["files"]["README.md"] == {"content": "hello"}
+
+
+def test_inheritance_break_does_not_modify_shared_sections():
+    general = {"a": {"b": {"c": {"x": 1}}}}
+    specific = {"a": {"b": {"c": {"inherit": False, "y": 2}}}}
+    specific_only = {"d": {"e": {"f": {"inherit": False, "z": 3}}}}
+
+    assert ConfigurationCore._merge_configs(general, specific) == {"a": {"b": {"c": {"y": 2}}}}
+    assert ConfigurationCore._merge_configs(general, specific_only) == {
+        "a": {"b": {"c": {"x": 1}}},
+        "d": {"e": {"f": {"z": 3}}},
+    }
+    assert specific_only == {"d": {"e": {"f": {"inherit": False, "z": 3}}}}
+    assert general == {"a": {"b": {"c": {"x": 1}}}}
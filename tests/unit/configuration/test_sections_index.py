@@ -0,0 +1,173 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.sections import SectionsIndex
+from gitlabform.lists import Groups, OmissionReason, Projects
+from gitlabform.lists.filter import OmitConfigsWithoutSections
+from gitlabform.lists.projects import ProjectsProvider
+
+CONFIG_YAML = """
+projects_and_groups:
+  "*":
+    project_settings:
+      visibility: internal
+  group/*:
+    group_members:
+      users:
+        jsmith:
+          access_level: 30
+  group/subgroup/*:
+    files:
+      README.md:
+        content: a readme
+  other/*:
+    group_settings:
+      description: other group
+  other/project:
+    files:
+      README.md:
+        content: a readme
+  third/foo-*:
+    files:
+      README.md:
+        content: a readme
+"""
+
+
+@pytest.fixture
+def sections_index() -> SectionsIndex:
+    return SectionsIndex(Configuration(config_string=CONFIG_YAML), ["group_members"], ["files"])
+
+
+def test__groups_inherit_sections(sections_index):
+    assert sections_index.group_may_have_sections("group")
+    assert sections_index.group_may_have_sections("Group/Subgroup")
+    assert sections_index.group_may_have_sections("group/other-subgroup/deeper")
+    assert not sections_index.group_may_have_sections("other")
+    assert not sections_index.group_may_have_sections("group-other")
+
+
+def test__projects_inherit_sections(sections_index):
+    assert sections_index.project_may_have_sections("group/subgroup/project")
+    assert sections_index.project_may_have_sections("group/subgroup/deeper/project")
+    assert sections_index.project_may_have_sections("Other/Project")
+    assert sections_index.project_may_have_sections("third/foo-bar")
+    assert sections_index.project_may_have_sections("third/foo-*")
+
+    assert not sections_index.project_may_have_sections("group/project")
+    assert not sections_index.project_may_have_sections("other/other-project")
+    assert not sections_index.project_may_have_sections("third/bar")
+
+
+def test__sections_of_common_config_are_inherited_by_all():
+    sections_index = SectionsIndex(Configuration(config_string=CONFIG_YAML), [], ["project_settings"])
+
+    assert sections_index.project_may_have_sections("not-configured/project")
+    assert sections_index.projects_in_group_may_have_sections("not-configured")
+
+
+@pytest.mark.parametrize(
+    "group, may_have_sections",
+    [
+        ("group", True),  # subgroup
+        ("group/subgroup", True),
+        ("other", True),  # project
+        ("third", True),  # project pattern
+        ("group/other-subgroup", False),
+        ("unknown", False),
+    ],
+)
+def test__projects_in_groups(sections_index, group, may_have_sections):
+    assert sections_index.projects_in_group_may_have_sections(group) == may_have_sections
+
+
+def test__projects_in_groups_matching_patterns_with_wildcards_in_group():
+    sections_index = SectionsIndex(
+        Configuration(config_string="""
+            projects_and_groups:
+              group-*/project:
+                files:
+                  README.md:
+                    content: a readme
+            """),
+        [],
+        ["files"],
+    )
+
+    assert sections_index.projects_in_group_may_have_sections("group-a")
+    assert not sections_index.projects_in_group_may_have_sections("other")
+
+
+def test__groups_and_projects_without_sections_are_omitted(sections_index):
+    groups = Groups()
+    groups.add_requested(["group", "group/subgroup", "other"])
+    projects = Projects()
+    projects.add_requested(["group/project", "group/subgroup/project", "other/project"])
+
+    OmitConfigsWithoutSections(sections_index).filter(groups, projects)
+
+    assert groups.get_omitted(OmissionReason.NO_SECTIONS) == ["other"]
+    assert projects.get_omitted(OmissionReason.NO_SECTIONS) == ["group/project"]
+
+
+def test__projects_are_listed_only_in_groups_with_sections(sections_index):
+    gitlab = MagicMock()
+    gitlab.get_projects.side_effect = lambda group, **kwargs: [f"{group}/project"]
+    provider = ProjectsProvider(
+        gitlab,
+        sections_index.configuration,
+        include_archived_projects=True,
+        include_projects_scheduled_for_deletion=True,
+        recurse_subgroups=True,
+        sections_index=sections_index,
+    )
+    groups = Groups()
+    groups.add_requested(["group/subgroup", "other", "unknown"])
+
+    projects = provider._get_projects("some-target", groups)
+
+    assert sorted(call.args[0] for call in gitlab.get_projects.call_args_list) == ["group/subgroup", "other"]
+    assert projects.get_effective() == ["group/subgroup/project", "other/project"]
+
+
+@pytest.mark.parametrize(
+    "target, requested_groups, omitted_projects",
+    [
+        ("ALL", ["group", "group/subgroup", "other"], ["group/project", "other/other-project"]),
+        ("other", ["other"], ["other/other-project"]),
+    ],
+)
+def test__configured_projects_without_sections_are_omitted_for_any_target(target, requested_groups, omitted_projects):
+    configuration = Configuration(config_string=CONFIG_YAML + """
+  group/project:
+    project_settings:
+      visibility: private
+  other/other-project:
+    project_settings:
+      visibility: private
+  unknown/project:
+    project_settings:
+      visibility: private
+""")
+    sections_index = SectionsIndex(configuration, ["group_members"], ["files"])
+    gitlab = MagicMock()
+    gitlab.get_all_projects_in_groups.return_value = []
+    gitlab.get_projects.return_value = []
+    provider = ProjectsProvider(
+        gitlab,
+        configuration,
+        include_archived_projects=True,
+        include_projects_scheduled_for_deletion=True,
+        recurse_subgroups=True,
+        sections_index=sections_index,
+    )
+    groups = Groups()
+    groups.add_requested(requested_groups)
+
+    with patch.object(ProjectsProvider, "_get_single_project", return_value=None):
+        projects = provider._get_projects(target, groups)
+
+    assert projects.get_omitted(OmissionReason.NO_SECTIONS) == omitted_projects
+    assert projects.get_effective() == []
@@ -0,0 +1,27 @@
+import datetime
+
+import pytest
+
+from gitlabform.configuration import serialization
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"projects_and_groups": {"group/*": {"group_settings": {"description": "zażółć"}}}},
+        {1: "int key", "1": "str key", False: "bool key", None: "null key", 2.5: [1, "1", None]},
+        {"expires_at": datetime.date(2024, 1, 31), "created_at": datetime.datetime(2024, 1, 31, 12, 30)},
+        {serialization.TYPE_KEY: "dict", "items": []},
+        [{"a": {3: {"b": [datetime.date(2024, 1, 1)]}}}],
+    ],
+)
+def test_types_are_preserved(value):
+    loaded = serialization.loads(serialization.dumps(value))
+
+    assert loaded == value
+    assert repr(loaded) == repr(value)
+
+
+def test_other_types_are_not_serialized():
+    with pytest.raises(TypeError):
+        serialization.dumps({"value": {1, 2}})
@@ -0,0 +1,86 @@
+import datetime
+from unittest.mock import MagicMock
+
+from gitlabform.configuration.store import EffectiveConfigsStore
+
+
+def make_store(max_in_memory: int) -> tuple:
+    get_effective_config = MagicMock(side_effect=lambda project: {"project_settings": {"description": project}})
+    return EffectiveConfigsStore(get_effective_config, max_in_memory), get_effective_config
+
+
+def test_configs_are_computed_once():
+    store, get_effective_config = make_store(max_in_memory=10)
+
+    assert store.get("group/project1") == {"project_settings": {"description": "group/project1"}}
+    assert store.get("group/project1") == {"project_settings": {"description": "group/project1"}}
+    assert store.pop("group/project1") == {"project_settings": {"description": "group/project1"}}
+
+    assert get_effective_config.call_count == 1
+    assert len(store) == 0
+
+
+def test_configs_over_the_limit_are_spilled_to_file():
+    store, get_effective_config = make_store(max_in_memory=3)
+    projects = [f"group/project{i}" for i in range(10)]
+
+    for project in projects:
+        store.get(project)
+
+    assert len(store) == 10
+    assert len(store._in_memory) == 3
+    assert len(store._spilled) == 7
+
+    for project in reversed(projects):
+        assert store.pop(project) == {"project_settings": {"description": project}}
+
+    assert get_effective_config.call_count == 10
+    assert len(store) == 0
+    store.close()
+
+
+def test_pop_of_not_stored_config_computes_it():
+    store, get_effective_config = make_store(max_in_memory=3)
+
+    assert store.pop("group/project") == {"project_settings": {"description": "group/project"}}
+    assert store.pop("group/project") == {"project_settings": {"description": "group/project"}}
+
+    assert get_effective_config.call_count == 2
+    assert len(store) == 0
+
+
+def test_shared_configs_count_once_towards_the_limit():
+    shared_config = {"project_settings": {"visibility": "internal"}}
+    store = EffectiveConfigsStore(lambda project: shared_config, max_in_memory=1)
+
+    for i in range(10):
+        store.get(f"group/project{i}")
+
+    assert len(store._spilled) == 0
+    assert store.in_memory_objects_count == 1
+
+    for i in range(10):
+        assert store.pop(f"group/project{i}") is shared_config
+    assert store.in_memory_objects_count == 0
+
+
+def test_spilled_configs_keep_their_types():
+    config = {"1": "a", 1: "b", True: None, "date": datetime.date(2024, 1, 31), "list": [{2: 2.5}]}
+    store = EffectiveConfigsStore(lambda project: dict(config), max_in_memory=1)
+
+    store.get("group/project1")
+    store.get("group/project2")
+
+    assert len(store._spilled) == 1
+    assert store.pop("group/project2") == config
+    store.close()
+
+
+def test_configs_that_cannot_be_written_to_file_are_kept_in_memory():
+    store = EffectiveConfigsStore(lambda project: {"value": object()}, max_in_memory=1)
+
+    store.get("group/project1")
+    store.get("group/project2")
+
+    assert len(store._spilled) == 0
+    assert len(store._in_memory) == 2
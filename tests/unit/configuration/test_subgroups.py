@@ -114,3 +114,30 @@ def test__get_effective_config_for_group__level2(configuration_with_subgroups_on
             "visibility": "private",
         },
     }
+
+
+def test__effective_configs_of_ancestors_are_merged_once():
+    config_yaml = """
+    ---
+    projects_and_groups:
+      group/*:
+        project_settings:
+          from_group: foo
+      group/a/*:
+        project_settings:
+          from_a: foo
+    """
+    configuration = Configuration(config_string=config_yaml)
+
+    # a tree with 1 + 10 + 100 + 1000 groups/subgroups
+    subgroups = [f"group/a/{i}/{j}/{k}" for i in range(10) for j in range(10) for k in range(10)]
+    stats_before = configuration.get_effective_config_cache_stats()["subgroups"]
+
+    for subgroup in subgroups:
+        effective_config = configuration.get_effective_config_for_group(subgroup)
+        assert effective_config == {"project_settings": {"from_group": "foo", "from_a": "foo"}}
+
+    stats_after = configuration.get_effective_config_cache_stats()["subgroups"]
+    # each group/subgroup of the tree is computed once
+    assert stats_after["misses"] - stats_before["misses"] == 2 + 10 + 100 + 1000
+    assert stats_after["maxsize"] is not None
@@ -0,0 +1,168 @@
+from logging import INFO
+from typing import Any, Dict, List, Tuple
+from unittest.mock import MagicMock, patch
+
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.transform import (
+    AccessLevelsTransformer,
+    ConfigurationTransformers,
+    ConfigurationVisitor,
+    GroupTransformer,
+    ImplicitNameTransformer,
+    TransformRule,
+    UserTransformer,
+)
+from gitlabform.gitlab import GitLab
+
+
+def get_matched_paths(patterns: List[str], config: dict) -> Dict[str, List[Tuple[Any, Any]]]:
+    matched: Dict[str, List[Tuple[Any, Any]]] = {pattern: [] for pattern in patterns}
+
+    def get_rule(pattern: str) -> TransformRule:
+        return lambda parent, key: matched[pattern].append((key, parent[key]))
+
+    visitor = ConfigurationVisitor()
+    for pattern in patterns:
+        visitor.add_rule(pattern, get_rule(pattern))
+    visitor.visit(config)
+    return matched
+
+
+def test__single_key_wildcard() -> None:
+    config = {"a": {"x": {"b": 1}, "y": {"b": 2, "c": {"b": 3}}}}
+
+    matched = get_matched_paths(["a.*.b"], config)
+
+    assert matched["a.*.b"] == [("b", 1), ("b", 2)]
+
+
+def test__any_keys_wildcard_matches_also_zero_keys() -> None:
+    config = {"b": 1, "a": {"b": 2, "c": {"d": {"b": 3}}}}
+
+    matched = get_matched_paths(["**.b"], config)
+
+    assert matched["**.b"] == [("b", 1), ("b", 2), ("b", 3)]
+
+
+def test__lists_are_transparent() -> None:
+    config = {"a": [{"b": 1}, {"c": 2}, [{"b": 3}]], "d": [{"e": [{"b": 4}]}]}
+
+    matched = get_matched_paths(["a.b", "**.b"], config)
+
+    assert matched["a.b"] == [("b", 1), ("b", 3)]
+    assert matched["**.b"] == [("b", 1), ("b", 3), ("b", 4)]
+
+
+def test__rules_are_applied_in_registration_order_until_one_removes_the_key() -> None:
+    config = {"a": {"b": 1}}
+    calls = []
+
+    def replace(parent: dict, key: str) -> None:
+        calls.append("replace")
+        parent["c"] = parent.pop(key)
+
+    visitor = ConfigurationVisitor()
+    visitor.add_rule("a.b", lambda parent, key: calls.append("first"))
+    visitor.add_rule("**.b", replace)
+    visitor.add_rule("a.*", lambda parent, key: calls.append("last"))
+    visitor.visit(config)
+
+    assert calls == ["first", "replace"]
+    assert config == {"a": {"c": 1}}
+
+
+def test__subtrees_not_matching_any_pattern_are_skipped() -> None:
+    visited_keys = []
+
+    class RecordingDict(dict):
+        def keys(self):
+            visited_keys.append(sorted(super().keys()))
+            return super().keys()
+
+    config = RecordingDict(a=RecordingDict(b=1), skipped=RecordingDict(b=2))
+
+    matched = get_matched_paths(["a.b"], config)
+
+    assert matched["a.b"] == [("b", 1)]
+    assert visited_keys == [["a", "skipped"], ["b"]]
+
+
+def test__single_pass_gives_the_same_result_as_separate_transformers() -> None:
+    config_yaml = """
+    projects_and_groups:
+      "group/*":
+        protected_environments:
+          enforce: true
+          production:
+            deploy_access_levels:
+              - access_level: maintainer
+              - user: jsmith
+              - group: devs
+        merge_requests_approval_rules:
+          any:
+            users: [jsmith, jdoe]
+            groups: [devs]
+        branches:
+          main:
+            push_access_level: developer
+            allowed_to_merge:
+              - access_level: maintainer
+              - user: jsmith
+              - access_level: 30
+        members:
+          users:
+            jdoe:
+              access_level: reporter
+    """
+
+    def get_gitlab_mock() -> MagicMock:
+        gitlab_mock = MagicMock(GitLab)
+        gitlab_mock._get_user_id = MagicMock(side_effect=lambda user: f"id of {user}")
+        gitlab_mock._get_group_id = MagicMock(side_effect=lambda group: f"id of {group}")
+        return gitlab_mock
+
+    separately_transformed = Configuration(config_string=config_yaml)
+    gitlab_mock = get_gitlab_mock()
+    UserTransformer(gitlab_mock).transform(separately_transformed)
+    GroupTransformer(gitlab_mock).transform(separately_transformed)
+    ImplicitNameTransformer(gitlab_mock).transform(separately_transformed)
+    AccessLevelsTransformer(gitlab_mock).transform(separately_transformed, last=True)
+
+    transformed_in_single_pass = Configuration(config_string=config_yaml)
+    ConfigurationTransformers(get_gitlab_mock(), INFO).transform(transformed_in_single_pass)
+
+    assert transformed_in_single_pass.config == separately_transformed.config
+    project_config = transformed_in_single_pass.config["projects_and_groups"]["group/*"]
+    assert project_config["protected_environments"]["production"] == {
+        "deploy_access_levels": [{"access_level": 40}, {"user_id": "id of jsmith"}, {"group_id": "id of devs"}],
+        "name": "production",
+    }
+    assert project_config["branches"]["main"]["allowed_to_merge"] == [
+        {"access_level": 40},
+        {"user": "jsmith"},
+        {"access_level": 30},
+    ]
+
+
+def test__visiting_cost_does_not_depend_on_number_of_rules() -> None:
+    config = {"projects_and_groups": {f"group/project_{i}": {"a": {"b": [{"c": i}]}} for i in range(100)}}
+
+    def count_visited_nodes(rules_count: int) -> int:
+        visitor = ConfigurationVisitor()
+        for i in range(rules_count):
+            visitor.add_rule(f"**.key_{i}", lambda parent, key: None)
+        # the states of the matching are built on the first visit
+        visitor.visit(config)
+        with (
+            patch.object(
+                ConfigurationVisitor, "_visit", autospec=True, side_effect=ConfigurationVisitor._visit
+            ) as visit,
+            patch.object(ConfigurationVisitor, "_add_transitions", autospec=True) as add_transitions,
+        ):
+            visitor.visit(config)
+        # so then visiting a node is only looking up the next state for each of its keys
+        add_transitions.assert_not_called()
+        return visit.call_count
+
+    # with the rules checked one by one the cost would grow with their number, here each node is visited once
+    assert count_visited_nodes(200) == count_visited_nodes(1) == 1 + 1 + 100 * 5
@@ -0,0 +1,117 @@
+import pytest
+
+from gitlabform import util
+from gitlabform.configuration import Configuration
+from gitlabform.configuration.transform import ConfigurationTransformer
+
+_cfg = """
+    base: &base
+      a: 1
+      b: [1, 2]
+    other_base: &other_base
+      b: [3]
+      c: 2
+    multiple_merges:
+      k: 0
+      <<: [*base, *other_base]
+      b: [4]
+    projects_and_groups:
+      "*":
+        <<: *base
+        hex: 0x1F
+        octal: 0o17
+        date: 2024-01-02
+        datetime: 2024-01-02 10:11:12
+        datetime_with_tz: 2024-01-02T10:11:12+02:00
+        literal: |
+          some text
+        folded: >
+          some text
+        double_quoted: "quoted"
+        single_quoted: 'quoted'
+        not_a_bool: yes
+        bool: true
+        float: 1.5e3
+        infinity: .inf
+        "null": null
+        tilde: ~
+        binary: !!binary aGVsbG8=
+        alias: *base
+        1: int key
+        list:
+          - a
+          - 1
+          - b: c
+"""
+
+
+def convert_by_dumping_and_loading(config):
+    # the conversion as it was done before, as a reference
+    config_yaml_string = util.yaml_config_to_string(config)
+    simple_yaml_loader = util.configure_ruamel_yaml_loader(typ="safe", pure=True)
+    return simple_yaml_loader.load(config_yaml_string)
+
+
+def assert_same_values_and_types(actual, expected, path="") -> None:
+    assert type(actual) is type(expected), path
+    assert actual == expected, path
+    if isinstance(expected, dict):
+        assert list(actual.keys()) == list(expected.keys()), path
+        for key in expected:
+            assert_same_values_and_types(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        for index, (actual_item, expected_item) in enumerate(zip(actual, expected)):
+            assert_same_values_and_types(actual_item, expected_item, f"{path}[{index}]")
+
+
+def test__same_result_as_dumping_and_loading():
+    configuration = Configuration(config_string=_cfg)
+    expected = convert_by_dumping_and_loading(configuration.config)
+
+    ConfigurationTransformer.convert_to_simple_types(configuration)
+
+    assert_same_values_and_types(configuration.config, expected)
+    # aliased values are shared, like after loading
+    assert configuration.config["projects_and_groups"]["*"]["alias"] is configuration.config["base"]
+
+
+def get_many_projects_configuration() -> Configuration:
+    projects = "\n".join(f"""
+      group/project{i}:
+        project_settings:
+          description: "Project {i}"
+          visibility: private
+        files:
+          README.md:
+            branches: [main, develop]
+            content: |
+              # Project {i}
+        members:
+          users:
+            user{i}:
+              access_level: 30
+              expires_at: 2030-01-01
+        hooks:
+          "https://example.com/hook/{i}":
+            push_events: true
+            token: 0x{i:x}""" for i in range(300))
+    return Configuration(config_string=f"projects_and_groups:{projects}")
+
+
+def test__same_result_as_dumping_and_loading_for_many_projects():
+    configuration = get_many_projects_configuration()
+    expected = convert_by_dumping_and_loading(configuration.config)
+
+    ConfigurationTransformer.convert_to_simple_types(configuration)
+
+    assert_same_values_and_types(configuration.config, expected)
+
+
+@pytest.mark.benchmark
+def test__startup_benchmark():
+    # converting by dumping and loading takes a few times longer here
+    configuration = get_many_projects_configuration()
+
+    ConfigurationTransformer.convert_to_simple_types(configuration)
+
+    assert len(configuration.config["projects_and_groups"]) == 300
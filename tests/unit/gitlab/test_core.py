@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from unittest.mock import patch, MagicMock
@@ -199,3 +202,208 @@ class TestGitLabCoreUrlNormalization:
             core = GitLabCore()
 
         assert core.gitlab_config["url"] == "https://localhost"
+
+
+def make_core():
+    from gitlabform.gitlab.core import GitLabCore
+
+    with (
+        patch("gitlabform.gitlab.core.requests.Session"),
+        patch("gitlabform.gitlab.core.Configuration") as mock_configuration,
+        patch.object(GitLabCore, "_make_requests_to_api") as mock_api,
+    ):
+        mock_configuration.return_value.get.return_value = {"url": "https://localhost", "token": "test-token"}
+        mock_api.side_effect = [
+            {"version": "16.0.0", "revision": "abc123", "enterprise": True},
+            {"username": "test_user", "is_admin": True},
+        ]
+        return GitLabCore()
+
+
+def make_page(items, next_page="", total_pages=None, next_link=None):
+    response = MagicMock()
+    response.json.return_value = items
+    response.headers = {"x-next-page": next_page}
+    if total_pages:
+        response.headers["x-total-pages"] = str(total_pages)
+    response.links = {"next": {"url": next_link}} if next_link else {}
+    return response
+
+
+class TestGitLabCorePagination:
+    """
+    Tests for getting all the pages of paginated GitLab API endpoints.
+    """
+
+    def test_make_requests_to_api_returns_objects_from_all_pages(self):
+        core = make_core()
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = [
+                make_page([{"id": 1}], "2"),
+                make_page([{"id": 2}], "3"),
+                make_page([{"id": 3}]),
+            ]
+            results = core._make_requests_to_api("projects?archived=false")
+
+        assert results == [{"id": 1}, {"id": 2}, {"id": 3}]
+        paths = [call.args[0] for call in mock_request.call_args_list]
+        assert paths == [
+            "projects?archived=false&per_page=100",
+            "projects?archived=false&per_page=100&page=2",
+            "projects?archived=false&per_page=100&page=3",
+        ]
+
+    def test_make_requests_to_api_returns_non_paginated_object(self):
+        core = make_core()
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.return_value = make_page({"id": 1, "path": "project"})
+            result = core._make_requests_to_api("projects/%s", "group/project")
+
+        assert result == {"id": 1, "path": "project"}
+        mock_request.assert_called_once()
+
+    def test_iter_requests_to_api_gets_next_pages_only_when_needed(self):
+        core = make_core()
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = [make_page([{"id": 1}, {"id": 2}], "2"), make_page([{"id": 3}])]
+            iterator = core.iter_requests_to_api("groups")
+
+            assert next(iterator) == {"id": 1}
+            assert next(iterator) == {"id": 2}
+            assert mock_request.call_count == 1
+
+            assert list(iterator) == [{"id": 3}]
+            assert mock_request.call_count == 2
+
+    def test_pages_are_got_in_parallel_when_total_pages_is_known(self):
+        core = make_core()
+        core.gitlab_config["max_parallel_pages"] = 2
+
+        def get_page(path, *args):
+            page = int(path.split("&page=")[1]) if "&page=" in path else 1
+            return make_page([{"id": page}], str(page + 1) if page < 5 else "", total_pages=5)
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = get_page
+            results = list(core.iter_requests_to_api("groups/%s/projects", "group"))
+
+        assert results == [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}, {"id": 5}]
+        assert mock_request.call_count == 5
+
+    def test_pages_of_concurrent_listings_are_got_by_shared_threads(self):
+        core = make_core()
+        core.gitlab_config["max_parallel_pages"] = 2
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+        threads_getting_pages = set()
+
+        def get_page(path, *args):
+            nonlocal in_flight, max_in_flight
+            page = int(path.split("&page=")[1]) if "&page=" in path else 1
+            if page > 1:
+                with lock:
+                    in_flight += 1
+                    max_in_flight = max(max_in_flight, in_flight)
+                    threads_getting_pages.add(threading.current_thread().name)
+                time.sleep(0.01)
+                with lock:
+                    in_flight -= 1
+            return make_page([{"id": page}], str(page + 1) if page < 9 else "", total_pages=9)
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = get_page
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                listings = list(
+                    executor.map(lambda group: list(core.iter_requests_to_api("groups/%s/projects", group)), range(4))
+                )
+
+        assert all(listing == [{"id": page} for page in range(1, 10)] for listing in listings)
+        assert max_in_flight <= 2
+        assert len(threads_getting_pages) <= 2
+
+    def test_pages_are_got_one_by_one_when_parallel_pages_are_disabled(self):
+        core = make_core()
+        core.gitlab_config["max_parallel_pages"] = 1
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = [make_page([{"id": 1}], "2", total_pages=2), make_page([{"id": 2}], "")]
+            results = list(core.iter_requests_to_api("groups"))
+
+        assert results == [{"id": 1}, {"id": 2}]
+        assert mock_request.call_args_list[1].args[0] == "groups?per_page=100&page=2"
+
+    def test_keyset_pagination_is_used_when_total_pages_is_unknown(self):
+        core = make_core()
+
+        first_page = make_page([{"id": 10}, {"id": 11}], "2")
+        first_page_json = first_page.json
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = [
+                first_page,
+                make_page(
+                    [{"id": 12}],
+                    next_link="https://localhost/api/v4/projects?id_after=12&order_by=id&pagination=keyset&per_page=100&sort=asc",
+                ),
+                make_page([{"id": 13}]),
+            ]
+            results = list(core.iter_requests_to_api("projects?order_by=id&sort=asc", keyset_pagination=True))
+
+        assert results == [{"id": 10}, {"id": 11}, {"id": 12}, {"id": 13}]
+        paths = [call.args[0] for call in mock_request.call_args_list]
+        assert paths == [
+            "projects?order_by=id&sort=asc&per_page=100",
+            "projects?order_by=id&sort=asc&per_page=100&pagination=keyset&id_after=11",
+            "projects?id_after=12&order_by=id&pagination=keyset&per_page=100&sort=asc",
+        ]
+        # parsed once, for both getting the last id and returning the objects
+        first_page_json.assert_called_once()
+
+    @pytest.mark.parametrize("max_parallel_pages, total_pages", [(1, None), (2, 3)])
+    def test_request_data_is_sent_for_all_pages(self, max_parallel_pages, total_pages):
+        core = make_core()
+        core.gitlab_config["max_parallel_pages"] = max_parallel_pages
+
+        def get_page(path, *args):
+            page = int(path.split("&page=")[1]) if "&page=" in path else 1
+            return make_page([{"id": page}], str(page + 1) if page < 3 else "", total_pages=total_pages)
+
+        with patch.object(core, "_make_request_to_api") as mock_request:
+            mock_request.side_effect = get_page
+            results = core._make_requests_to_api("groups", data={"search": "foo"})
+
+        assert results == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert [call.args[3] for call in mock_request.call_args_list] == [{"search": "foo"}] * 3
+
+
+class TestGitLabCoreRateLimits:
+    @patch("gitlabform.gitlab.core.requests.Session")
+    @patch("gitlabform.gitlab.core.Configuration")
+    def test_adapters_share_rate_limit_controller(self, mock_configuration, mock_session):
+        mock_configuration.return_value.get.return_value = {}
+        mock_session_instance = MagicMock()
+        mock_session.return_value = mock_session_instance
+
+        mounted_adapters = {}
+        mock_session_instance.mount.side_effect = lambda url, adapter: mounted_adapters.__setitem__(url, adapter)
+
+        from gitlabform.gitlab.core import GitLabCore
+        from gitlabform.gitlab.rate_limit import RateLimitedHTTPAdapter
+
+        with patch.object(GitLabCore, "_make_requests_to_api") as mock_api:
+            mock_api.side_effect = [
+                {"version": "16.0.0", "revision": "abc123", "enterprise": True},
+                {"username": "test_user", "is_admin": True},
+            ]
+            core = GitLabCore(config_string="gitlab:\n  url: https://gitlab.example.com\n  token: test-token")
+
+        core.set_max_concurrent_requests(16)
+
+        for adapter in mounted_adapters.values():
+            assert isinstance(adapter, RateLimitedHTTPAdapter)
+            assert adapter.rate_limit_controller is core.rate_limit_controller
+        assert core.rate_limit_controller.max_concurrent_requests == 16
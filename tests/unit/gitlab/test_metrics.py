@@ -0,0 +1,91 @@
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from gitlabform.gitlab.metrics import RequestMetrics
+
+
+def make_response(method="GET", url="https://gitlab.example.com/api/v4/version", status_code=200, **kwargs):
+    response = MagicMock()
+    response.request.method = method
+    response.request.url = url
+    response.status_code = status_code
+    response.elapsed = timedelta(seconds=kwargs.get("seconds", 0.01))
+    response.content = kwargs.get("content", b"{}")
+    response.headers = kwargs.get("headers", {})
+    response.raw.retries.history = kwargs.get("history", ())
+    return response
+
+
+class TestEndpointTemplate:
+    @pytest.mark.parametrize(
+        "url, template",
+        [
+            ("https://gitlab.example.com/api/v4/version", "version"),
+            ("https://gitlab.example.com/api/v4/projects/123/hooks", "projects/:id/hooks"),
+            ("https://gitlab.example.com/api/v4/projects/group%2Fproject/hooks/5?x=1", "projects/:id/hooks/:id"),
+            ("https://gitlab.example.com/api/v4/groups/my-group/projects", "groups/:id/projects"),
+            (
+                "https://gitlab.example.com/api/v4/projects/1/repository/branches/main",
+                "projects/:id/repository/branches/:id",
+            ),
+            (
+                "https://gitlab.example.com/api/v4/projects/1/repository/files/a%2Fb.txt/raw",
+                "projects/:id/repository/files/:id/raw",
+            ),
+            ("https://gitlab.example.com/api/graphql", "api/graphql"),
+        ],
+    )
+    def test_get_endpoint_template(self, url, template):
+        assert RequestMetrics.get_endpoint_template(url) == template
+
+
+class TestRequestMetrics:
+    def test_record_aggregates_per_endpoint(self):
+        metrics = RequestMetrics()
+
+        metrics.record(make_response(url="https://gitlab.example.com/api/v4/projects/1/hooks", seconds=0.2))
+        metrics.record(
+            make_response(
+                url="https://gitlab.example.com/api/v4/projects/2/hooks",
+                seconds=3,
+                status_code=404,
+                content=b"not found",
+                history=("first attempt",),
+            )
+        )
+        metrics.record(make_response(method="PUT", url="https://gitlab.example.com/api/v4/projects/1", seconds=1))
+
+        hooks = metrics.endpoints["GET projects/:id/hooks"]
+        assert hooks["calls"] == 2
+        assert hooks["total_time"] == pytest.approx(3.2)
+        assert hooks["max_time"] == 3
+        assert hooks["total_size"] == 2 + 9
+        assert hooks["retries"] == 1
+        assert hooks["status_codes"] == {"200": 1, "404": 1}
+        assert sum(hooks["latency_histogram"]) == 2
+
+        assert [endpoint for endpoint, _ in metrics.get_top_endpoints(1)] == ["GET projects/:id/hooks"]
+        assert len(metrics.get_top_endpoints(10)) == 2
+
+    def test_record_does_not_read_streamed_responses(self):
+        metrics = RequestMetrics()
+        response = make_response(headers={"Content-Length": "1234"})
+        type(response).content = property(lambda _: pytest.fail("streamed response body read"))
+
+        metrics.record(response, stream=True)
+
+        assert metrics.endpoints["GET version"]["total_size"] == 1234
+
+    def test_write_to_file(self, tmp_path):
+        metrics = RequestMetrics()
+        metrics.record(make_response())
+        metrics_file = tmp_path / "metrics.json"
+
+        metrics.write_to_file(str(metrics_file))
+
+        written = json.loads(metrics_file.read_text())
+        assert written["total_calls"] == 1
+        assert written["endpoints"]["GET version"]["calls"] == 1
@@ -1,8 +1,15 @@
+import json
+import logging
+from collections import Counter
+from typing import List, Tuple
+
 import pytest
+import requests
 from gitlab import GitlabGetError
 
 from gitlabform.gitlab.python_gitlab import PythonGitlab
 from gitlabform.gitlab import GitlabWrapper, GitLab
+from gitlabform.processors.project import ProjectProcessors
 from unittest.mock import MagicMock, patch
 
 
@@ -232,3 +239,107 @@ class TestGitlabWrapperExtraKwargs:
         call_args = mock_graphql.call_args
         assert call_args.kwargs["url"] == "https://gitlab.example.com"
         assert call_args.kwargs["token"] == "test-token"
+
+
+class RecordingAdapter(requests.adapters.BaseAdapter):
+    """
+    Answers every request with a minimal project JSON and records the requests made.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requests: List[Tuple[str, str]] = []
+
+    def send(self, request, **kwargs):
+        self.requests.append((request.method, request.url))
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps({"id": 1, "path_with_namespace": "group/project"}).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class TestSharedGitlabClient:
+    """
+    Tests that all the processors share a single python-gitlab client and its caches.
+    """
+
+    @staticmethod
+    def _gitlab_with_recording_session() -> Tuple[GitLab, RecordingAdapter]:
+        adapter = RecordingAdapter()
+        session = requests.Session()
+        session.mount("https://", adapter)
+
+        gitlab = MagicMock(spec=GitLab)
+        gitlab.session = session
+        gitlab.gitlab_config = {"url": "https://gitlab.example.com", "token": "test-token"}
+        return gitlab, adapter
+
+    def test_wrappers_of_the_same_gitlab_share_the_client(self):
+        gitlab, _ = self._gitlab_with_recording_session()
+
+        assert GitlabWrapper(gitlab).get_gitlab() is GitlabWrapper(gitlab).get_gitlab()
+
+    def test_wrappers_of_different_gitlabs_do_not_share_the_client(self):
+        gitlab1, _ = self._gitlab_with_recording_session()
+        gitlab2, _ = self._gitlab_with_recording_session()
+
+        assert GitlabWrapper(gitlab1).get_gitlab() is not GitlabWrapper(gitlab2).get_gitlab()
+
+    def test_project_is_got_only_once_per_project_by_all_processors(self):
+        gitlab, adapter = self._gitlab_with_recording_session()
+
+        project_processors = ProjectProcessors(gitlab, MagicMock(), False, logging.WARNING)
+        # FilesProcessor has its own BranchesProcessor
+        processors = project_processors.processors + [
+            processor.branch_processor
+            for processor in project_processors.processors
+            if hasattr(processor, "branch_processor")
+        ]
+
+        for processor in processors:
+            processor.gl.get_project_by_path_cached("group/project")
+
+        gets = Counter(url for method, url in adapter.requests if method == "GET")
+        assert gets["https://gitlab.example.com/api/v4/projects/group%2Fproject"] == 1
+        assert all(count == 1 for count in gets.values())
+
+
+class TestGetProjectsByFullPaths:
+    def test_projects_are_got_in_chunks(self):
+        python_gitlab = PythonGitlab(MagicMock())
+        python_gitlab.graphql.execute.side_effect = [
+            {"projects": {"nodes": [{"fullPath": "Group/Project0", "archived": True, "markedForDeletionOn": None}]}},
+            {"projects": {"nodes": [{"fullPath": "group/project60", "archived": False, "markedForDeletionOn": "x"}]}},
+        ]
+
+        projects = python_gitlab.get_projects_by_full_paths([f"group/project{i}" for i in range(70)])
+
+        assert python_gitlab.graphql.execute.call_count == 2
+        first_query = python_gitlab.graphql.execute.call_args_list[0].args[0]
+        assert '"group/project49"' in first_query
+        assert '"group/project50"' not in first_query
+        assert projects == {
+            "group/project0": {
+                "path_with_namespace": "Group/Project0",
+                "archived": True,
+                "marked_for_deletion_on": None,
+            },
+            "group/project60": {
+                "path_with_namespace": "group/project60",
+                "archived": False,
+                "marked_for_deletion_on": "x",
+            },
+        }
+
+    def test_no_queries_for_no_paths(self):
+        python_gitlab = PythonGitlab(MagicMock())
+
+        assert python_gitlab.get_projects_by_full_paths([]) == {}
+        python_gitlab.graphql.execute.assert_not_called()
@@ -0,0 +1,126 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from gitlabform.gitlab.rate_limit import RateLimitController
+
+
+def make_response(status_code=200, **headers):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {key.replace("_", "-"): str(value) for key, value in headers.items()}
+    return response
+
+
+class TestRateLimitController:
+    def test_no_rate_limit_headers_does_not_slow_down(self):
+        controller = RateLimitController(4)
+
+        for _ in range(10):
+            controller.before_request()
+            controller.after_request(make_response())
+
+        assert controller.not_before <= time.time()
+        assert controller.interval == 0
+        assert controller.concurrent_requests == 4
+
+    def test_pauses_for_retry_after_and_halves_concurrency(self):
+        controller = RateLimitController(8)
+
+        controller.before_request()
+        before = time.time()
+        controller.after_request(make_response(429, Retry_After=30))
+
+        assert controller.not_before >= before + 30
+        assert controller.concurrent_requests == 4
+
+    def test_concurrency_does_not_drop_below_one(self):
+        controller = RateLimitController(8)
+
+        controller.before_request()
+        controller.after_request(make_response(429, Retry_After=0))
+        controller.before_request()
+        controller.after_request(make_response(429, Retry_After=0))
+        controller.before_request()
+        controller.after_request(make_response(429, Retry_After=0))
+        controller.before_request()
+        controller.after_request(make_response(429, Retry_After=0))
+
+        assert controller.concurrent_requests == 1
+
+    def test_retry_after_pause_blocks_next_request(self):
+        controller = RateLimitController(2)
+
+        controller.before_request()
+        controller.after_request(make_response(429, Retry_After=0.3))
+
+        start = time.time()
+        controller.before_request()
+        assert time.time() - start >= 0.25
+        controller.after_request(make_response())
+
+    def test_spreads_requests_when_few_remaining(self):
+        controller = RateLimitController(4)
+        reset = time.time() + 10
+
+        controller.before_request()
+        controller.after_request(make_response(RateLimit_Limit=100, RateLimit_Remaining=5, RateLimit_Reset=reset))
+
+        assert 1.5 < controller.interval <= 2
+
+    def test_pauses_until_reset_when_none_remaining(self):
+        controller = RateLimitController(4)
+        reset = time.time() + 10
+
+        controller.before_request()
+        controller.after_request(make_response(RateLimit_Limit=100, RateLimit_Remaining=0, RateLimit_Reset=reset))
+
+        assert controller.not_before == reset
+
+    def test_recovers_concurrency_and_speed_when_limit_is_far(self):
+        controller = RateLimitController(4)
+        reset = time.time() + 0.5
+
+        controller.before_request()
+        controller.after_request(make_response(429, Retry_After=0))
+        controller.before_request()
+        controller.after_request(make_response(RateLimit_Limit=100, RateLimit_Remaining=5, RateLimit_Reset=reset))
+        assert controller.concurrent_requests == 2
+        assert controller.interval > 0
+
+        controller.before_request()
+        controller.after_request(make_response(RateLimit_Limit=100, RateLimit_Remaining=90, RateLimit_Reset=reset))
+        assert controller.concurrent_requests == 3
+        assert controller.interval == 0
+
+        for _ in range(5):
+            controller.before_request()
+            controller.after_request(make_response(RateLimit_Limit=100, RateLimit_Remaining=90, RateLimit_Reset=reset))
+        assert controller.concurrent_requests == 4
+
+    def test_limits_concurrent_requests(self):
+        controller = RateLimitController(2)
+        controller.before_request()
+        controller.before_request()
+
+        third_started = threading.Event()
+
+        def third_request():
+            controller.before_request()
+            third_started.set()
+
+        thread = threading.Thread(target=third_request)
+        thread.start()
+
+        assert not third_started.wait(0.1)
+        controller.after_request(make_response())
+        assert third_started.wait(1)
+        thread.join()
+
+    def test_failed_request_releases_its_slot(self):
+        controller = RateLimitController(1)
+
+        controller.before_request()
+        controller.after_request(None)
+
+        assert controller.in_flight == 0
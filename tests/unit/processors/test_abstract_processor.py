@@ -33,3 +33,24 @@ class TestRecursiveDiffAnalyzer:
         modified_cfg[1]["group_inheritance_type"] = 1
 
         assert AbstractProcessor.recursive_diff_analyzer("deploy_access_levels", self._cfg_a, modified_cfg)
+
+
+class TestConfigurationToSafeDict:
+    def test__processor_gets_its_own_copy_of_its_section(self) -> None:
+        from gitlabform.processors.util.decorators import configuration_to_safe_dict
+
+        class Processor:
+            configuration_name = "project_labels"
+
+            @configuration_to_safe_dict
+            def process(self, project_and_group, configuration):
+                configuration["project_labels"].pop("enforce")
+                return configuration
+
+        effective_config = {"project_labels": {"enforce": True, "bug": {"color": "red"}}, "other": {"a": 1}}
+
+        processed_config = Processor().process("group/project", effective_config)
+
+        assert processed_config["project_labels"] == {"bug": {"color": "red"}}
+        assert effective_config["project_labels"] == {"enforce": True, "bug": {"color": "red"}}
+        assert processed_config["other"] is effective_config["other"]
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from gitlabform.gitlab.core import NotFoundException
+from gitlabform.lists import OmissionReason
+from gitlabform.lists.discovery import Discovery
+from gitlabform.lists.groups import GroupsProvider
+from gitlabform.lists.projects import ProjectsProvider
+
+
+@pytest.fixture
+def gitlab_mock():
+    gitlab = MagicMock()
+    gitlab.get_group_case_insensitive.side_effect = lambda path: {"full_path": path}
+    gitlab.get_group_descendants.return_value = [{"full_path": "group/subgroup"}]
+    gitlab.get_projects.return_value = ["group/project1", "group/subgroup/project2"]
+    return gitlab
+
+
+@pytest.fixture
+def configuration_mock():
+    configuration = MagicMock()
+    configuration.get_projects.return_value = []
+    configuration.is_group_skipped.return_value = False
+    configuration.is_project_skipped.return_value = False
+    return configuration
+
+
+class TestDiscovery:
+    def test__groups_are_discovered_once_for_both_providers(self, gitlab_mock, configuration_mock):
+        discovery = Discovery(gitlab_mock)
+        groups_provider = GroupsProvider(gitlab_mock, configuration_mock, False, discovery)
+        projects_provider = ProjectsProvider(gitlab_mock, configuration_mock, True, True, False, discovery)
+
+        groups = groups_provider.get_groups("group")
+        projects = projects_provider.get_projects("group")
+
+        assert groups.get_effective() == ["group"]
+        assert projects.get_effective() == ["group/project1", "group/subgroup/project2"]
+        gitlab_mock.get_group_case_insensitive.assert_called_once_with("group")
+
+    def test__returned_groups_are_independent_copies(self, gitlab_mock, configuration_mock):
+        groups_provider = GroupsProvider(gitlab_mock, configuration_mock, True)
+
+        groups = groups_provider.get_groups("group")
+        groups.add_omitted(OmissionReason.EMPTY, ["group"])
+
+        assert groups_provider.get_groups("group").get_effective() == ["group", "group/subgroup"]
+
+    def test__group_lookups_are_cached_case_insensitively(self, gitlab_mock):
+        discovery = Discovery(gitlab_mock)
+
+        assert discovery.get_group_case_insensitive("Group") == {"full_path": "Group"}
+        assert discovery.get_group_case_insensitive("group") == {"full_path": "Group"}
+        gitlab_mock.get_group_case_insensitive.assert_called_once_with("Group")
+
+    def test__not_found_lookups_are_cached_too(self, gitlab_mock):
+        gitlab_mock.get_project_case_insensitive.side_effect = NotFoundException("not found")
+        discovery = Discovery(gitlab_mock)
+
+        for _ in range(2):
+            with pytest.raises(NotFoundException):
+                discovery.get_project_case_insensitive("group/project")
+        gitlab_mock.get_project_case_insensitive.assert_called_once_with("group/project")
@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitlabform import GitLabForm, EXIT_PROCESSING_ERROR
+from gitlabform.output import EffectiveConfigurationFile
+
+PROJECTS = [f"group/project{number}" for number in range(1, 11)]
+
+
+def make_gitlabform(parallel: int, terminate_after_error: bool = False) -> GitLabForm:
+    with patch.object(GitLabForm, "_initialize_configuration_and_gitlab", return_value=(MagicMock(), MagicMock())):
+        gf = GitLabForm(config_string="config_version: 4\n", target="group", parallel=parallel)
+    gf.terminate_after_error = terminate_after_error
+    gf.configuration.get_effective_config_for_project.side_effect = lambda project: {"project_settings": {}}
+    return gf
+
+
+def fail_for(failing_projects: list, delay: float = 0):
+    def process_entity(project_and_group, configuration, **kwargs):
+        kwargs["effective_configuration"].add_configuration(project_and_group, "project_settings", {})
+        if project_and_group in failing_projects:
+            raise Exception(f"{project_and_group} failed")
+        time.sleep(delay)
+
+    return process_entity
+
+
+@pytest.mark.parametrize("parallel", [1, 4])
+def test_failure_accounting_is_the_same_for_any_number_of_workers(parallel):
+    gf = make_gitlabform(parallel)
+    gf.project_processors = MagicMock()
+    gf.project_processors.process_entity.side_effect = fail_for(["group/project3", "group/project7"])
+
+    successful, failed = gf._process_projects(PROJECTS, MagicMock(EffectiveConfigurationFile))
+
+    assert successful == 8
+    assert failed == {3: "group/project3", 7: "group/project7"}
+    assert list(failed.keys()) == [3, 7]
+
+
+def test_parallel_processing_uses_multiple_workers():
+    gf = make_gitlabform(parallel=3)
+    gf.project_processors = MagicMock()
+
+    barrier = threading.Barrier(3, timeout=10)
+    gf.project_processors.process_entity.side_effect = lambda *args, **kwargs: barrier.wait()
+
+    successful, failed = gf._process_projects(PROJECTS[:3], MagicMock(EffectiveConfigurationFile))
+
+    assert successful == 3
+    assert failed == {}
+
+
+def test_start_from_is_respected_in_parallel_mode():
+    gf = make_gitlabform(parallel=4)
+    gf.start_from = 6
+    gf.project_processors = MagicMock()
+
+    successful, failed = gf._process_projects(PROJECTS, MagicMock(EffectiveConfigurationFile))
+
+    assert successful == 5
+    processed = sorted(call.args[0] for call in gf.project_processors.process_entity.call_args_list)
+    assert processed == sorted(PROJECTS[5:])
+
+
+def test_effective_configuration_is_in_projects_order(tmp_path):
+    gf = make_gitlabform(parallel=4)
+    gf.project_processors = MagicMock()
+    gf.project_processors.process_entity.side_effect = fail_for([])
+
+    effective_configuration = EffectiveConfigurationFile(str(tmp_path / "output.yml"))
+    gf._process_projects(list(reversed(PROJECTS)), effective_configuration)
+
+    assert list(effective_configuration.config.keys()) == list(reversed(PROJECTS))
+
+
+def test_terminate_stops_processing_and_skips_not_processed_projects(tmp_path):
+    gf = make_gitlabform(parallel=2, terminate_after_error=True)
+    gf.project_processors = MagicMock()
+    gf.project_processors.process_entity.side_effect = fail_for(["group/project1"], delay=0.1)
+
+    effective_configuration = EffectiveConfigurationFile(str(tmp_path / "output.yml"))
+    with pytest.raises(SystemExit) as e:
+        gf._process_projects(PROJECTS, effective_configuration)
+
+    assert e.value.code == EXIT_PROCESSING_ERROR
+    processed = {call.args[0] for call in gf.project_processors.process_entity.call_args_list}
+    assert "group/project1" in processed
+    # at most the projects that were already started by the other worker could have been processed
+    assert len(processed) < len(PROJECTS)
+    assert set(effective_configuration.config.keys()) == processed
+
+
+def test_effective_config_ids_are_computed_only_for_debug_logs(caplog):
+    gf = make_gitlabform(parallel=1)
+    gf.project_processors = MagicMock()
+
+    with caplog.at_level(logging.INFO):
+        gf._process_projects(PROJECTS[:2], MagicMock(EffectiveConfigurationFile))
+    gf.configuration.get_effective_config_id.assert_not_called()
+
+    with caplog.at_level(logging.DEBUG):
+        gf._process_projects(PROJECTS[:2], MagicMock(EffectiveConfigurationFile))
+    assert gf.configuration.get_effective_config_id.call_count == 2
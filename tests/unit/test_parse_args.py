@@ -8,6 +8,15 @@ class TestParseArgs:
     # Index in the return tuple of GitLabForm._parse_args() for
     # include_projects_scheduled_for_deletion (12 = 13th item).
     INCLUDE_SCHEDULED_FOR_DELETION_INDEX = 12
+    PARALLEL_INDEX = 18
+    METRICS_FILE_INDEX = 19
+    PROFILE_OUTPUT_INDEX = 20
+    CONFIG_CACHE_DIR_INDEX = 21
+    ID_LOOKUPS_TTL_INDEX = 22
+    STATE_FILE_INDEX = 23
+    CHANGED_ONLY_INDEX = 24
+    MAX_AGE_INDEX = 25
+    CHANGED_SINCE_INDEX = 26
 
     def test__include_projects_scheduled_for_deletion__defaults_to_false(self):
         with patch.object(sys, "argv", ["gitlabform", "ALL"]):
@@ -19,6 +28,69 @@ class TestParseArgs:
             result = GitLabForm._parse_args()
         assert result[self.INCLUDE_SCHEDULED_FOR_DELETION_INDEX] is True
 
+    def test__parallel__defaults_to_1(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL"]):
+            result = GitLabForm._parse_args()
+        assert result[self.PARALLEL_INDEX] == 1
+
+    def test__parallel__can_be_set_via_long_flag(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL", "--parallel", "8"]):
+            result = GitLabForm._parse_args()
+        assert result[self.PARALLEL_INDEX] == 8
+
+    def test__metrics_file__defaults_to_none(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL"]):
+            result = GitLabForm._parse_args()
+        assert result[self.METRICS_FILE_INDEX] is None
+
+    def test__metrics_file__can_be_set_via_long_flag(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL", "--metrics-file", "metrics.json"]):
+            result = GitLabForm._parse_args()
+        assert result[self.METRICS_FILE_INDEX] == "metrics.json"
+
+    def test__profile_output__can_be_set_via_long_flag(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL", "--profile-output", "profile.jsonl"]):
+            result = GitLabForm._parse_args()
+        assert result[self.PROFILE_OUTPUT_INDEX] == "profile.jsonl"
+
+    def test__config_cache__is_disabled_by_default(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL"]):
+            result = GitLabForm._parse_args()
+        assert result[self.CONFIG_CACHE_DIR_INDEX] is None
+        assert result[self.ID_LOOKUPS_TTL_INDEX] == 3600
+
+    def test__config_cache__can_be_set_via_long_flags(self):
+        argv = ["gitlabform", "ALL", "--config-cache-dir", "cache", "--id-lookups-ttl", "60"]
+        with patch.object(sys, "argv", argv):
+            result = GitLabForm._parse_args()
+        assert result[self.CONFIG_CACHE_DIR_INDEX] == "cache"
+        assert result[self.ID_LOOKUPS_TTL_INDEX] == 60
+
+    def test__changed_only__is_disabled_by_default(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL"]):
+            result = GitLabForm._parse_args()
+        assert result[self.STATE_FILE_INDEX] is None
+        assert result[self.CHANGED_ONLY_INDEX] is False
+        assert result[self.MAX_AGE_INDEX] is None
+
+    def test__changed_only__can_be_set_via_long_flags(self):
+        argv = ["gitlabform", "ALL", "--state-file", "state.sqlite", "--changed-only", "--max-age", "7d"]
+        with patch.object(sys, "argv", argv):
+            result = GitLabForm._parse_args()
+        assert result[self.STATE_FILE_INDEX] == "state.sqlite"
+        assert result[self.CHANGED_ONLY_INDEX] is True
+        assert result[self.MAX_AGE_INDEX] == 7 * 24 * 60 * 60
+
+    def test__changed_since__is_disabled_by_default(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL"]):
+            result = GitLabForm._parse_args()
+        assert result[self.CHANGED_SINCE_INDEX] is None
+
+    def test__changed_since__can_be_set_via_long_flag(self):
+        with patch.object(sys, "argv", ["gitlabform", "ALL", "--changed-since", "old/config.yml"]):
+            result = GitLabForm._parse_args()
+        assert result[self.CHANGED_SINCE_INDEX] == "old/config.yml"
+
 
 class TestGitLabFormConstructorNormalMode:
     def test__include_projects_scheduled_for_deletion_propagated_from_cli(self):
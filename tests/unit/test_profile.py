@@ -0,0 +1,90 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from gitlabform.configuration import Configuration
+from gitlabform.gitlab import GitLab
+from gitlabform.output import EffectiveConfigurationFile
+from gitlabform.processors import AbstractProcessors
+from gitlabform.processors.abstract_processor import AbstractProcessor
+from gitlabform.profile import ProcessingProfile
+
+
+def make_processor(name: str, api_calls: int, request_metrics: MagicMock, fail: bool = False) -> MagicMock:
+    processor = MagicMock(AbstractProcessor)
+    processor.configuration_name = name
+
+    def process(*args):
+        request_metrics.get_calls_in_current_thread.return_value += api_calls
+        if fail:
+            raise Exception("failed")
+
+    processor.process.side_effect = process
+    return processor
+
+
+def process_entity(processors: AbstractProcessors, entity: str, profile: ProcessingProfile) -> None:
+    processors.process_entity(
+        entity_reference=entity,
+        configuration={"members": {}, "files": {}, "branches": {}, "excluded": {}},
+        dry_run=False,
+        diff_only_changed=False,
+        effective_configuration=MagicMock(EffectiveConfigurationFile),
+        only_sections="all",
+        exclude_sections=["excluded"],
+        profile=profile,
+    )
+
+
+def test_profile_of_processed_sections(tmp_path) -> None:
+    request_metrics = MagicMock()
+    request_metrics.get_calls_in_current_thread.return_value = 0
+    profile_output = tmp_path / "profile.jsonl"
+    profile = ProcessingProfile(str(profile_output), request_metrics)
+
+    processors = AbstractProcessors(gitlab=MagicMock(GitLab), config=MagicMock(Configuration), strict=False)
+    processors.processors = [
+        make_processor("members", 3, request_metrics),
+        make_processor("files", 10, request_metrics),
+        make_processor("excluded", 100, request_metrics),
+        make_processor("not_in_config", 0, request_metrics),
+    ]
+
+    process_entity(processors, "group/project1", profile)
+    process_entity(processors, "group/project2", profile)
+
+    processors.processors = [make_processor("branches", 1, request_metrics, fail=True)]
+    with pytest.raises(Exception):
+        process_entity(processors, "group/project3", profile)
+
+    profile.write_to_file()
+
+    assert profile.sections["files"][1:] == [20, 2]
+    assert profile.sections["members"][1:] == [6, 2]
+    assert profile.sections["branches"][1:] == [1, 1]
+    assert "excluded" not in profile.sections
+    assert "not_in_config" not in profile.sections
+    assert profile.entities["group/project1"][1] == 13
+    assert len(profile.get_slowest_entities(2)) == 2
+
+    records = [json.loads(line) for line in profile_output.read_text().splitlines()]
+    assert [(record["entity"], record["section"], record["api_calls"], record["failed"]) for record in records] == [
+        ("group/project1", "members", 3, False),
+        ("group/project1", "files", 10, False),
+        ("group/project2", "members", 3, False),
+        ("group/project2", "files", 10, False),
+        ("group/project3", "branches", 1, True),
+    ]
+
+
+def test_slowest_sections_are_sorted_by_time() -> None:
+    profile = ProcessingProfile(None, None)
+
+    profile.add("group/project1", "members", 1.0, 1)
+    profile.add("group/project1", "files", 5.0, 10)
+    profile.add("group/project2", "members", 2.0, 1)
+    profile.add("group/project2", "branches", 0.5, 2)
+
+    assert [section for section, _ in profile.get_slowest_sections(2)] == ["files", "members"]
+    assert [entity for entity, _ in profile.get_slowest_entities(10)] == ["group/project1", "group/project2"]
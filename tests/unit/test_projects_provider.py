@@ -17,14 +17,26 @@ def configuration_mock():
     return MagicMock()
 
 
-def make_provider(gitlab_mock, configuration_mock, include_archived=True, include_scheduled_for_deletion=True):
-    return ProjectsProvider(
+def make_provider(
+    gitlab_mock,
+    configuration_mock,
+    include_archived=True,
+    include_scheduled_for_deletion=True,
+    python_gitlab_mock=None,
+):
+    provider = ProjectsProvider(
         gitlab_mock,
         configuration_mock,
         include_archived,
         include_scheduled_for_deletion,
         recurse_subgroups=True,
     )
+    if python_gitlab_mock is None:
+        # make getting projects in batches fail to test the fallback to getting them one by one
+        python_gitlab_mock = MagicMock()
+        python_gitlab_mock.get_projects_by_full_paths.side_effect = Exception("GraphQL not available")
+    provider.discovery.gl = python_gitlab_mock
+    return provider
 
 
 class TestGetAllAndOmittedProjectsFromGroups:
@@ -133,9 +145,32 @@ class TestGetAllAndOmittedProjectsFromGroups:
             ["group", "group/subgroup"]
         )
 
+        gitlab_mock.get_projects.assert_called_once_with("group", include_archived=True, only_names=False)
         assert all_projects == ["group/project1"]
         assert scheduled == ["group/project1"]
 
+    def test__projects_listed_only_for_topmost_groups(self, gitlab_mock, configuration_mock):
+        gitlab_mock.get_projects.return_value = []
+
+        provider = make_provider(gitlab_mock, configuration_mock)
+        provider._get_all_and_omitted_projects_from_groups(
+            ["a", "a/b", "a/b/c", "A/B/d", "x/y", "x/y/z", "x/yy", "other"]
+        )
+
+        listed_groups = [call.args[0] for call in gitlab_mock.get_projects.call_args_list]
+        assert listed_groups == ["a", "x/y", "x/yy", "other"]
+
+
+class TestGetTopmostGroups:
+    def test__subgroups_of_listed_groups_are_pruned(self):
+        assert ProjectsProvider._get_topmost_groups(["a/b/c", "a", "a/b", "ab", "ab/c"]) == ["a", "ab"]
+
+    def test__pruning_is_case_insensitive(self):
+        assert ProjectsProvider._get_topmost_groups(["Group", "group/Subgroup"]) == ["Group"]
+
+    def test__subgroups_without_listed_ancestors_are_kept(self):
+        assert ProjectsProvider._get_topmost_groups(["a/b", "a/c/d", "a/c/d/e"]) == ["a/b", "a/c/d"]
+
 
 class TestVerifyIfProjectsExistAndGetOmittedProjects:
     def test__normal_project__not_omitted(self, gitlab_mock, configuration_mock):
@@ -263,6 +298,82 @@ class TestVerifyIfProjectsExistAndGetOmittedProjects:
         assert scheduled == []
 
 
+class TestVerifyIfProjectsExistInBatches:
+    def test__projects_are_got_in_a_single_batch(self, gitlab_mock, configuration_mock):
+        python_gitlab_mock = MagicMock()
+        python_gitlab_mock.get_projects_by_full_paths.return_value = {
+            "group/project1": {
+                "path_with_namespace": "group/project1",
+                "archived": False,
+                "marked_for_deletion_on": None,
+            },
+            "group/project2": {
+                "path_with_namespace": "group/project2",
+                "archived": True,
+                "marked_for_deletion_on": None,
+            },
+            "group/project3": {
+                "path_with_namespace": "Group/Project3",
+                "archived": False,
+                "marked_for_deletion_on": "2026-04-15",
+            },
+        }
+
+        provider = make_provider(
+            gitlab_mock,
+            configuration_mock,
+            include_archived=False,
+            include_scheduled_for_deletion=False,
+            python_gitlab_mock=python_gitlab_mock,
+        )
+        archived, scheduled = provider._verify_if_projects_exist_and_get_omitted_projects(
+            ["group/project1", "group/project2", "group/project3"]
+        )
+
+        python_gitlab_mock.get_projects_by_full_paths.assert_called_once_with(
+            ["group/project1", "group/project2", "group/project3"]
+        )
+        gitlab_mock.get_project_case_insensitive.assert_not_called()
+        assert archived == ["group/project2"]
+        assert scheduled == ["Group/Project3"]
+
+    def test__transfer_sources_are_got_in_a_second_batch(self, gitlab_mock, configuration_mock):
+        python_gitlab_mock = MagicMock()
+        python_gitlab_mock.get_projects_by_full_paths.side_effect = [
+            {},
+            {"old_group/project1": {"path_with_namespace": "old_group/project1", "archived": True}},
+        ]
+        configuration_mock.config = {
+            "projects_and_groups": {
+                "new_group/project1": {"project": {"transfer_from": "old_group/project1"}},
+            }
+        }
+
+        provider = make_provider(
+            gitlab_mock, configuration_mock, include_archived=False, python_gitlab_mock=python_gitlab_mock
+        )
+        archived, scheduled = provider._verify_if_projects_exist_and_get_omitted_projects(["new_group/project1"])
+
+        assert [call.args[0] for call in python_gitlab_mock.get_projects_by_full_paths.call_args_list] == [
+            ["new_group/project1"],
+            ["old_group/project1"],
+        ]
+        gitlab_mock.get_project_case_insensitive.assert_not_called()
+        assert archived == ["new_group/project1"]
+        assert scheduled == []
+
+    def test__missing_project_without_transfer_source_exits(self, gitlab_mock, configuration_mock):
+        python_gitlab_mock = MagicMock()
+        python_gitlab_mock.get_projects_by_full_paths.return_value = {}
+        configuration_mock.config = {"projects_and_groups": {}}
+
+        provider = make_provider(gitlab_mock, configuration_mock, python_gitlab_mock=python_gitlab_mock)
+        with pytest.raises(SystemExit):
+            provider._verify_if_projects_exist_and_get_omitted_projects(["group/missing"])
+
+        gitlab_mock.get_project_case_insensitive.assert_not_called()
+
+
 class TestGetProjects:
     def _make_groups(self, effective):
         groups = Groups()
@@ -282,12 +393,84 @@ class TestGetProjects:
         )
         groups = self._make_groups(["group"])
 
-        projects = provider._get_projects("ALL", groups)
+        projects = provider._get_projects("group", groups)
 
         assert "group/project1" in projects.get_effective()
         assert "group/project2" not in projects.get_effective()
         assert projects.get_omitted(OmissionReason.SCHEDULED_FOR_DELETION) == ["group/project2"]
 
+    def test__all__projects_got_with_a_single_listing(self, gitlab_mock, configuration_mock):
+        gitlab_mock.get_all_projects_in_groups.return_value = [
+            {"path_with_namespace": "group/project1", "archived": False, "marked_for_deletion_on": None},
+            {"path_with_namespace": "group/subgroup/project2", "archived": True, "marked_for_deletion_on": None},
+            {
+                "path_with_namespace": "group/subgroup/subsubgroup/project3",
+                "archived": False,
+                "marked_for_deletion_on": "2026-04-15",
+            },
+        ]
+        configuration_mock.get_projects.return_value = []
+        configuration_mock.is_project_skipped.return_value = False
+
+        provider = make_provider(
+            gitlab_mock, configuration_mock, include_archived=False, include_scheduled_for_deletion=False
+        )
+        groups = self._make_groups(["group", "group/subgroup", "group/subgroup/subsubgroup"])
+
+        projects = provider._get_projects("ALL", groups)
+
+        gitlab_mock.get_all_projects_in_groups.assert_called_once_with(include_archived=True, only_names=False)
+        gitlab_mock.get_projects.assert_not_called()
+        assert projects.get_effective() == ["group/project1"]
+        assert projects.get_omitted(OmissionReason.ARCHIVED) == ["group/subgroup/project2"]
+        assert projects.get_omitted(OmissionReason.SCHEDULED_FOR_DELETION) == ["group/subgroup/subsubgroup/project3"]
+
+    def test__all__only_names_listed_when_nothing_to_omit(self, gitlab_mock, configuration_mock):
+        gitlab_mock.get_all_projects_in_groups.return_value = ["group/project1", "group/subgroup/project2"]
+        configuration_mock.get_projects.return_value = []
+        configuration_mock.is_project_skipped.return_value = False
+
+        provider = make_provider(gitlab_mock, configuration_mock)
+        groups = self._make_groups(["group", "group/subgroup"])
+
+        projects = provider._get_projects("ALL", groups)
+
+        gitlab_mock.get_all_projects_in_groups.assert_called_once_with(include_archived=True)
+        gitlab_mock.get_projects.assert_not_called()
+        assert projects.get_effective() == ["group/project1", "group/subgroup/project2"]
+
+    def test__all__projects_in_skipped_groups_not_returned(self, gitlab_mock, configuration_mock):
+        gitlab_mock.get_all_projects_in_groups.return_value = [
+            "group/project1",
+            "skipped/project2",
+            "skipped/subgroup/project3",
+            "other/skipped-subgroup/project4",
+            "other/project5",
+        ]
+        configuration_mock.get_projects.return_value = []
+        configuration_mock.is_project_skipped.return_value = False
+
+        provider = make_provider(gitlab_mock, configuration_mock)
+        groups = self._make_groups(["group", "skipped", "skipped/subgroup", "other", "other/skipped-subgroup"])
+        # as done by GroupsProvider for skip_groups: ["skipped/*", "other/skipped-subgroup"]
+        groups.add_omitted(OmissionReason.SKIPPED, ["skipped", "skipped/subgroup", "other/skipped-subgroup"])
+
+        projects = provider._get_projects("ALL", groups)
+
+        # like when listing the projects of the effective groups, with their subgroups
+        assert projects.get_effective() == ["group/project1", "other/project5", "other/skipped-subgroup/project4"]
+
+        gitlab_mock.get_all_projects_in_groups.return_value = [
+            {"path_with_namespace": "group/project1", "archived": True, "marked_for_deletion_on": None},
+            {"path_with_namespace": "skipped/project2", "archived": True, "marked_for_deletion_on": None},
+        ]
+        provider = make_provider(gitlab_mock, configuration_mock, include_archived=False)
+
+        projects = provider._get_projects("ALL", groups)
+
+        assert projects.get_omitted(OmissionReason.ARCHIVED) == ["group/project1"]
+        assert projects.get_effective() == []
+
     def test__all_defined__scheduled_for_deletion_from_configuration(self, gitlab_mock, configuration_mock):
         gitlab_mock.get_projects.return_value = []
         gitlab_mock.get_project_case_insensitive.return_value = {
@@ -0,0 +1,189 @@
+import argparse
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitlabform import GitLabForm
+from gitlabform.configuration import Configuration
+from gitlabform.lists import Groups, OmissionReason, Projects
+from gitlabform.lists.filter import OmitUnchangedConfigs
+from gitlabform.output import EffectiveConfigurationFile
+from gitlabform.state import StateLedger, parse_duration
+
+
+@pytest.mark.parametrize(
+    "duration, seconds",
+    [("3600", 3600), ("45s", 45), ("90m", 5400), ("12h", 43200), ("7d", 604800)],
+)
+def test__durations_are_parsed(duration, seconds):
+    assert parse_duration(duration) == seconds
+
+
+def test__invalid_durations_are_rejected():
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_duration("7 days")
+
+
+def test__applied_configs_are_remembered_between_runs(tmp_path):
+    state_file = str(tmp_path / "state.sqlite")
+    state_ledger = StateLedger(state_file)
+    state_ledger.record_applied("project", "group/project", "hash1", ["project_settings", "members"])
+    state_ledger.close()
+
+    state_ledger = StateLedger(state_file)
+    assert state_ledger.is_unchanged("project", "group/project", "hash1", ["project_settings", "members"])
+    # a subset of the sections applied before
+    assert state_ledger.is_unchanged("project", "group/project", "hash1", ["members"])
+
+    assert not state_ledger.is_unchanged("project", "group/project", "hash2", ["project_settings"])
+    assert not state_ledger.is_unchanged("project", "group/project", "hash1", ["project_settings", "files"])
+    assert not state_ledger.is_unchanged("group", "group/project", "hash1", ["project_settings"])
+    assert not state_ledger.is_unchanged("project", "group/other", "hash1", ["project_settings"])
+    state_ledger.close()
+
+
+def test__configs_applied_by_another_app_version_are_changed(tmp_path):
+    state_ledger = StateLedger(str(tmp_path / "state.sqlite"))
+    state_ledger.record_applied("project", "group/project", "hash1", ["project_settings"])
+
+    state_ledger.gitlabform_version = "0.0.1"
+
+    assert not state_ledger.is_unchanged("project", "group/project", "hash1", ["project_settings"])
+    state_ledger.close()
+
+
+def test__configs_applied_too_long_ago_are_changed(tmp_path):
+    state_ledger = StateLedger(str(tmp_path / "state.sqlite"), max_age=3600)
+    with patch("gitlabform.state.time.time", return_value=1000.0):
+        state_ledger.record_applied("project", "group/project", "hash1", ["project_settings"])
+
+    with patch("gitlabform.state.time.time", return_value=4599.0):
+        assert state_ledger.is_unchanged("project", "group/project", "hash1", ["project_settings"])
+    with patch("gitlabform.state.time.time", return_value=4600.0):
+        assert not state_ledger.is_unchanged("project", "group/project", "hash1", ["project_settings"])
+    state_ledger.close()
+
+
+def test__unchanged_groups_and_projects_are_omitted(tmp_path):
+    configuration = Configuration(config_string="""
+        projects_and_groups:
+          group/*:
+            group_settings:
+              description: a group
+            project_settings:
+              visibility: internal
+          group/changed:
+            members:
+              users:
+                jsmith:
+                  access_level: 30
+        """)
+    group_processors = MagicMock()
+    group_processors.get_sections_to_process.return_value = ["group_settings"]
+    project_processors = MagicMock()
+    project_processors.get_sections_to_process.return_value = ["project_settings"]
+
+    state_ledger = StateLedger(str(tmp_path / "state.sqlite"))
+    for entity_type, entity, config in [
+        ("group", "group", configuration.get_effective_config_for_group("group")),
+        ("project", "group/unchanged", configuration.get_effective_config_for_project("group/unchanged")),
+        ("project", "group/changed", configuration.get_effective_config_for_group("group")),
+    ]:
+        state_ledger.record_applied(entity_type, entity, configuration.get_effective_config_id(config), ["x"])
+
+    groups = Groups()
+    groups.add_requested(["group"])
+    projects = Projects()
+    projects.add_requested(["group/unchanged", "group/changed", "group/new"])
+
+    OmitUnchangedConfigs(configuration, group_processors, project_processors, state_ledger, "all", []).filter(
+        groups, projects
+    )
+
+    # the sections to process now are not a subset of the ones applied before
+    assert groups.get_effective() == ["group"]
+    assert projects.get_effective() == ["group/changed", "group/new", "group/unchanged"]
+
+    project_processors.get_sections_to_process.return_value = ["x"]
+    group_processors.get_sections_to_process.return_value = ["x"]
+    OmitUnchangedConfigs(configuration, group_processors, project_processors, state_ledger, "all", []).filter(
+        groups, projects
+    )
+
+    assert groups.get_omitted(OmissionReason.UNCHANGED) == ["group"]
+    assert projects.get_omitted(OmissionReason.UNCHANGED) == ["group/unchanged"]
+    assert projects.get_effective() == ["group/changed", "group/new"]
+    state_ledger.close()
+
+
+def test__successfully_applied_projects_are_recorded(tmp_path):
+    state_file = str(tmp_path / "state.sqlite")
+    with patch.object(GitLabForm, "_initialize_configuration_and_gitlab", return_value=(MagicMock(), MagicMock())):
+        gf = GitLabForm(config_string="config_version: 4\n", target="group", state_file=state_file)
+    gf.terminate_after_error = False
+    gf.configuration.get_effective_config_for_project.side_effect = lambda project: {"project_settings": {}}
+    gf.configuration.get_effective_config_id.side_effect = lambda config: "hash"
+    gf.project_processors = MagicMock()
+    gf.project_processors.get_sections_to_process.return_value = ["project_settings"]
+
+    def process_entity(project_and_group, configuration, **kwargs):
+        if project_and_group == "group/failing":
+            raise Exception("failed")
+
+    gf.project_processors.process_entity.side_effect = process_entity
+
+    gf._process_projects(["group/failing", "group/project"], MagicMock(EffectiveConfigurationFile))
+    gf.state_ledger.close()
+
+    state_ledger = StateLedger(state_file)
+    assert state_ledger.is_unchanged("project", "group/project", "hash", ["project_settings"])
+    assert not state_ledger.is_unchanged("project", "group/failing", "hash", ["project_settings"])
+    state_ledger.close()
+
+
+def test__changed_only_requires_state_file():
+    with (
+        patch.object(GitLabForm, "_initialize_configuration_and_gitlab", return_value=(MagicMock(), MagicMock())),
+        pytest.raises(SystemExit),
+    ):
+        GitLabForm(config_string="config_version: 4\n", target="group", changed_only=True)
+
+
+def test__config_hash_depends_on_referenced_files(tmp_path):
+    (tmp_path / "readme.md").write_text("# Readme")
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("""
+        config_version: 4
+        projects_and_groups:
+          group/*:
+            files:
+              README.md:
+                file: readme.md
+                branches: all
+        """)
+    configuration = Configuration(str(config_path))
+    config = configuration.get_effective_config_for_project("group/project")
+
+    # the files are read once per run, so per state ledger
+    state_ledger = StateLedger(str(tmp_path / "state.sqlite"))
+    hash_before = state_ledger.get_config_hash(configuration, config)
+    state_ledger.close()
+    (tmp_path / "readme.md").write_text("# Changed readme")
+    state_ledger = StateLedger(str(tmp_path / "state.sqlite"))
+    hash_after = state_ledger.get_config_hash(configuration, config)
+    state_ledger.close()
+
+    assert hash_before != hash_after
+    assert hash_before != configuration.get_effective_config_id(config)
+
+
+def test__state_file_is_closed_when_terminating_after_error(tmp_path):
+    with patch.object(GitLabForm, "_initialize_configuration_and_gitlab", return_value=(MagicMock(), MagicMock())):
+        gf = GitLabForm(config_string="config_version: 4\n", target="group", state_file=str(tmp_path / "state.sqlite"))
+
+    with patch.object(gf, "_run", side_effect=SystemExit(1)), pytest.raises(SystemExit):
+        gf.run()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        gf.state_ledger.connection.execute("SELECT 1")